@@ -0,0 +1,145 @@
+"""
+종반 해결기: 마지막 라운드처럼 끝이 가까운 국면을 깊이 제한 탐색으로 끝까지 읽어 승패를 확정합니다.
+
+- 값은 player_idx의 승리 값(0~1)입니다. 차례인 플레이어가 player_idx면 최대화, 아니면 최소화하며
+  (3~4인에서는 상대들이 player_idx를 막는 쪽으로 협력한다고 보는 paranoid 가정),
+  귀족을 동시에 충족해 무작위로 고르는 경우는 귀족별 평균(기댓값)으로 계산합니다.
+- 승(1)/패(0)가 확정되는 자식을 찾으면 나머지 형제를 보지 않고 가지치기합니다.
+- 깊이 안에 끝나지 않는 수순이 남아 값이 확정되지 않거나 노드 예산을 넘기면 None을 반환합니다.
+- 결과는 (Zobrist 해시, player_idx, 남은 깊이, 그 깊이 안에 뽑힐 수 있는 덱 윗부분) 키로 메모해 두고 재사용합니다.
+"""
+from collections import OrderedDict
+
+_UNSOLVED = object()
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class EndgameSolver:
+    """
+    solver = EndgameSolver(max_depth=4)
+    value = solver.solve(state, player_idx)   # 0~1 또는 None (state는 원래대로 복원됨)
+    """
+
+    def __init__(self, max_depth=4, max_nodes=20000, memo_size=200000):
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.memo_size = memo_size
+        self.memo = OrderedDict()
+        self.nodes = 0  # 마지막 solve()에서 방문한 노드 수
+        self._budget = 0
+
+    def solve(self, state, player_idx, depth=None):
+        """state에서 player_idx의 승리 값을 depth수(기본 max_depth) 안에 확정할 수 있으면 반환합니다."""
+        depth = self.max_depth if depth is None else depth
+        if state.is_last_round:
+            # 마지막 라운드는 0번 플레이어 차례가 되기 전에 끝나므로 남은 수가 정해져 있음
+            depth = min(depth, state.num_players - state.current_player_idx)
+
+        tracking = state._zobrist is not None
+        state.zobrist_hash()  # apply()/undo()가 해시를 증분 갱신하도록
+        self._budget = self.max_nodes
+        try:
+            return self._search(state, player_idx, depth)
+        except _BudgetExceeded:
+            return None
+        finally:
+            self.nodes = self.max_nodes - self._budget
+            if not tracking:
+                state.invalidate_hash()
+
+    # ==========================================
+    # 탐색
+    # ==========================================
+    def _search(self, state, player_idx, depth):
+        if state.is_game_over:
+            return 1.0 if state.winner is not None and state.winner.id == player_idx else 0.0
+        if depth == 0:
+            return None
+
+        key = (state._zobrist, player_idx, depth,
+               tuple(tuple(card.id for card in deck[-depth:]) for deck in state.decks.values()))
+        cached = self.memo.get(key, _UNSOLVED)
+        if cached is not _UNSOLVED:
+            self.memo.move_to_end(key)
+            return cached
+
+        self._budget -= 1
+        if self._budget < 0:
+            raise _BudgetExceeded()
+
+        maximizing = state.current_player_idx == player_idx
+        best = 0.0 if maximizing else 1.0
+        decided = 1.0 if maximizing else 0.0
+        unresolved = False
+        for action in self._ordered_actions(state):
+            value = self._expected_value(state, action, player_idx, depth)
+            if value is None:
+                unresolved = True
+            elif maximizing and value > best or not maximizing and value < best:
+                best = value
+            if best == decided:
+                break
+
+        result = None if unresolved and best != decided else best
+        self.memo[key] = result
+        if len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+        return result
+
+    def _expected_value(self, state, action, player_idx, depth):
+        """행동 하나의 값. 귀족 후보가 여럿이면 각 귀족을 고른 경우의 평균 (하나라도 미확정이면 None)"""
+        nobles = self._noble_choices(state, action)
+        if len(nobles) <= 1:
+            if nobles:
+                action = dict(action, noble=nobles[0])  # 난수를 소비하지 않도록 귀족을 지정
+            record = state.apply(action)
+            try:
+                return self._search(state, player_idx, depth - 1)
+            finally:
+                state.undo(record)
+
+        total = 0.0
+        for noble_id in nobles:
+            record = state.apply(dict(action, noble=noble_id))
+            try:
+                value = self._search(state, player_idx, depth - 1)
+            finally:
+                state.undo(record)
+            if value is None:
+                return None
+            total += value
+        return total / len(nobles)
+
+    @staticmethod
+    def _noble_choices(state, action):
+        """행동 후 현재 플레이어가 방문 조건을 충족하는 귀족 id 목록"""
+        player = state.players[state.current_player_idx]
+        bonus = None
+        if action['type'] == 'purchase':
+            if action['source'] == 'board':
+                bonus = state.board_card(action['card_id']).bonus
+            else:
+                bonus = next(c for c in player.reserved if c.id == action['card_id']).bonus
+
+        bonuses = player.bonuses
+        return [
+            noble.id for noble in state.nobles
+            if all(bonuses.get(color, 0) + (color == bonus) >= req for color, req in noble.requirements.items())
+        ]
+
+    @staticmethod
+    def _ordered_actions(state):
+        """점수가 큰 구매부터 보도록 정렬 (확정 승리를 빨리 찾아 가지치기)"""
+        player = state.players[state.current_player_idx]
+
+        def points(action):
+            if action['type'] != 'purchase':
+                return -1
+            if action['source'] == 'board':
+                return state.board_card(action['card_id']).points
+            return next(c for c in player.reserved if c.id == action['card_id']).points
+
+        return sorted(state.get_legal_actions(dedupe=True), key=points, reverse=True)
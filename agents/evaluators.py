@@ -0,0 +1,131 @@
+"""
+PUCT 탐색용 정책/가치 평가기.
+
+평가기는 evaluate(states, legal_ids) -> (priors, values) 메서드를 가진 객체이며, 상태 여러 개를 한 번에 받습니다.
+    states    : 평가할 GameState 시퀀스 (N개, 같은 인원수)
+    legal_ids : 상태별 합법 고정 액션 인덱스 리스트 (splender.actions 참고)
+    priors    : 상태별로 legal_ids[i]와 같은 순서의 사전 확률 시퀀스 (합 1)
+    values    : (N, 인원수) 승리 확률. 열 k는 그 상태의 현재 차례에서 k번째 뒤의 플레이어
+                (features.py의 플레이어 슬롯과 같은 순서, 0열 = 현재 차례 플레이어)
+
+    evaluator = MLPEvaluator.load('model.npz')
+    priors, values = evaluator.evaluate(states, [s.legal_action_ids() for s in states])
+"""
+import math
+import numpy as np
+from splender.actions import NUM_ACTIONS
+from splender.features import FeatureEncoder, FEATURE_SIZE, MAX_PLAYERS
+from agents.rollout import heuristic_score, TEMPERATURE
+
+
+class HeuristicEvaluator:
+    """모델 없이 쓰는 기본 평가기: 균등 사전 확률 + 휴리스틱 점수의 softmax 가치 (evaluate_state와 같은 식)"""
+
+    def evaluate(self, states, legal_ids):
+        priors = [[1.0 / len(ids)] * len(ids) for ids in legal_ids]
+        values = []
+        for state in states:
+            n = state.num_players
+            current = state.current_player_idx
+            scores = [heuristic_score(state, state.players[(current + k) % n]) for k in range(n)]
+            top = max(scores)
+            weights = [math.exp(TEMPERATURE * (s - top)) for s in scores]
+            total = sum(weights)
+            values.append([w / total for w in weights])
+        return priors, values
+
+
+class MLPEvaluator:
+    """
+    FeatureEncoder 특징 → 은닉층(ReLU) → 정책 로짓(NUM_ACTIONS) / 가치 로짓(MAX_PLAYERS)의 NumPy MLP.
+    hidden이 비어 있으면 선형 모델입니다.
+
+    정책은 합법 액션 위치의 로짓만 모아 softmax하고, 가치는 실제 인원수만큼의 슬롯 로짓을 softmax합니다.
+    배치 전체를 행렬 곱 한 번(층마다)으로 계산합니다.
+    """
+
+    def __init__(self, hidden, policy_head, value_head, encoder=None):
+        self.hidden = [(np.asarray(w, dtype=np.float32), np.asarray(b, dtype=np.float32)) for w, b in hidden]
+        self.policy_head = tuple(np.asarray(a, dtype=np.float32) for a in policy_head)
+        self.value_head = tuple(np.asarray(a, dtype=np.float32) for a in value_head)
+        self.encoder = encoder or FeatureEncoder()
+        self._buffer = np.empty((0, FEATURE_SIZE), dtype=np.float32)
+
+    @classmethod
+    def random(cls, hidden_sizes=(128,), seed=0, scale=0.05):
+        """무작위 초기화한 모델 (학습 전 기준선/벤치마크용)"""
+        rng = np.random.default_rng(seed)
+        sizes = [FEATURE_SIZE] + list(hidden_sizes)
+        hidden = [(rng.normal(0, scale, (a, b)), np.zeros(b)) for a, b in zip(sizes, sizes[1:])]
+        policy_head = (rng.normal(0, scale, (sizes[-1], NUM_ACTIONS)), np.zeros(NUM_ACTIONS))
+        value_head = (rng.normal(0, scale, (sizes[-1], MAX_PLAYERS)), np.zeros(MAX_PLAYERS))
+        return cls(hidden, policy_head, value_head)
+
+    # ==========================================
+    # 저장 / 불러오기
+    # ==========================================
+    def save(self, path):
+        arrays = {'policy_w': self.policy_head[0], 'policy_b': self.policy_head[1],
+                  'value_w': self.value_head[0], 'value_b': self.value_head[1]}
+        for i, (w, b) in enumerate(self.hidden):
+            arrays[f'hidden{i}_w'] = w
+            arrays[f'hidden{i}_b'] = b
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path, encoder=None):
+        with np.load(path) as data:
+            hidden = []
+            while f'hidden{len(hidden)}_w' in data:
+                i = len(hidden)
+                hidden.append((data[f'hidden{i}_w'], data[f'hidden{i}_b']))
+            return cls(hidden, (data['policy_w'], data['policy_b']),
+                       (data['value_w'], data['value_b']), encoder)
+
+    # ==========================================
+    # 평가
+    # ==========================================
+    def evaluate(self, states, legal_ids):
+        n = len(states)
+        if len(self._buffer) < n:
+            self._buffer = np.empty((n, FEATURE_SIZE), dtype=np.float32)
+        x = self.encoder.encode_batch(states, out=self._buffer)
+
+        for w, b in self.hidden:
+            x = np.maximum(x @ w + b, 0)
+
+        # 합법 액션 로짓만 모아서 상태별 구간 softmax
+        counts = [len(ids) for ids in legal_ids]
+        rows = np.repeat(np.arange(n), counts)
+        cols = np.concatenate(legal_ids)
+        w, b = self.policy_head
+        logits = np.einsum('ij,ji->i', x[rows], w[:, cols]) + b[cols]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        logits -= np.repeat(np.maximum.reduceat(logits, starts), counts)
+        exp = np.exp(logits)
+        probs = exp / np.repeat(np.add.reduceat(exp, starts), counts)
+        priors = np.split(probs, starts[1:])
+
+        num_players = states[0].num_players
+        w, b = self.value_head
+        value_logits = (x @ w + b)[:, :num_players]
+        value_logits -= value_logits.max(axis=1, keepdims=True)
+        values = np.exp(value_logits)
+        values /= values.sum(axis=1, keepdims=True)
+        return priors, values
+
+
+EVALUATORS = {
+    'heuristic': HeuristicEvaluator,
+}
+
+
+def make_evaluator(spec=None):
+    """None/'heuristic' 같은 이름이면 기본 평가기, '.npz' 경로면 MLPEvaluator, 객체면 그대로 반환합니다."""
+    if spec is None:
+        return HeuristicEvaluator()
+    if not isinstance(spec, str):
+        return spec
+    if spec in EVALUATORS:
+        return EVALUATORS[spec]()
+    return MLPEvaluator.load(spec)
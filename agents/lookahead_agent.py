@@ -0,0 +1,226 @@
+"""
+내다보는 그리디 에이전트: 보드/예약 카드마다 '몇 턴 뒤에 살 수 있는가'를 추정해 턴당 가치가 가장 큰 카드를
+목표로 정하고, 지금 살 수 있으면 사고 아니면 그 목표까지의 턴 수를 가장 많이 줄이는 토큰을 가져옵니다.
+
+- 색별 부족분은 GameState.card_needs() 캐시(토큰/보너스/보드가 바뀔 때만 다시 계산)를 씁니다.
+- 부족분 → 토큰 수집 턴 수는 (색별 부족분, 2개 가져오기 가능 여부) 쌍을 정렬한 키로 표에 캐시합니다.
+  (처음 나온 조합만 계산하고, 그 뒤로는 표 조회)
+- 합법 액션 목록을 만들지 않고 액션을 직접 구성하므로 한 수에 수십 마이크로초 수준입니다.
+"""
+import functools
+import random
+from splender.rng import make_rng
+
+COLORS = ['white', 'blue', 'green', 'red', 'black']
+GEM_COLORS = COLORS + ['gold']
+
+BONUS_VALUE = 1.0   # 점수 없는 카드도 보너스(앞으로 아낄 토큰)만큼의 가치
+NOBLE_WEIGHT = 1.0  # 귀족에게 필요한 색의 보너스 1개 ≈ 귀족 점수 / 남은 필요 보너스 수
+
+
+# ==========================================
+# 토큰 수집 턴 수 표
+# ==========================================
+@functools.lru_cache(maxsize=None)
+def _collect_turns(pairs):
+    """
+    pairs: (부족분, 2개 가져오기 가능) 쌍을 내림차순 정렬한 튜플.
+    한 턴에 서로 다른 색 최대 3개 또는 같은 색 2개를 가져올 때 부족분을 모두 채우는 최소 턴 수.
+    """
+    if not pairs[0][0]:
+        return 0
+    # 서로 다른 색: 가장 많이 모자란 세 색에서 하나씩
+    after = [(need - 1, double) if i < 3 and need else (need, double) for i, (need, double) in enumerate(pairs)]
+    best = _collect_turns(tuple(sorted(after, reverse=True)))
+    # 같은 색 2개
+    for i, (need, double) in enumerate(pairs):
+        if double and need >= 2:
+            after = list(pairs)
+            after[i] = (need - 2, double)
+            best = min(best, _collect_turns(tuple(sorted(after, reverse=True))))
+    return best + 1
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def turns_to_afford(needs, gold, bank):
+    """
+    색별 부족분 needs를 채우는 데 필요한 턴 수 추정. bank는 (COLORS 순서 은행 토큰..., 황금) 튜플입니다.
+    은행을 고정으로 보고, 은행보다 더 필요한 만큼은 예약으로 황금 토큰을 한 턴에 하나씩 받는다고 봅니다.
+    은행의 황금 토큰으로도 모자라면 None.
+    """
+    needs = list(needs)
+    # 가진 황금 토큰은 가장 많이 모자란 색부터 메움
+    for _ in range(gold):
+        i = max(range(5), key=needs.__getitem__)
+        if not needs[i]:
+            break
+        needs[i] -= 1
+
+    excess = 0
+    pairs = []
+    for need, available in zip(needs, bank):
+        if need > available:
+            excess += need - available
+            need = available
+        pairs.append((need, available >= 4))
+    if excess > bank[5]:
+        return None
+    return _collect_turns(tuple(sorted(pairs, reverse=True))) + excess
+
+
+# ==========================================
+# 행동 선택
+# ==========================================
+def _bank_key(state):
+    bank = state.bank
+    return (bank['white'], bank['blue'], bank['green'], bank['red'], bank['black'], bank['gold'])
+
+
+def _color_values(state, player):
+    """색별 보너스 1개의 귀족 근접 가치"""
+    values = dict.fromkeys(COLORS, 0.0)
+    bonuses = player.bonuses
+    for noble in state.nobles:
+        missing = {c: req - bonuses[c] for c, req in noble.requirements.items() if req > bonuses[c]}
+        remaining = sum(missing.values())
+        for color in missing:
+            values[color] += NOBLE_WEIGHT * noble.points / remaining
+    return values
+
+
+def _rank_targets(state, player):
+    """(턴당 가치, 턴 수, 출처, 카드, 색별 부족분)을 좋은 순으로 정렬해 반환합니다. (살 수 없는 카드 제외)"""
+    needs = state.card_needs()
+    gold = player.gems['gold']
+    bank = _bank_key(state)
+    color_values = _color_values(state, player)
+
+    targets = []
+    for source, cards in [('board', [c for tier in (1, 2, 3) for c in state.board[tier]]),
+                          ('reserved', player.reserved)]:
+        for card in cards:
+            card_needs = needs[card.id]
+            turns = 0 if sum(card_needs) <= gold else turns_to_afford(card_needs, gold, bank)
+            if turns is None:
+                continue
+            value = card.points + BONUS_VALUE + color_values[card.bonus]
+            # 예약 카드는 다른 플레이어가 가져갈 수 없으므로 약간 우선
+            targets.append((value / (turns + 1), -turns, source == 'reserved', source, card, card_needs))
+    targets.sort(key=lambda t: t[:3], reverse=True)
+    return targets
+
+
+def _with_discard(action, gems, keep):
+    """
+    행동 후 토큰 gems가 10개를 넘으면 목표에 덜 필요한 색부터 버리는 discard를 붙입니다.
+    keep: 색별로 남기고 싶은 개수 (그 이상인 토큰부터 버림, 황금은 마지막)
+    """
+    excess = sum(gems.values()) - 10
+    if excess <= 0:
+        return action
+    discard = dict.fromkeys(GEM_COLORS, 0)
+    surplus = sorted(COLORS, key=lambda c: gems[c] - keep.get(c, 0), reverse=True) + ['gold']
+    for color in surplus:
+        # 먼저 남기고 싶은 개수를 넘는 만큼만, 그래도 모자라면 아래 반복에서 더 버림
+        amount = min(excess, max(0, gems[color] - keep.get(color, 0)))
+        discard[color] += amount
+        excess -= amount
+    for color in surplus:
+        amount = min(excess, gems[color] - discard[color])
+        discard[color] += amount
+        excess -= amount
+    return dict(action, discard=discard)
+
+
+def _purchase(target):
+    _, _, _, source, card, _ = target
+    return {'type': 'purchase', 'tier': card.tier, 'card_id': card.id, 'source': source}
+
+
+def _take_toward(state, player, needs):
+    """needs를 채우는 턴 수를 가장 많이 줄이는 가져오기 행동 (가져올 수 있는 토큰이 없으면 None)"""
+    bank = state.bank
+    gold = player.gems['gold']
+    available = [c for c in COLORS if bank[c] > 0]
+    if not available:
+        return None
+
+    need = dict(zip(COLORS, needs))
+    wanted = sorted((c for c in available if need[c]), key=lambda c: need[c], reverse=True)
+    picks = wanted[:3]
+    # 남는 자리는 필요 없는 색 중 은행에 많이 남은 색으로 채움 (10개를 넘기지 않는 만큼만)
+    room = 10 - sum(player.gems.values())
+    filler = sorted((c for c in available if not need[c]), key=lambda c: bank[c], reverse=True)
+    picks += filler[:max(0, min(3, room) - len(picks))]
+
+    options = [{'type': 'take_diff', 'colors': picks}]
+    options += [{'type': 'take_same', 'color': c} for c in wanted if need[c] >= 2 and bank[c] >= 4]
+
+    bank_key = _bank_key(state)
+    best = None
+    for action in options:
+        taken = action['colors'] if action['type'] == 'take_diff' else [action['color']] * 2
+        if not taken:
+            continue
+        after = list(needs)
+        for color in taken:
+            i = COLORS.index(color)
+            after[i] = max(0, after[i] - 1)
+        turns = turns_to_afford(tuple(after), gold, bank_key)
+        score = (turns is not None, -(turns or 0), sum(needs) - sum(after))
+        if best is None or score > best[0]:
+            best = (score, action, taken)
+    if best is None:
+        return None
+
+    _, action, taken = best
+    gems = dict(player.gems)
+    for color in taken:
+        gems[color] += 1
+    if action['type'] == 'take_diff':
+        action['colors'] = [c for c in COLORS if c in taken]  # 합법 액션과 같은 색 순서
+    return _with_discard(action, gems, _keep(player, needs))
+
+
+def _keep(player, needs):
+    """목표 카드를 위해 남기고 싶은 색별 토큰 수 (이미 가진 것 + 아직 모자란 것)"""
+    return {c: player.gems[c] + n for c, n in zip(COLORS, needs)}
+
+
+def choose_lookahead_action(state, rng=random):
+    """현재 차례 플레이어 기준으로 행동 하나를 고릅니다. (LookaheadAgent와 롤아웃 정책이 함께 사용)"""
+    player = state.players[state.current_player_idx]
+    targets = _rank_targets(state, player)
+
+    if targets:
+        best = targets[0]
+        if best[1] == 0:
+            return _purchase(best)
+        action = _take_toward(state, player, best[5])
+        if action is not None:
+            return action
+        # 토큰으로는 진전이 없으면 살 수 있는 카드라도 삼
+        affordable = [t for t in targets if t[1] == 0]
+        if affordable:
+            return _purchase(affordable[0])
+
+    # 목표가 없거나 가져올 토큰이 없으면: 가장 점수가 큰 보드 카드를 예약(황금 토큰), 그래도 안 되면 무작위
+    if len(player.reserved) < 3:
+        cards = [c for tier in (1, 2, 3) for c in state.board[tier]]
+        if cards:
+            card = max(cards, key=lambda c: (c.points, -sum(c.cost.values())))
+            gems = dict(player.gems)
+            if state.bank['gold'] > 0:
+                gems['gold'] += 1
+            action = {'type': 'reserve_public', 'tier': card.tier, 'card_id': card.id}
+            return _with_discard(action, gems, _keep(player, state.card_needs()[card.id]))
+    return state.sample_legal_action(rng)
+
+
+class LookaheadAgent:
+    def __init__(self, player_idx, seed=None):
+        self.player_idx = player_idx
+        self.rng = make_rng(seed)
+
+    def get_action(self, state):
+        return choose_lookahead_action(state, self.rng)
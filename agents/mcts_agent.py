@@ -1,86 +1,729 @@
 import random
 import math
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from splender.actions import NUM_ACTIONS, encode_action, decode_action
 from splender.game import GameState
+from splender.rng import make_rng, fork_rng
+from splender.shared import SharedStateSlots, ResultRing
+from agents.rollout import ROLLOUT_POLICIES, random_policy, evaluate_state
+from agents.endgame import EndgameSolver
 
 class MCTSNode:
-    def __init__(self, state_dict, parent=None, action=None):
-        self.state_dict = state_dict  # 가상 평행우주의 게임 상태 (JSON 딕셔너리)
+    # 노드는 상태를 들고 있지 않고 행동과 통계만 저장합니다. (상태는 루트에서 행동을 재적용해 복원)
+    __slots__ = ('parent', 'action', 'children', 'untried_actions', 'visits', 'wins', 'entry',
+                 'action_id', 'avail', 'proven')
+
+    def __init__(self, parent=None, action=None):
         self.parent = parent          # 부모 노드
         self.action = action          # 이 우주로 오기 위해 취한 행동
         self.children = []            # 파생된 미래의 우주들
         self.untried_actions = None   # 아직 시도해보지 않은 행동들
         self.visits = 0               # 이 우주를 방문한 횟수
         self.wins = 0                 # 이 우주에서 승리한 횟수
+        self.entry = None             # 전치 테이블의 공유 통계 [visits, wins] (사용 시)
+        self.action_id = None         # 고정 액션 인덱스 (정보 집합 탐색에서 자식을 구분하는 키)
+        self.avail = 0                # 부모 방문 때 이 행동이 합법이었던 횟수 (정보 집합 탐색의 UCT용)
+        self.proven = None            # 종반 해결기로 확정된 승리 값 (확정되면 더 탐색하지 않음)
+
+
+class TranspositionTable:
+    """
+    Zobrist 해시 → 공유 통계 [visits, wins]. 다른 수순으로 도달한 같은 국면의 노드들이 통계를 함께 씁니다.
+    max_size를 넘으면 가장 오래 쓰이지 않은 항목부터 버립니다. (이미 붙어 있는 노드는 통계를 계속 보유)
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        entry = self.entries[key] = [0, 0]
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return entry
 
 class MCTSAgent:
-    def __init__(self, player_idx, iterations=100):
+    """
+    UCT + 무작위 롤아웃 MCTS 에이전트.
+
+    병렬 탐색 (workers > 1):
+        'root' : 워커 프로세스마다 독립된 트리를 iterations번씩 탐색한 뒤 루트 자식의 방문 수를 합산
+        'leaf' : 하나의 트리에서 가상 손실(virtual loss)로 workers개의 리프를 골라 롤아웃을 동시에 실행
+    워커 풀은 get_action() 호출 사이에 유지되며, close()로 정리합니다.
+    shared_state=True면 국면을 피클하지 않고 고정 크기 공유 메모리 슬롯(splender.shared)에 써서 워커에 넘기고,
+    루트 병렬 탐색의 자식 통계는 작업별 결과 링(ResultRing)으로 돌려받습니다.
+    seed를 주면 워커 수가 같을 때 같은 상태에서 항상 같은 행동을 고릅니다.
+
+    탐색 예산:
+        iterations : 반복 횟수 상한 (time_limit과 함께 쓸 때는 None으로 무제한 가능)
+        time_limit : 한 수당 벽시계 시간 상한(초). 시간이 다 되면 그때까지의 최선 행동을 반환
+        max_nodes  : 트리에 새로 만들 노드 수 상한
+        early_stop : 남은 예산을 모두 2위 행동에 몰아줘도 1위의 방문 수를 넘을 수 없으면 즉시 종료
+
+    롤아웃:
+        rollout_policy : 'random', 'greedy', 'lookahead' 또는 policy(state, rng) -> action 함수
+        rollout_depth  : 지정하면 그 수만큼만 둔 뒤 evaluator(state, player_idx)로 0~1 가치를 매김
+                         (기본 평가 함수는 점수/보너스/귀족 근접도 기반의 evaluate_state)
+
+    transposition_size > 0이면 그 크기의 전치 테이블(LRU)을 두고, 토큰 수순만 다른 같은 국면의 노드들이
+    승률 통계를 공유하게 합니다. (UCT의 승률 항은 공유 통계, 탐험 항은 노드 자신의 방문 수 사용)
+
+    reuse_tree=True면 고른 행동의 하위 트리를 보관했다가, 상대들이 둔 뒤 같은 국면에 해당하는
+    자손 노드를 다음 탐색의 루트로 재사용합니다. (루트 병렬화에서는 사용하지 않음)
+
+    determinize=True면 정보 집합 MCTS(ISMCTS)로 탐색합니다. 매 반복마다 탐색용 상태의 덱 순서와 상대의
+    블라인드 예약 카드를 내 관점에서 다시 섞고(GameState.determinize), 노드의 자식은 고정 액션 인덱스로
+    구분하여 여러 결정화의 통계를 한 트리에 모읍니다. 이번 결정화에서 합법인 자식만 후보가 되며,
+    탐험 항은 부모 방문 수 대신 그 자식이 후보였던 횟수(avail)를 씁니다. dedupe_actions와 전치 테이블은
+    쓰지 않으며, 루트 병렬화에서는 워커마다 서로 다른 결정화들로 탐색한 결과를 합산합니다.
+
+    endgame_depth > 0이면 마지막 라운드이거나 누군가 endgame_score점 이상인 국면의 새 노드를 종반 해결기
+    (agents.endgame.EndgameSolver, 깊이 endgame_depth수, 노드 예산 endgame_nodes)로 먼저 풀어 봅니다.
+    확정되면 롤아웃 대신 그 값을 역전파하고 노드를 증명됨(proven)으로 표시해 다시 고르지 않으며,
+    증명은 조상으로 올라갑니다. (내 차례 노드는 이기는 자식 하나, 상대 차례 노드는 지는 자식 하나,
+    또는 모든 자식이 증명되면 최댓값/최솟값으로 증명) 루트가 증명되면 탐색을 멈추고, 이기는 수가
+    증명되어 있으면 방문 수와 관계없이 그 수를 고릅니다. 정보 집합 모드에서는 결정화마다 값이 달라지므로
+    해결 값을 그 반복의 롤아웃 대신 쓰기만 하고 노드를 증명하지는 않습니다.
+
+    마지막 탐색의 반복 수, 노드 수, 소요 시간, 초당 반복 수, 종료 사유는 last_search_stats에 남습니다.
+    """
+    # 롤아웃 안전장치: 모두가 패스만 할 수 있는 교착 상태에서는 게임이 끝나지 않으므로
+    # 이 턴 수를 넘기면 승자 없음(패배)으로 처리합니다.
+    max_rollout_turns = 1000
+
+    def __init__(self, player_idx, iterations=100, dedupe_actions=False,
+                 workers=1, parallel='root', seed=None,
+                 time_limit=None, max_nodes=None, early_stop=False, reuse_tree=False,
+                 transposition_size=0, rollout_policy='random', rollout_depth=None, evaluator=None,
+                 determinize=False, endgame_depth=0, endgame_score=12, endgame_nodes=20000,
+                 shared_state=False):
+        assert parallel in ('root', 'leaf'), "parallel은 'root' 또는 'leaf'여야 합니다."
+        assert not (determinize and transposition_size), "determinize와 전치 테이블은 함께 쓸 수 없습니다."
+        assert iterations is not None or time_limit is not None or max_nodes is not None, \
+            "iterations, time_limit, max_nodes 중 하나는 지정해야 합니다."
         self.player_idx = player_idx
         self.iterations = iterations  # 생각할 시간 (시뮬레이션 반복 횟수)
+        self.dedupe_actions = dedupe_actions  # 토큰 순효과가 같은 가져오기+디스카드 액션을 하나로 합쳐 분기 수 축소
+        self.workers = workers
+        self.parallel = parallel
+        self.seed = seed
+        # 시드가 없으면 기존처럼 전역 random 스트림을 그대로 사용
+        self.rng = make_rng(seed)
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.early_stop = early_stop
+        self.reuse_tree = reuse_tree
+        self.transposition_size = transposition_size
+        self.rollout_policy = (ROLLOUT_POLICIES[rollout_policy]
+                               if isinstance(rollout_policy, str) else rollout_policy)
+        self.rollout_depth = rollout_depth
+        self.evaluator = evaluator or evaluate_state
+        self.determinize = determinize
+        self.endgame_depth = endgame_depth
+        self.endgame_score = endgame_score
+        self.endgame_nodes = endgame_nodes
+        # 해결기의 메모는 수가 바뀌어도 유지
+        self._solver = EndgameSolver(endgame_depth, endgame_nodes) if endgame_depth else None
+        # 전치 테이블은 수가 바뀌어도 유지 (같은 국면이 다음 탐색에서도 다시 나오므로)
+        self._table = TranspositionTable(transposition_size) if transposition_size else None
+        self.last_search_stats = None
+        self._kept_tree = None  # (내가 고른 행동의 노드, 그 행동을 적용한 상태)
+        # 병렬 탐색 시 국면을 피클 대신 공유 메모리 슬롯으로 워커에 넘김
+        self.shared_state = shared_state
+        self._slots = None
+        self._rings = None
+        self._pool = None
+        self._node_count = 0
+        self._reused_visits = 0
+        self._table_hits = 0
+        self._solved = 0
 
     def get_action(self, state):
+        # 탐색은 GameState 전용 기능(Zobrist 해시, 결정화, 종반 해결기)을 쓰므로 다른 엔진의 상태는 변환
+        # (CompactGameState 등. 고정 액션 인덱스와 슬롯 순서가 같아 고른 행동은 원래 상태에서도 유효)
+        if not isinstance(state, GameState):
+            state = state.to_game_state()
+        if self.workers > 1 and self.parallel == 'root':
+            return self._root_parallel_action(state)
+
+        engine_rng = fork_rng(self.rng)
+        root_node, self.last_search_stats = self._search(state, self._find_reusable_root(state), engine_rng)
+
+        # 탐색이 모두 끝나면, 가장 많이 방문한(가장 확실한) 행동을 반환
+        best_child = self._best_root_child(root_node)
+        if self.reuse_tree:
+            kept_state = state.clone(rng=engine_rng)
+            kept_state.step(best_child.action)
+            self._kept_tree = (best_child, kept_state)
+        return best_child.action
+
+    def close(self):
+        """유지 중인 워커 풀을 종료하고 공유 메모리 슬롯을 해제합니다."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._slots is not None:
+            self._slots.unlink()
+            self._slots = None
+        for ring in self._rings or ():
+            ring.unlink()
+        self._rings = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ==========================================
+    # 탐색 본체
+    # ==========================================
+    def _search(self, state, root_node=None, engine_rng=None):
+        """
+        예산이 다할 때까지 탐색하고 (루트 노드, 탐색 통계)를 반환합니다.
+        root_node를 주면 이전 탐색의 하위 트리를 이어서 키웁니다.
+        engine_rng는 탐색 중 엔진(귀족 동시 충족 시 무작위 선택)이 쓰는 난수 생성기이며,
+        없으면 에이전트 난수에서 포크합니다. (진짜 게임 상태의 난수는 건드리지 않음)
+        """
+        start = time.perf_counter()
+        if engine_rng is None:
+            engine_rng = fork_rng(self.rng)
+
         # 1. 현재 진짜 게임판의 상태를 복제하여 뿌리(Root) 노드 생성
-        root_state_dict = state.export_state()
-        root_node = MCTSNode(root_state_dict)
-        
-        # 임시 게임 엔진 (가상 시뮬레이션용)
-        sim_game = GameState.import_state(root_state_dict)
-        root_node.untried_actions = sim_game.get_legal_actions()
-
-        # 정해진 횟수만큼 평행우주 탐색 반복
-        for _ in range(self.iterations):
-            node = root_node
-            sim_game = GameState.import_state(node.state_dict)
+        #    노드는 상태를 들고 있지 않고, 하나의 탐색용 상태를 apply()/undo()로 오르내립니다.
+        search_state = state.clone(rng=engine_rng)
+        if self._table is not None:
+            search_state.zobrist_hash()  # 이후 apply()/undo()가 해시를 증분 갱신
+        if root_node is None:
+            root_node = MCTSNode()
+            root_node.untried_actions = (self._legal_action_ids(search_state) if self.determinize
+                                         else self._legal_actions(search_state))
+        self._node_count = 0
+        self._solved = 0
+        self._reused_visits = root_node.visits
+        self._table_hits = self._table.hits if self._table is not None else 0
+
+        if self.workers > 1 and self.parallel == 'leaf':
+            done, reason = self._leaf_parallel_search(search_state, root_node, start)
+            return root_node, self._make_stats(done, start, reason)
+
+        # 예산이 남아 있는 동안 평행우주 탐색 반복
+        done = 0
+        while True:
+            reason = self._budget_exhausted(root_node, done, start)
+            if reason:
+                break
 
             # [1] Selection (선택) & [2] Expansion (확장)
-            # 자식이 있고 시도 안 한 액션이 없다면, 가장 유망한 자식으로 내려감 (UCT 알고리즘)
-            while not node.untried_actions and node.children:
-                node = self._select_best_child(node)
-                sim_game.step(node.action)
-                
-            # 시도 안 한 액션이 있다면 하나 골라서 우주(Node)를 확장함
-            if node.untried_actions:
-                action = random.choice(node.untried_actions)
-                node.untried_actions.remove(action)
-                
-                sim_game.step(action)
-                new_state_dict = sim_game.export_state()
-                
-                child_node = MCTSNode(new_state_dict, parent=node, action=action)
-                child_node.untried_actions = sim_game.get_legal_actions()
-                node.children.append(child_node)
-                node = child_node
-
-            # [3] Simulation (시뮬레이션 - 끝날 때까지 막 둬보기)
-            while not sim_game.is_game_over:
-                # 안전장치: 너무 오래 걸리면 중단
-                if not sim_game.get_legal_actions(): break
-                random_action = random.choice(sim_game.get_legal_actions())
-                sim_game.step(random_action)
+            node, sim_game, value = self._select_and_expand(search_state, root_node)
+
+            # [3] Simulation (시뮬레이션 - 끝날 때까지, 또는 rollout_depth수만큼 둬보기)
+            #     종반 해결기로 값이 확정된 노드는 건너뜀
+            if value is None:
+                value = self._playout(sim_game, self.rng)
 
             # [4] Backpropagation (역전파 - 결과 기록하기)
-            # 내가 이겼으면 1점, 졌으면 0점
-            win = 1 if sim_game.winner and sim_game.winner.id == self.player_idx else 0
-            
-            while node is not None:
-                node.visits += 1
-                node.wins += win
-                node = node.parent
+            # 내가 이겼으면 1점, 졌으면 0점 (깊이 제한 롤아웃이면 평가 함수의 0~1 값)
+            self._backpropagate(node, value)
+            done += 1
 
-        # 탐색이 모두 끝나면, 가장 많이 방문한(가장 확실한) 행동을 반환
-        best_child = max(root_node.children, key=lambda c: c.visits)
-        return best_child.action
+        return root_node, self._make_stats(done, start, reason)
+
+    def _budget_exhausted(self, root_node, done, start):
+        """탐색을 멈춰야 하면 종료 사유 문자열을, 계속해도 되면 None을 반환합니다."""
+        if self.iterations is not None and done >= self.iterations:
+            return 'iterations'
+        if done == 0:
+            return None  # 돌려줄 행동이 있도록 최소 한 번은 탐색
+        if root_node.proven is not None:
+            return 'proven'
+        if self.max_nodes is not None and self._node_count >= self.max_nodes:
+            return 'nodes'
+
+        elapsed = time.perf_counter() - start
+        if self.time_limit is not None and elapsed >= self.time_limit:
+            return 'time'
+
+        if self.early_stop and self._is_decided(root_node, done, elapsed):
+            return 'early'
+        return None
+
+    def _is_decided(self, root_node, done, elapsed):
+        """남은 예산으로 2위가 1위의 방문 수를 따라잡을 수 없는지 판단합니다."""
+        if not root_node.untried_actions and len(root_node.children) <= 1:
+            return True  # 고를 수 있는 행동이 하나뿐
+
+        remaining = float('inf')
+        if self.iterations is not None:
+            remaining = self.iterations - done
+        if self.time_limit is not None and elapsed > 0:
+            # 지금까지의 속도로 남은 시간 동안 돌 수 있는 반복 수 추정
+            remaining = min(remaining, done / elapsed * (self.time_limit - elapsed))
+        if remaining == float('inf'):
+            return False
+
+        first = second = 0
+        for child in root_node.children:
+            if child.visits > first:
+                first, second = child.visits, first
+            elif child.visits > second:
+                second = child.visits
+        return first - second > remaining
+
+    def _make_stats(self, done, start, reason):
+        elapsed = time.perf_counter() - start
+        return {
+            'iterations': done,
+            'nodes': self._node_count,
+            'elapsed': elapsed,
+            'iterations_per_sec': done / elapsed if elapsed > 0 else 0.0,
+            'stop_reason': reason,
+            'reused_visits': self._reused_visits,
+            'transposition_hits': self._table.hits - self._table_hits if self._table is not None else 0,
+            'endgame_solved': self._solved,
+        }
+
+    # ==========================================
+    # 트리 재사용
+    # ==========================================
+    def _find_reusable_root(self, state):
+        """
+        보관해 둔 하위 트리에서 현재 국면과 같은 자손을 찾아 새 루트로 떼어 냅니다. 없으면 None.
+        상대들이 둔 수(플레이어 수 - 1 수)를 자식 행동으로 재적용하며 국면 요약을 비교합니다.
+        """
+        kept, self._kept_tree = self._kept_tree, None
+        if kept is None or self.workers > 1 and self.parallel == 'root':
+            return None
+
+        node, node_state = kept
+        target = _state_signature(state)
+        depth = (state.current_player_idx - node_state.current_player_idx) % state.num_players
+        found = self._match_descendant(node, node_state, state, target, depth)
+        if found is not None:
+            found.parent = None  # 위쪽 트리는 버려서 메모리 해제
+        return found
+
+    def _match_descendant(self, node, node_state, state, target, depth):
+        if depth == 0:
+            return node if _state_signature(node_state) == target else None
+
+        legal_ids = set(self._legal_action_ids(node_state)) if self.determinize else None
+        for child in node.children:
+            mover = node_state.current_player_idx
+            if legal_ids is not None:
+                # 정보 집합 트리의 자식 행동은 id로만 의미가 있으므로 실제 국면에서 다시 해석
+                if child.action_id not in legal_ids:
+                    continue
+                record = node_state.apply(decode_action(node_state, child.action_id))
+            else:
+                record = node_state.apply(child.action)
+            try:
+                # 방금 둔 플레이어의 자원은 내 차례까지 바뀌지 않으므로 먼저 비교해 가지치기
+                if _player_signature(node_state.players[mover]) != _player_signature(state.players[mover]):
+                    continue
+                found = self._match_descendant(child, node_state, state, target, depth - 1)
+                if found is not None:
+                    return found
+            finally:
+                node_state.undo(record)
+        return None
+
+    def _select_and_expand(self, search_state, root_node):
+        """
+        루트에서 리프까지 내려가 새 노드 하나를 확장하고, (리프 노드, 롤아웃용 상태 사본, 확정 값)을 반환합니다.
+        종반 해결기로 값이 확정되었으면 상태 사본은 None이고, 아니면 확정 값이 None입니다.
+        search_state는 반환 전에 루트 상태로 되돌려 둡니다.
+        """
+        if self.determinize:
+            search_state.determinize(self.player_idx, self.rng)
+
+        path = []  # 이번 반복에서 적용한 액션들의 undo 기록
+        node = self._select(search_state, root_node, path)
+        node = self._expand(search_state, node, path)
+
+        value = node.proven
+        if value is None and self._solver is not None:
+            value = self._solve_leaf(search_state, node, path)
+        if value is None:
+            sim_game = search_state.clone(rng=search_state.rng)
+            sim_game.invalidate_hash()  # 롤아웃에서는 해시를 갱신할 필요가 없음
+        else:
+            sim_game = None
 
-    def _select_best_child(self, node):
-        """UCT (Upper Confidence Bound) 공식을 사용하여 승률+탐험 가치가 가장 높은 자식을 고릅니다."""
+        # 탐색용 상태를 뿌리 상태로 되돌림
+        for record in reversed(path):
+            search_state.undo(record)
+
+        return node, sim_game, value
+
+    def _select(self, search_state, node, path):
+        """자식이 있고 시도 안 한 액션이 없다면, 가장 유망한 자식으로 내려감 (UCT 알고리즘)"""
+        if self.determinize:
+            return self._select_information_set(search_state, node, path)
+        while not node.untried_actions and node.children and node.proven is None:
+            node = self._select_best_child(node)
+            path.append(search_state.apply(node.action))
+        return node
+
+    def _select_information_set(self, search_state, node, path):
+        """
+        정보 집합 트리 선택: 이번 결정화에서 합법인 행동 id 중 자식이 없는 것이 있으면 그 노드에서 멈추고
+        (node.untried_actions에 담아 확장에 넘김), 모두 자식이 있으면 그중 UCT가 가장 높은 자식으로 내려갑니다.
+        """
+        while True:
+            legal = self._legal_action_ids(search_state)
+            children = {child.action_id: child for child in node.children}
+            available = []
+            untried = []
+            for action_id in legal:
+                child = children.get(action_id)
+                if child is None:
+                    untried.append(action_id)
+                else:
+                    child.avail += 1
+                    available.append(child)
+            node.untried_actions = untried
+            if untried or not available:
+                return node
+            node = self._select_best_child(node, available)
+            path.append(search_state.apply(decode_action(search_state, node.action_id)))
+
+    def _expand(self, search_state, node, path):
+        """시도 안 한 액션이 있다면 하나 골라서 우주(Node)를 확장하고 새 노드를 반환합니다."""
+        if not node.untried_actions or node.proven is not None:
+            return node
+
+        action = self.rng.choice(node.untried_actions)
+        node.untried_actions.remove(action)
+
+        if self.determinize:
+            # 정보 집합 모드의 미시도 목록은 행동 id이며, 자식의 목록은 방문할 때마다 새로 계산
+            action_id, action = action, decode_action(search_state, action)
+            path.append(search_state.apply(action))
+            child_node = MCTSNode(parent=node, action=action)
+            child_node.action_id = action_id
+            child_node.avail = 1
+            node.children.append(child_node)
+            self._node_count += 1
+            return child_node
+
+        path.append(search_state.apply(action))
+
+        child_node = MCTSNode(parent=node, action=action)
+        child_node.untried_actions = self._legal_actions(search_state)
+        if self._table is not None:
+            child_node.entry = self._table.lookup(search_state.zobrist_hash())
+        node.children.append(child_node)
+        self._node_count += 1
+        return child_node
+
+    # ==========================================
+    # 종반 해결
+    # ==========================================
+    def _near_end(self, state):
+        return state.is_last_round or any(p.score >= self.endgame_score for p in state.players)
+
+    def _solve_leaf(self, search_state, node, path):
+        """리프 국면이 종반이면 해결기로 풀어 보고, 확정되면 (정보 집합 모드가 아니면) 증명을 기록합니다."""
+        if search_state.is_game_over:
+            winner = search_state.winner
+            value = 1 if winner is not None and winner.id == self.player_idx else 0
+        elif self._near_end(search_state):
+            value = self._solver.solve(search_state, self.player_idx)
+            if value is None:
+                return None
+            self._solved += 1
+        else:
+            return None
+
+        if not self.determinize:
+            node.proven = value
+            self._propagate_proof(node, path)
+        return value
+
+    def _propagate_proof(self, node, path):
+        """
+        증명된 노드에서 조상으로 증명을 올립니다. path[i][0](undo 기록의 첫 값)은 깊이 i 노드에서 둔 플레이어입니다.
+        """
+        depth = len(path)
+        while node.parent is not None:
+            depth -= 1
+            parent = node.parent
+            mine = path[depth][0] == self.player_idx
+            if node.proven == (1 if mine else 0):
+                parent.proven = node.proven
+            elif not parent.untried_actions and all(c.proven is not None for c in parent.children):
+                values = [c.proven for c in parent.children]
+                parent.proven = max(values) if mine else min(values)
+            else:
+                return
+            node = parent
+
+    @staticmethod
+    def _best_root_child(root_node):
+        """이기는 수가 증명되어 있으면 그 수, 아니면 지는 것으로 증명되지 않은 자식 중 가장 많이 방문한 자식"""
+        children = root_node.children
+        winning = [c for c in children if c.proven == 1]
+        if winning:
+            return winning[0]
+        candidates = [c for c in children if c.proven != 0] or children
+        return max(candidates, key=lambda c: c.visits)
+
+    def _playout(self, sim_game, rng):
+        return _simulate(sim_game, rng, self.player_idx, self._rollout_options())
+
+    def _rollout_options(self):
+        return (self.rollout_policy, self.rollout_depth, self.evaluator, self.max_rollout_turns)
+
+    @staticmethod
+    def _rollout(sim_game, rng, max_turns, policy=random_policy):
+        """끝날 때까지(최대 max_turns턴) policy로 두고 승자 id(없으면 None)를 반환합니다."""
+        for _ in range(max_turns):
+            if sim_game.is_game_over:
+                break
+            sim_game.step(policy(sim_game, rng))
+        return sim_game.winner.id if sim_game.winner else None
+
+    @staticmethod
+    def _backpropagate(node, win, visits=1):
+        while node is not None:
+            node.visits += visits
+            node.wins += win
+            if node.entry is not None:
+                node.entry[0] += visits
+                node.entry[1] += win
+            node = node.parent
+
+    def _legal_actions(self, state):
+        """종료된 상태에서는 더 둘 수 있는 행동이 없으므로 확장하지 않습니다."""
+        if state.is_game_over:
+            return []
+        return state.get_legal_actions(dedupe=self.dedupe_actions)
+
+    @staticmethod
+    def _legal_action_ids(state):
+        if state.is_game_over:
+            return []
+        return state.legal_action_ids()
+
+    def _select_best_child(self, node, available=None):
+        """
+        UCT (Upper Confidence Bound) 공식을 사용하여 승률+탐험 가치가 가장 높은 자식을 고릅니다.
+        available(정보 집합 모드)을 주면 그 자식들만 후보로 하고, 부모 방문 수 대신 avail을 씁니다.
+        """
         best_score = -1
         best_child = None
-        for child in node.children:
+        for child in node.children if available is None else available:
+            if child.proven is not None:
+                continue  # 값이 확정된 자식에는 더 반복을 쓰지 않음
             # 승률 (Exploitation) + 탐험 보너스 (Exploration)
-            win_rate = child.wins / child.visits
-            exploration = math.sqrt(2 * math.log(node.visits) / child.visits)
+            # 전치 테이블을 쓰면 같은 국면의 다른 노드들이 모은 통계로 승률을 추정
+            stats = child.entry
+            win_rate = stats[1] / stats[0] if stats is not None else child.wins / child.visits
+            parent_visits = node.visits if available is None else child.avail
+            exploration = math.sqrt(2 * math.log(parent_visits) / child.visits)
             uct_score = win_rate + exploration
-            
+
             if uct_score > best_score:
                 best_score = uct_score
                 best_child = child
         return best_child
+
+    # ==========================================
+    # 병렬 탐색
+    # ==========================================
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _ship(self, states):
+        """
+        워커에 넘길 국면 인자들. shared_state면 슬롯에 써 두고 (슬롯 배열, 번호)를 넘기며,
+        슬롯 배열은 피클 시 이름만 전달됩니다. (_load_state 참고)
+        """
+        if not self.shared_state:
+            return states
+        if self._slots is None:
+            self._slots = SharedStateSlots(self.workers)
+        for i, state in enumerate(states):
+            self._slots.write(i, state)
+        return [(self._slots, i) for i in range(len(states))]
+
+    def _result_rings(self):
+        """
+        루트 병렬 작업마다 하나씩 쓰는 결과 링 (shared_state일 때만). 워커가 루트 자식 통계를
+        (액션 인덱스, 방문 수, 승리) 레코드로 써 두면 여기서 읽어 합산합니다. 자식은 액션 인덱스마다
+        하나뿐이므로 용량 NUM_ACTIONS면 넘치지 않습니다.
+        """
+        if not self.shared_state:
+            return [None] * self.workers
+        if self._rings is None:
+            self._rings = [ResultRing(NUM_ACTIONS, '<IId') for _ in range(self.workers)]
+        return self._rings
+
+    def _task_seeds(self, count):
+        return [self.rng.getrandbits(64) for _ in range(count)]
+
+    def _root_parallel_action(self, state):
+        """루트 병렬화: 독립 트리들의 루트 자식 통계를 고정 액션 인덱스 기준으로 합산합니다."""
+        start = time.perf_counter()
+        seeds = self._task_seeds(self.workers)
+        options = {
+            'iterations': self.iterations, 'dedupe_actions': self.dedupe_actions,
+            'time_limit': self.time_limit, 'max_nodes': self.max_nodes, 'early_stop': self.early_stop,
+            'transposition_size': self.transposition_size, 'rollout_policy': self.rollout_policy,
+            'rollout_depth': self.rollout_depth, 'evaluator': self.evaluator,
+            'determinize': self.determinize, 'endgame_depth': self.endgame_depth,
+            'endgame_score': self.endgame_score, 'endgame_nodes': self.endgame_nodes,
+        }
+        (source,) = self._ship([state])
+        rings = self._result_rings()
+        futures = [
+            self._get_pool().submit(_root_search_worker, source, self.player_idx, options, seed, ring)
+            for seed, ring in zip(seeds, rings)
+        ]
+
+        merged = {}
+        done = nodes = solved = 0
+        reasons = set()
+        for future, ring in zip(futures, rings):
+            child_stats, search_stats = future.result()
+            if ring is not None:
+                child_stats = ring.drain()
+            for action_id, visits, wins in child_stats:
+                total = merged.setdefault(action_id, [0, 0])
+                total[0] += visits
+                total[1] += wins
+            done += search_stats['iterations']
+            nodes += search_stats['nodes']
+            solved += search_stats['endgame_solved']
+            reasons.add(search_stats['stop_reason'])
+
+        self._node_count = nodes
+        self._solved = solved
+        self.last_search_stats = self._make_stats(done, start, ','.join(sorted(reasons)))
+        best_id = max(merged, key=lambda a: merged[a][0])
+        return decode_action(state, best_id)
+
+    def _leaf_parallel_search(self, search_state, root_node, start):
+        """
+        리프 병렬화: 매 배치마다 workers개의 리프를 고르되, 고른 경로에 가상 손실(방문 +1, 승리 0)을
+        먼저 반영해 같은 경로가 반복 선택되지 않도록 하고, 롤아웃은 워커 풀에서 동시에 실행합니다.
+        (반복 수, 종료 사유)를 반환합니다.
+        """
+        pool = self._get_pool()
+        done = 0
+        while True:
+            reason = self._budget_exhausted(root_node, done, start)
+            if reason:
+                return done, reason
+
+            batch = self.workers
+            if self.iterations is not None:
+                batch = min(batch, self.iterations - done)
+            leaves = []
+            for _ in range(batch):
+                node, sim_game, value = self._select_and_expand(search_state, root_node)
+                if value is not None:
+                    self._backpropagate(node, value)  # 종반 해결기로 확정된 값은 바로 반영
+                    continue
+                self._backpropagate(node, 0)  # 가상 손실
+                leaves.append((node, sim_game))
+            done += batch
+            if not leaves:
+                continue
+
+            seeds = self._task_seeds(len(leaves))
+            values = pool.map(
+                _rollout_worker, self._ship([sim for _, sim in leaves]), seeds,
+                [self.player_idx] * len(leaves), [self._rollout_options()] * len(leaves)
+            )
+
+            # 방문 수는 가상 손실로 이미 더했으므로 승리만 반영
+            for (node, _), value in zip(leaves, values):
+                self._backpropagate(node, value, visits=0)
+
+
+def _player_signature(player):
+    return (
+        tuple(player.gems.values()), tuple(c.id for c in player.reserved),
+        len(player.cards), len(player.nobles), player.score,
+    )
+
+
+def _state_signature(state):
+    """트리 재사용 시 두 국면이 같은지 비교하기 위한 요약 (덱은 길이만 비교)."""
+    return (
+        state.current_player_idx, tuple(state.bank.values()),
+        tuple(tuple(c.id for c in state.board[t]) for t in (1, 2, 3)),
+        tuple(len(state.decks[t]) for t in (1, 2, 3)),
+        tuple(n.id for n in state.nobles),
+        tuple(_player_signature(p) for p in state.players),
+        state.is_last_round,
+    )
+
+
+# ==========================================
+# 워커 프로세스 작업 (피클 가능하도록 모듈 수준에 정의)
+# ==========================================
+def _simulate(sim_game, rng, player_idx, options):
+    """
+    롤아웃을 진행하고 player_idx 관점의 가치(0~1)를 반환합니다.
+    rollout_depth가 있으면 그만큼만 두고, 게임이 끝나지 않았으면 평가 함수로 점수를 매깁니다.
+    """
+    policy, depth, evaluator, max_turns = options
+    turns = max_turns if depth is None else min(depth, max_turns)
+    winner_id = MCTSAgent._rollout(sim_game, rng, turns, policy)
+    if depth is None or sim_game.is_game_over:
+        return 1 if winner_id == player_idx else 0
+    return evaluator(sim_game, player_idx)
+
+
+def _load_state(source):
+    """MCTSAgent._ship()이 넘긴 인자로부터 국면을 얻습니다. (공유 메모리 슬롯이면 그 자리에서 복원)"""
+    if isinstance(source, tuple):
+        slots, index = source
+        state = slots.read(index)
+        slots.close()  # 복원한 상태는 독립 객체이므로 바로 매핑을 닫음
+        return state
+    return source
+
+
+def _root_search_worker(source, player_idx, options, seed, ring=None):
+    """
+    독립 트리 하나를 탐색하고 (루트 자식 통계, 탐색 통계)를 반환합니다. 자식 통계는 (액션 인덱스, 방문 수, 승리)
+    목록이며, ring이 있으면 그 링에 쓰고 None을 반환합니다.
+    """
+    state = _load_state(source)
+    agent = MCTSAgent(player_idx, seed=seed, **options)
+    root_node, search_stats = agent._search(state)
+    child_stats = [
+        (encode_action(state, child.action), child.visits, child.wins)
+        for child in root_node.children
+    ]
+    if ring is None:
+        return child_stats, search_stats
+    for record in child_stats:
+        ring.put(*record)
+    ring.close()
+    return None, search_stats
+
+
+def _rollout_worker(source, seed, player_idx, options):
+    sim_game = _load_state(source)
+    rng = random.Random(seed)
+    sim_game.rng = rng
+    return _simulate(sim_game, rng, player_idx, options)
@@ -0,0 +1,228 @@
+"""
+AlphaZero 방식의 PUCT 탐색 에이전트: 롤아웃 대신 정책/가치 평가기(agents.evaluators)로 리프를 평가합니다.
+
+- 한 번에 batch_size개의 리프를 고르고(가상 손실로 같은 경로의 중복 선택을 피함) 평가기를 한 번만 호출합니다.
+- 평가 결과는 (Zobrist 해시, 블라인드 예약 카드) 키의 LRU 캐시에 두어 같은 국면을 다시 평가하지 않습니다.
+- 가치는 플레이어별 승리 확률 벡터이며, 각 노드는 그 노드로 오는 수를 둔 플레이어 관점의 값을 누적합니다.
+"""
+import math
+import time
+from collections import OrderedDict
+from splender.actions import decode_action
+from splender.rng import make_rng, fork_rng
+from agents.evaluators import make_evaluator
+
+
+class PUCTNode:
+    __slots__ = ('parent', 'action_id', 'prior', 'mover', 'children', 'visits', 'value_sum', 'terminal')
+
+    def __init__(self, parent=None, action_id=None, prior=1.0, mover=None):
+        self.parent = parent          # 부모 노드
+        self.action_id = action_id    # 이 노드로 오는 고정 액션 인덱스
+        self.prior = prior            # 평가기가 준 사전 확률 P(s, a)
+        self.mover = mover            # 이 노드로 오는 수를 둔 플레이어 (루트는 None)
+        self.children = None          # 평가 후 확장된 자식들 (None이면 아직 리프)
+        self.visits = 0               # 방문 수 (가상 손실 포함)
+        self.value_sum = 0.0          # mover 관점 가치의 합
+        self.terminal = None          # 종료 국면이면 플레이어별 결과 벡터
+
+
+class PUCTAgent:
+    """
+    PUCT 선택식: Q(s, a) + c_puct * P(s, a) * sqrt(N(s)) / (1 + N(s, a))
+    방문하지 않은 자식의 Q는 1 / 인원수(중립 승률)로 둡니다.
+
+    evaluator  : agents.evaluators의 평가기 객체, 'heuristic', 또는 MLPEvaluator의 .npz 경로
+    batch_size : 평가기 한 번에 모을 리프 수. 같은 배치 안에서는 고른 경로에 가상 손실(방문 +1, 가치 0)을
+                 먼저 반영하고, 평가가 끝나면 가치만 더합니다. 평가를 기다리는 리프에 다시 도달하면 시뮬레이션으로
+                 세지 않고 그 경로에 가상 손실만 하나 더 얹어 다음 선택이 다른 가지로 가게 합니다. (평가 후 제거)
+                 이런 충돌이 batch_size번 나면 배치를 그대로 마감합니다.
+    cache_size : 평가 캐시(LRU) 크기. 캐시는 수가 바뀌어도 유지됩니다.
+    iterations / time_limit : 탐색 예산 (시뮬레이션 수 / 한 수당 초)
+
+    마지막 탐색의 반복 수, 노드 수, 평가기 호출 수, 평가한 상태 수, 캐시 적중 수, 충돌 수 등은 last_search_stats에 남습니다.
+    """
+
+    def __init__(self, player_idx, iterations=200, time_limit=None, batch_size=8, c_puct=1.5,
+                 evaluator=None, cache_size=100000, seed=None):
+        assert iterations is not None or time_limit is not None, "iterations와 time_limit 중 하나는 지정해야 합니다."
+        self.player_idx = player_idx
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.batch_size = batch_size
+        self.c_puct = c_puct
+        self.evaluator = make_evaluator(evaluator)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.seed = seed
+        self.rng = make_rng(seed)
+        self.last_search_stats = None
+        self._stats = None
+        self._neutral = 0.5
+
+    def get_action(self, state):
+        root = self._search(state)
+        best = max(root.children, key=lambda c: c.visits)
+        return decode_action(state, best.action_id)
+
+    # ==========================================
+    # 탐색 본체
+    # ==========================================
+    def _search(self, state):
+        start = time.perf_counter()
+        self._stats = {'nodes': 0, 'evaluator_calls': 0, 'evaluated_states': 0, 'cache_hits': 0, 'collisions': 0}
+        self._neutral = 1.0 / state.num_players
+
+        # 진짜 상태의 난수는 건드리지 않도록 엔진 난수를 포크한 사본을 apply()/undo()로 오르내림
+        search_state = state.clone(rng=fork_rng(self.rng))
+        search_state.zobrist_hash()  # 이후 apply()/undo()가 해시를 증분 갱신 (캐시 키)
+
+        root = PUCTNode()
+        pending = {}
+        self._visit_leaf(search_state, root, pending)
+        self._flush(pending)
+
+        done = 0
+        while True:
+            reason = self._budget_exhausted(done, start)
+            if reason:
+                break
+            batch = self.batch_size
+            if self.iterations is not None:
+                batch = min(batch, self.iterations - done)
+            collected = collisions = 0
+            while collected < batch and collisions < self.batch_size:
+                if self._simulate(search_state, root, pending):
+                    collected += 1
+                else:
+                    collisions += 1
+            done += collected
+            self._flush(pending)
+
+        elapsed = time.perf_counter() - start
+        stats = self._stats
+        self.last_search_stats = dict(
+            stats, iterations=done, elapsed=elapsed,
+            iterations_per_sec=done / elapsed if elapsed > 0 else 0.0, stop_reason=reason,
+            mean_batch=stats['evaluated_states'] / stats['evaluator_calls'] if stats['evaluator_calls'] else 0.0,
+        )
+        return root
+
+    def _budget_exhausted(self, done, start):
+        if self.iterations is not None and done >= self.iterations:
+            return 'iterations'
+        if done and self.time_limit is not None and time.perf_counter() - start >= self.time_limit:
+            return 'time'
+        return None
+
+    def _simulate(self, search_state, root, pending):
+        """
+        루트에서 PUCT로 리프까지 내려가 리프를 처리하고 탐색용 상태를 되돌립니다.
+        평가를 기다리는 리프에 도달했으면(시뮬레이션으로 세지 않음) False를 반환합니다.
+        """
+        path = []
+        node = root
+        while node.children:
+            node = self._select_child(node)
+            path.append(search_state.apply(decode_action(search_state, node.action_id)))
+        try:
+            return self._visit_leaf(search_state, node, pending)
+        finally:
+            for record in reversed(path):
+                search_state.undo(record)
+
+    def _select_child(self, node):
+        c_sqrt = self.c_puct * math.sqrt(max(node.visits, 1))
+        neutral = self._neutral
+        best_score = -1.0
+        best = None
+        for child in node.children:
+            visits = child.visits
+            q = child.value_sum / visits if visits else neutral
+            score = q + c_sqrt * child.prior / (1 + visits)
+            if score > best_score:
+                best_score = score
+                best = child
+        return best
+
+    # ==========================================
+    # 리프 평가
+    # ==========================================
+    def _visit_leaf(self, state, node, pending):
+        """
+        종료 국면이나 캐시에 있는 국면이면 바로 역전파하고, 아니면 가상 손실을 반영한 뒤 배치에 넣습니다.
+        이미 배치에 있는 리프면 가상 손실만 더 얹고 False를 반환합니다.
+        """
+        if node.terminal is None and state.is_game_over:
+            winner = state.winner
+            node.terminal = [1.0 if winner is not None and winner.id == p else 0.0
+                             for p in range(state.num_players)]
+        if node.terminal is not None:
+            self._backpropagate(node, node.terminal)
+            return True
+
+        entry = pending.get(node)
+        if entry is not None:
+            entry[3] += 1  # 추가 가상 손실 (평가 후 방문 수에서 다시 뺌)
+            self._stats['collisions'] += 1
+            self._backpropagate(node, None)
+            return False
+
+        key = (state.zobrist_hash(), tuple(c.id for p in state.players for c in p.blind_reserved))
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self._stats['cache_hits'] += 1
+            ids, priors, values = cached
+            self._expand(state, node, ids, priors)
+            self._backpropagate(node, self._absolute(state, values))
+            return True
+
+        self._backpropagate(node, None)  # 가상 손실
+        pending[node] = [state.clone(rng=state.rng), state.legal_action_ids(), key, 0]
+        return True
+
+    def _flush(self, pending):
+        """모아 둔 리프들을 평가기 한 번으로 평가하고, 확장 후 가치를 역전파합니다."""
+        if not pending:
+            return
+        entries = list(pending.items())
+        pending.clear()
+        states = [entry[0] for _, entry in entries]
+        legal_ids = [entry[1] for _, entry in entries]
+        priors, values = self.evaluator.evaluate(states, legal_ids)
+        self._stats['evaluator_calls'] += 1
+        self._stats['evaluated_states'] += len(states)
+
+        for (node, (state, ids, key, extra)), prior, value in zip(entries, priors, values):
+            prior = [float(p) for p in prior]
+            value = [float(v) for v in value]
+            self.cache[key] = (ids, prior, value)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            self._expand(state, node, ids, prior)
+            # 방문 수는 가상 손실로 이미 더했으므로 가치만 반영하고, 충돌로 얹은 가상 손실은 되돌림
+            self._backpropagate(node, self._absolute(state, value), visits=-extra)
+
+    def _expand(self, state, node, ids, priors):
+        if node.children is not None:
+            return
+        mover = state.current_player_idx
+        node.children = [PUCTNode(node, action_id, prior, mover) for action_id, prior in zip(ids, priors)]
+        self._stats['nodes'] += len(ids)
+
+    @staticmethod
+    def _absolute(state, values):
+        """현재 차례 기준 슬롯 순서의 가치 벡터를 좌석 순서로 바꿉니다."""
+        n = state.num_players
+        current = state.current_player_idx
+        return [values[(p - current) % n] for p in range(n)]
+
+    @staticmethod
+    def _backpropagate(node, values, visits=1):
+        """values가 None이면 방문 수만 더합니다. (가상 손실)"""
+        while node is not None:
+            node.visits += visits
+            if values is not None and node.mover is not None:
+                node.value_sum += values[node.mover]
+            node = node.parent
@@ -1,16 +1,16 @@
-import random
+from splender.rng import make_rng
 
 class RandomAgent:
-    def __init__(self, player_idx):
+    def __init__(self, player_idx, seed=None):
         self.player_idx = player_idx
+        # 시드(또는 random.Random)가 없으면 기존처럼 전역 random 스트림을 사용
+        self.rng = make_rng(seed)
 
     def get_action(self, state):
         """
         현재 상태에서 가능한 합법적 행동(Legal Actions) 중 
         무작위로 하나를 골라 반환합니다.
         """
-        # 현재 엔진에서 유효한 액션 목록 뽑아오기
-        legal_actions = state.get_legal_actions()
-        
-        # 무작위로 하나 선택
-        return random.choice(legal_actions)
+        # 전체 액션 목록을 만들지 않고 유효한 액션 하나를 균등하게 추출
+        # (rng.choice(state.get_legal_actions())와 같은 결과)
+        return state.sample_legal_action(self.rng)
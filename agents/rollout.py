@@ -0,0 +1,65 @@
+"""
+MCTS 롤아웃 정책과 정적 평가 함수.
+
+정책은 policy(state, rng) -> action 형태의 함수이며, 프로세스 풀로 넘길 수 있도록 모듈 수준에 둡니다.
+평가 함수는 evaluator(state, player_idx) -> 0~1 (player_idx의 승리 가능성 추정) 형태입니다.
+"""
+import math
+from agents.greedy_agent import choose_greedy_action
+from agents.lookahead_agent import choose_lookahead_action
+
+
+def random_policy(state, rng):
+    """균등 무작위 (전체 액션 목록을 만들지 않고 하나만 추출)"""
+    return state.sample_legal_action(rng)
+
+
+def greedy_policy(state, rng):
+    """GreedyAgent 규칙: 가장 점수가 높은 카드 구매 → 3색 가져오기 → 같은 색 → 예약"""
+    return choose_greedy_action(state, state.get_legal_actions(), rng)
+
+
+def lookahead_policy(state, rng):
+    """LookaheadAgent 규칙: 턴당 가치가 가장 큰 목표 카드를 사거나 그 카드까지의 턴 수를 줄이는 토큰 가져오기"""
+    return choose_lookahead_action(state, rng)
+
+
+ROLLOUT_POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+    'lookahead': lookahead_policy,
+}
+
+
+# ==========================================
+# 정적 평가
+# ==========================================
+BONUS_WEIGHT = 0.4      # 보너스 1개 ≈ 앞으로 아낄 토큰 → 점수 환산 가중치
+GEM_WEIGHT = 0.05       # 보유 토큰 1개 (황금은 2배)
+NOBLE_WEIGHT = 0.6      # 귀족 점수 × 달성률² 중 반영 비율
+TEMPERATURE = 0.5       # 휴리스틱 점수 차이 → 승리 확률 변환 (softmax 기울기)
+
+
+def heuristic_score(state, player):
+    """점수 + 보너스 + 귀족 근접도 + 토큰으로 본 플레이어의 현재 형세"""
+    value = player.score + BONUS_WEIGHT * sum(player.bonuses.values())
+    value += GEM_WEIGHT * (sum(player.gems.values()) + player.gems['gold'])
+
+    bonuses = player.bonuses
+    for noble in state.nobles:
+        required = sum(noble.requirements.values())
+        if required:
+            met = sum(min(bonuses[color], need) for color, need in noble.requirements.items())
+            value += NOBLE_WEIGHT * noble.points * (met / required) ** 2
+    return value
+
+
+def evaluate_state(state, player_idx):
+    """끝난 게임이면 승패(1/0), 아니면 휴리스틱 점수의 softmax로 player_idx의 승리 확률을 추정합니다."""
+    if state.is_game_over:
+        return 1.0 if state.winner is not None and state.winner.id == player_idx else 0.0
+
+    scores = [heuristic_score(state, p) for p in state.players]
+    top = max(scores)
+    weights = [math.exp(TEMPERATURE * (s - top)) for s in scores]
+    return weights[player_idx] / sum(weights)
@@ -0,0 +1,359 @@
+"""
+엔진/에이전트 핫패스 벤치마크: 고정 시드 국면에서 연산별 초당 횟수와 호출당 메모리 할당량을 잽니다.
+
+    python benchmark.py --out bench.json                         # 측정 후 저장
+    python benchmark.py --baseline bench.json --threshold 0.10   # 기준 대비 10% 넘게 느려지면 실패(종료 코드 1)
+
+엔진 항목은 새 프로세스 --processes개에서 각각 모든 항목을 번갈아 재는 라운드를 --rounds번 돌리고,
+프로세스별 중앙값의 중앙값을 씁니다. 프로세스 간 편차로 추정한 상대 오차는 'noise'로 함께 저장합니다.
+셀프플레이 처리량은 누적 --game-min-time초가 될 때까지 같은 게임들을 반복한 패스들의 중앙값입니다.
+회귀 판정의 허용 비율은 항목마다 threshold와 NOISE_SIGMAS × (기준, 현재 noise의 합성) 중 큰 값이며,
+한 프로세스에서만 재는 셀프플레이 처리량과 MCTS 항목은 threshold 대신 --noisy-threshold(기본 25%)를 씁니다.
+
+기준 파일은 같은 호스트에서 같은 세션(부하·클럭 조건이 비슷한 시간대)에 만든 것과만 비교하세요.
+다른 머신이나 다른 시점의 결과와는 호스트 자체의 속도 차이가 회귀로 보일 수 있습니다.
+
+국면 (시드 고정, 무작위 에이전트로 진행하여 조건을 처음 만족하는 상태)
+    opening  : 첫 턴
+    midgame  : 20턴째
+    discard  : 현재 플레이어가 토큰 10개를 가진 상태 (가져오기 액션마다 디스카드 조합 생성)
+    late     : 현재 플레이어가 예약 카드 3장을 가진 상태에서 누군가 10점 이상
+게임 처리량은 에이전트별 셀프플레이로 초당 게임 수/턴 수를 잽니다.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from splender.catalog import load_cards, load_nobles
+from splender.game import GameState
+from agents.random_agent import RandomAgent
+from agents.greedy_agent import GreedyAgent
+from agents.lookahead_agent import LookaheadAgent
+from agents.mcts_agent import MCTSAgent
+
+SCHEMA_VERSION = 2  # 2: ops_per_sec가 여러 프로세스 측정의 중앙값, 항목별 noise 추가
+NOISY_PREFIXES = ('game/', 'mcts/')
+NOISE_SIGMAS = 3.0
+
+POSITIONS = {
+    'opening': lambda state, turn: True,
+    'midgame': lambda state, turn: turn >= 20,
+    'discard': lambda state, turn: sum(state.players[state.current_player_idx].gems.values()) == 10,
+    'late': lambda state, turn: (len(state.players[state.current_player_idx].reserved) == 3
+                                 and max(p.score for p in state.players) >= 10),
+}
+
+
+# ==========================================
+# 고정 국면
+# ==========================================
+def make_position(name, num_players=2, max_seeds=500):
+    """seed 0부터 차례로 무작위 대국을 진행해 조건을 처음 만족하는 국면을 반환합니다. (항상 같은 국면)"""
+    condition = POSITIONS[name]
+    cards, nobles = load_cards(), load_nobles()
+    for seed in range(max_seeds):
+        random.seed(seed)
+        state = GameState(num_players)
+        state.reset(cards, nobles)
+        for turn in range(400):
+            if state.is_game_over:
+                break
+            if condition(state, turn):
+                return state
+            state.step(state.sample_legal_action(random))
+    raise RuntimeError(f"'{name}' 국면을 만들지 못했습니다.")
+
+
+def _first_action(state):
+    return next(state.iter_legal_actions())
+
+
+def engine_cases(state):
+    """(이름, 호출 가능한 함수) 목록. 함수는 국면을 바꾸지 않거나(apply_undo는 되돌림), 사본에서 동작합니다."""
+    exported = state.export_state()
+    action = _first_action(state)
+    player = state.players[state.current_player_idx]
+    gems = player.gems.copy()
+    discard_count = max(1, sum(gems.values()) + 3 - 10)
+
+    def apply_undo():
+        state.undo(state.apply(action))
+
+    return [
+        ('get_legal_actions', state.get_legal_actions),
+        ('count_legal_actions', state.count_legal_actions),
+        ('sample_legal_action', lambda: state.sample_legal_action(random)),
+        ('clone+step', lambda: state.clone().step(action)),  # step 비용 = 이 값 - clone
+        ('apply_undo', apply_undo),
+        ('clone', state.clone),
+        ('export_state', state.export_state),
+        ('import_state', lambda: GameState.import_state(exported)),
+        ('generate_discard_combos', lambda: GameState._generate_discard_combos(gems, discard_count)),
+    ]
+
+
+# ==========================================
+# 측정
+# ==========================================
+def calibrate(func, min_time):
+    """timeit처럼 한 번 재는 데 min_time초 이상 걸리는 반복 수를 찾습니다."""
+    loops = 1
+    while True:
+        if time_loops(func, loops) >= min_time:
+            return loops
+        loops *= 2
+
+
+def time_loops(func, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - start
+
+
+def summarize(samples):
+    """(중앙값, 중앙값의 상대 표준오차 추정)을 반환합니다. 표본이 하나면 noise는 0입니다."""
+    median = statistics.median(samples)
+    if len(samples) < 2:
+        return median, 0.0
+    return median, 1.253 * statistics.stdev(samples) / math.sqrt(len(samples)) / median
+
+
+def measure_allocations(func, calls=50):
+    """
+    tracemalloc으로 호출당 남는 할당 블록 수/바이트(반환값 포함)와 측정 중 최대 추가 메모리를 잽니다.
+    """
+    func()  # 캐시 등 첫 호출 효과 제외
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        peak = 0
+        results = []
+        for _ in range(calls):
+            results.append(func())  # 반환값을 잡아 두어 할당이 해제로 상쇄되지 않게 함
+            current, traced_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, traced_peak)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return {
+        'alloc_blocks_per_call': blocks / calls,
+        'alloc_bytes_per_call': max(0, current - base) / calls,
+        'peak_bytes': max(0, peak - base),
+    }
+
+
+def engine_case_list(positions):
+    return [(f"{name}/{case}", func) for name in positions for case, func in engine_cases(make_position(name))]
+
+
+def engine_rounds(positions, loops, rounds):
+    """
+    한 프로세스 안의 측정: 모든 항목을 loops[i]번씩 한 번 재는 라운드를 rounds번 돌려 항목별 중앙값을
+    반환합니다. (한 항목을 몰아서 재면 그동안의 부하 변화가 그 항목에만 실림)
+    """
+    cases = engine_case_list(positions)
+    rates = [[] for _ in cases]
+    for _ in range(rounds):
+        for (_, func), n, samples in zip(cases, loops, rates):
+            samples.append(n / time_loops(func, n))
+    return {name: statistics.median(samples) for (name, _), samples in zip(cases, rates)}
+
+
+def run_engine_benchmarks(positions, min_time, rounds=2, processes=5):
+    """
+    engine_rounds를 새로 띄운 프로세스 processes개에서 차례로 돌려 프로세스별 중앙값의 중앙값을 쓰고,
+    noise는 프로세스 간 편차로 추정합니다. 같은 코드라도 프로세스마다(해시 시드, 메모리 배치, 그 시점의
+    호스트 상태) 속도가 수십 %씩 달라질 수 있어, 한 프로세스 안의 반복만으로는 편차를 과소평가합니다.
+    """
+    cases = engine_case_list(positions)
+    loops = [calibrate(func, min_time) for _, func in cases]  # 반복 수는 한 번만 정해 모든 프로세스가 공유
+    context = multiprocessing.get_context('spawn')
+    per_process = []
+    for _ in range(processes):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            per_process.append(pool.submit(engine_rounds, positions, loops, rounds).result())
+
+    results = {}
+    for name, func in cases:
+        ops_per_sec, noise = summarize([rates[name] for rates in per_process])
+        row = {'ops_per_sec': ops_per_sec, 'noise': noise}
+        row.update(measure_allocations(func))
+        results[name] = row
+    return results
+
+
+AGENTS = {
+    'random': lambda i: RandomAgent(i),
+    'greedy': lambda i: GreedyAgent(i),
+    'lookahead': lambda i: LookaheadAgent(i),
+    'mcts50': lambda i: MCTSAgent(i, iterations=50, seed=i),
+}
+
+
+def run_game_benchmarks(agent_names, games, num_players=2, max_turns=400, min_time=2.0):
+    """
+    에이전트 셀프플레이 처리량: 초당 게임 수, 초당 턴 수, 수당 평균 시간.
+    시드 0..games-1의 게임들을 한 패스로 하여, 누적 min_time초가 될 때까지(최소 한 번) 패스를 반복하고 중앙값을 씁니다.
+    """
+    cards, nobles = load_cards(), load_nobles()
+    results = {}
+    for name in agent_names:
+        rates = []
+        total = 0.0
+        while not rates or total < min_time:
+            start = time.perf_counter()
+            turns = _self_play(name, games, num_players, max_turns, cards, nobles)
+            elapsed = time.perf_counter() - start
+            rates.append(games / elapsed)
+            total += elapsed
+        ops_per_sec, noise = summarize(rates)
+        results[f"game/{name}"] = {
+            'ops_per_sec': ops_per_sec,
+            'turns_per_sec': ops_per_sec * turns / games,
+            'ms_per_move': games / ops_per_sec / turns * 1000,
+            'noise': noise,
+        }
+    return results
+
+
+def _self_play(name, games, num_players, max_turns, cards, nobles):
+    """한 패스를 진행하고 총 턴 수를 반환합니다. (시드가 고정이라 패스마다 같음)"""
+    turns = 0
+    for seed in range(games):
+        random.seed(seed)
+        state = GameState(num_players)
+        state.reset(cards, nobles)
+        agents = [AGENTS[name](i) for i in range(num_players)]
+        for _ in range(max_turns):
+            if state.is_game_over:
+                break
+            state.step(agents[state.current_player_idx].get_action(state))
+            turns += 1
+    return turns
+
+
+def run_mcts_benchmark(iterations=100, rounds=5):
+    """중반 국면에서 MCTSAgent.get_action()을 rounds번 재서 중앙값을 씁니다. (시드 고정)"""
+    state = make_position('midgame')
+    rates = []
+    iterations_per_sec = []
+    for _ in range(rounds):
+        # 매번 새 에이전트로 같은 탐색을 반복 (트리 재사용 없음)
+        agent = MCTSAgent(state.current_player_idx, iterations=iterations, seed=0)
+        start = time.perf_counter()
+        agent.get_action(state)
+        rates.append(1 / (time.perf_counter() - start))
+        iterations_per_sec.append(agent.last_search_stats['iterations_per_sec'])
+    ops_per_sec, noise = summarize(rates)
+    return {f"mcts/get_action_{iterations}": {
+        'ops_per_sec': ops_per_sec,
+        'iterations_per_sec': statistics.median(iterations_per_sec),
+        'noise': noise,
+    }}
+
+
+# ==========================================
+# 기준 비교
+# ==========================================
+def compare(results, baseline, threshold, noisy_threshold=None):
+    """
+    ops_per_sec가 기준보다 허용 비율 넘게 떨어진 항목들을 (이름, 기준, 현재, 변화율)로 반환합니다.
+    허용 비율은 threshold(NOISY_PREFIXES 항목은 noisy_threshold)와 NOISE_SIGMAS × 기준·현재 noise의
+    합성(제곱합의 제곱근) 중 큰 값입니다.
+    """
+    if noisy_threshold is None:
+        noisy_threshold = threshold
+    regressions = []
+    for name, row in results['benchmarks'].items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if base is None:
+            continue
+        limit = noisy_threshold if name.startswith(NOISY_PREFIXES) else threshold
+        limit = max(limit, NOISE_SIGMAS * math.hypot(row.get('noise', 0.0), base.get('noise', 0.0)))
+        change = row['ops_per_sec'] / base['ops_per_sec'] - 1
+        if change < -limit:
+            regressions.append((name, base['ops_per_sec'], row['ops_per_sec'], change))
+    return regressions
+
+
+def format_results(results, baseline=None):
+    base_rows = (baseline or {}).get('benchmarks', {})
+    lines = [f"{'benchmark':<40}{'ops/sec':>14}{'noise':>8}{'blocks/call':>13}{'bytes/call':>12}{'vs base':>10}"]
+    for name, row in results['benchmarks'].items():
+        base = base_rows.get(name)
+        change = f"{(row['ops_per_sec'] / base['ops_per_sec'] - 1) * 100:+.1f}%" if base else ''
+        noise = f"{row['noise'] * 100:.1f}%" if 'noise' in row else ''
+        lines.append(f"{name:<40}{row['ops_per_sec']:>14,.2f}{noise:>8}"
+                     f"{row.get('alloc_blocks_per_call', float('nan')):>13.1f}"
+                     f"{row.get('alloc_bytes_per_call', float('nan')):>12.0f}{change:>10}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스플렌더 엔진/에이전트 벤치마크")
+    parser.add_argument('--positions', nargs='*', default=list(POSITIONS), choices=list(POSITIONS))
+    parser.add_argument('--agents', nargs='*', default=list(AGENTS), choices=list(AGENTS))
+    parser.add_argument('--games', type=int, default=20, help="에이전트별 처리량 측정 한 패스의 게임 수")
+    parser.add_argument('--game-min-time', type=float, default=2.0, help="에이전트별 셀프플레이 패스를 반복할 누적 시간(초)")
+    parser.add_argument('--mcts-iterations', type=int, default=100)
+    parser.add_argument('--min-time', type=float, default=0.1, help="라운드마다 항목별 최소 측정 시간(초)")
+    parser.add_argument('--rounds', type=int, default=2, help="프로세스마다 엔진 항목을 번갈아 재는 라운드 수")
+    parser.add_argument('--processes', type=int, default=5, help="엔진 항목을 잴 새 프로세스 수 (noise 추정)")
+    parser.add_argument('--out', help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.10, help="회귀로 판정할 속도 저하 비율")
+    parser.add_argument('--noisy-threshold', type=float, default=0.25,
+                        help="셀프플레이 처리량/MCTS 항목에 쓸 속도 저하 비율")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('schema_version') != SCHEMA_VERSION:
+            parser.error(f"기준 파일의 schema_version({baseline.get('schema_version')})이 "
+                         f"현재({SCHEMA_VERSION})와 다릅니다. 같은 버전으로 기준을 다시 만드세요.")
+
+    benchmarks = run_engine_benchmarks(args.positions, args.min_time, args.rounds, args.processes)
+    if args.agents:
+        benchmarks.update(run_game_benchmarks(args.agents, args.games, min_time=args.game_min_time))
+    if args.mcts_iterations:
+        benchmarks.update(run_mcts_benchmark(args.mcts_iterations))
+
+    results = {
+        'schema_version': SCHEMA_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'benchmarks': benchmarks,
+    }
+    print(format_results(results, baseline))
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.noisy_threshold)
+        for name, base, now, change in regressions:
+            print(f"REGRESSION {name}: {base:,.1f} → {now:,.1f} ops/sec ({change * 100:+.1f}%)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+엔진/MCTS 계측: 켜져 있는 동안에만 핫패스 함수들을 타이머 래퍼로 바꿔 호출 수와 누적 시간을 모읍니다.
+꺼져 있을 때는 원래 함수가 그대로 호출되므로 추가 비용이 없습니다.
+
+    with Profiler() as profiler:
+        while not state.is_game_over:
+            profiler.start_move(state)
+            action = agent.get_action(state)
+            state.step(action)
+            profiler.end_move()
+    print(profiler.format_summary())
+
+    python profiling.py mcts:iterations=200 greedy --seed 3 --out profile.json
+
+- 계측 대상은 TARGETS의 (클래스, 메서드 이름) 목록입니다. 제너레이터 함수는 소비자 쪽 시간을 빼고
+  제너레이터 안에서 보낸 시간만 잽니다.
+- 타이머는 포함(inclusive) 시간입니다. (예: get_legal_actions 시간에 디스카드 조합 생성 시간이 포함됨)
+- 클래스 메서드를 바꿔 끼우는 방식이므로 프로세스당 하나의 Profiler만 켤 수 있고,
+  프로세스 풀 워커(병렬 MCTS의 롤아웃 등) 안의 호출은 집계되지 않습니다.
+"""
+import argparse
+import functools
+import inspect
+import json
+import sys
+import time
+
+from splender.catalog import load_cards, load_nobles
+from splender.game import GameState
+from agents.mcts_agent import MCTSAgent
+
+TARGETS = [
+    (GameState, 'step'),
+    (GameState, 'get_legal_actions'),
+    (GameState, 'count_legal_actions'),
+    (GameState, 'sample_legal_action'),
+    (GameState, 'legal_action_ids'),
+    (GameState, '_build_take_action_group'),
+    (GameState, '_build_reserve_action_group'),
+    (GameState, '_generate_discard_combos'),
+    (GameState, '_count_discard_combos'),
+    (GameState, '_nth_discard_combo'),
+    (GameState, 'clone'),
+    (GameState, 'export_state'),
+    (GameState, 'import_state'),
+    # MCTS 네 단계
+    (MCTSAgent, '_select'),
+    (MCTSAgent, '_expand'),
+    (MCTSAgent, '_playout'),
+    (MCTSAgent, '_backpropagate'),
+]
+
+
+def _timed(func, stat):
+    """stat = [호출 수, 누적 초]를 갱신하는 래퍼"""
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stat[0] += 1
+            stat[1] += perf_counter() - start
+    return wrapper
+
+
+def _timed_generator(func, stat):
+    """제너레이터 함수용 래퍼: 값을 하나 만들어 내는 데 걸린 시간만 누적합니다."""
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stat[0] += 1
+        gen = func(*args, **kwargs)
+        while True:
+            start = perf_counter()
+            try:
+                value = next(gen)
+            except StopIteration:
+                return
+            finally:
+                stat[1] += perf_counter() - start
+            yield value
+    return wrapper
+
+
+class Profiler:
+    """
+    타이머 이름은 '클래스.메서드'이며, timers[이름] = [호출 수, 누적 초]입니다.
+    start_move()/end_move() 사이의 타이머 증가분과 합법 액션 수가 수 단위 기록(moves)으로 남습니다.
+    """
+    _active = None
+
+    def __init__(self, targets=None):
+        self.targets = list(TARGETS if targets is None else targets)
+        self.timers = {f"{cls.__name__}.{name}": [0, 0.0] for cls, name in self.targets}
+        self.moves = []
+        self._originals = []
+        self._move = None
+
+    # ==========================================
+    # 켜기 / 끄기
+    # ==========================================
+    def enable(self):
+        if Profiler._active is not None:
+            raise RuntimeError("이미 다른 Profiler가 켜져 있습니다.")
+        Profiler._active = self
+        for cls, name in self.targets:
+            raw = inspect.getattr_static(cls, name)
+            func = raw.__func__ if isinstance(raw, (staticmethod, classmethod)) else raw
+            wrap = _timed_generator if inspect.isgeneratorfunction(func) else _timed
+            wrapped = wrap(func, self.timers[f"{cls.__name__}.{name}"])
+            if isinstance(raw, (staticmethod, classmethod)):
+                wrapped = type(raw)(wrapped)
+            self._originals.append((cls, name, raw))
+            setattr(cls, name, wrapped)
+        return self
+
+    def disable(self):
+        if Profiler._active is not self:
+            return
+        for cls, name, raw in reversed(self._originals):
+            setattr(cls, name, raw)
+        self._originals = []
+        Profiler._active = None
+
+    @property
+    def enabled(self):
+        return Profiler._active is self
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def reset(self):
+        for stat in self.timers.values():
+            stat[0], stat[1] = 0, 0.0
+        self.moves = []
+        self._move = None
+
+    # ==========================================
+    # 수 단위 기록
+    # ==========================================
+    def _uninstrumented(self, cls, name):
+        for owner, target, raw in self._originals:
+            if owner is cls and target == name:
+                return raw
+        return inspect.getattr_static(cls, name)
+
+    def start_move(self, state):
+        """수를 고르기 직전에 호출합니다. 합법 액션 수는 계측 없이 원래 함수로 셉니다."""
+        count_legal_actions = self._uninstrumented(GameState, 'count_legal_actions')
+        self._move = {
+            'turn': len(self.moves),
+            'player': state.current_player_idx,
+            'legal_actions': count_legal_actions(state),
+            'start': time.perf_counter(),
+            'snapshot': {name: tuple(stat) for name, stat in self.timers.items()},
+        }
+
+    def end_move(self, action=None):
+        """start_move() 이후의 경과 시간과 타이머 증가분을 수 기록으로 남기고 반환합니다."""
+        move = self._move
+        if move is None:
+            raise RuntimeError("start_move()가 먼저 호출되어야 합니다.")
+        elapsed = time.perf_counter() - move.pop('start')
+        snapshot = move.pop('snapshot')
+        move['elapsed'] = elapsed
+        if action is not None:
+            move['action'] = action.get('type')
+        move['timers'] = {
+            name: [stat[0] - snapshot[name][0], stat[1] - snapshot[name][1]]
+            for name, stat in self.timers.items() if stat[0] != snapshot[name][0]
+        }
+        self.moves.append(move)
+        self._move = None
+        return move
+
+    # ==========================================
+    # 요약
+    # ==========================================
+    def totals(self):
+        """호출된 타이머만 {이름: {calls, total_s, mean_us}}로 반환합니다."""
+        return {
+            name: {'calls': calls, 'total_s': total, 'mean_us': total / calls * 1e6}
+            for name, (calls, total) in self.timers.items() if calls
+        }
+
+    def summary(self, slowest=5):
+        """게임 전체 요약 + 수 단위 기록. (JSON 직렬화 가능)"""
+        counts = [m['legal_actions'] for m in self.moves]
+        elapsed = [m['elapsed'] for m in self.moves]
+        by_player = {}
+        for m in self.moves:
+            row = by_player.setdefault(m['player'], {'moves': 0, 'elapsed': 0.0})
+            row['moves'] += 1
+            row['elapsed'] += m['elapsed']
+        return {
+            'moves': len(self.moves),
+            'elapsed': sum(elapsed),
+            'legal_actions': {
+                'mean': sum(counts) / len(counts) if counts else 0.0,
+                'min': min(counts, default=0),
+                'max': max(counts, default=0),
+                'per_turn': counts,
+            },
+            'players': {str(p): row for p, row in sorted(by_player.items())},
+            'timers': self.totals(),
+            'slowest_moves': sorted(self.moves, key=lambda m: m['elapsed'], reverse=True)[:slowest],
+            'per_move': self.moves,
+        }
+
+    def format_summary(self):
+        summary = self.summary()
+        legal = summary['legal_actions']
+        lines = [f"moves={summary['moves']} elapsed={summary['elapsed']:.3f}s "
+                 f"legal_actions mean={legal['mean']:.1f} min={legal['min']} max={legal['max']}",
+                 f"{'timer':<42}{'calls':>10}{'total ms':>12}{'mean us':>11}"]
+        rows = sorted(summary['timers'].items(), key=lambda item: item[1]['total_s'], reverse=True)
+        for name, row in rows:
+            lines.append(f"{name:<42}{row['calls']:>10}{row['total_s'] * 1000:>12.1f}{row['mean_us']:>11.1f}")
+        return '\n'.join(lines)
+
+
+# ==========================================
+# 계측 대국
+# ==========================================
+def profile_game(agents, seed=0, max_turns=1000, profiler=None):
+    """
+    agents(좌석 순서)로 한 게임을 계측하며 진행하고 Profiler를 반환합니다.
+    tournament.play_game과 같이 게임 상태에 시드 고정 난수를 주므로 같은 seed면 같은 셔플로 시작합니다.
+    """
+    profiler = profiler or Profiler()
+    state = GameState(len(agents), rng=seed)
+    state.reset(load_cards(), load_nobles())
+    with profiler:
+        for _ in range(max_turns):
+            if state.is_game_over:
+                break
+            profiler.start_move(state)
+            action = agents[state.current_player_idx].get_action(state)
+            state.step(action)
+            profiler.end_move(action)
+    return profiler
+
+
+def main(argv=None):
+    from tournament import parse_agent_spec, make_agent
+
+    parser = argparse.ArgumentParser(description="스플렌더 엔진/MCTS 계측 대국")
+    parser.add_argument('agents', nargs='+', help="좌석 순서의 에이전트 설정 (예: greedy mcts:iterations=200)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-turns', type=int, default=1000)
+    parser.add_argument('--out', help="요약 JSON 저장 경로 (수 단위 기록 포함)")
+    args = parser.parse_args(argv)
+
+    seats = [parse_agent_spec(spec) for spec in args.agents]
+    agents = [make_agent(kind, kwargs, i, args.seed) for i, (_, kind, kwargs) in enumerate(seats)]
+    try:
+        profiler = profile_game(agents, args.seed, args.max_turns)
+    finally:
+        for agent in agents:
+            if hasattr(agent, 'close'):
+                agent.close()
+
+    print(profiler.format_summary())
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(profiler.summary(), f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,413 @@
+"""
+asyncio 게임 서버: 한 프로세스에서 여러 판을 동시에 진행하며, 에이전트의 결정을 수마다 시간 제한을 두고 기다립니다.
+
+    python server.py --port 8765                 # 로컬 소켓 서버
+    python server.py --demo 200                  # 봇끼리 200판을 동시에 진행해 보기
+    python server.py --client --port 8765        # 대역(stand-in) 클라이언트로 접속해 한 판 두기
+
+- MCTSAgent처럼 CPU를 많이 쓰는 에이전트는 실행기(기본: 프로세스 풀)에서 돌려 다른 테이블을 막지 않습니다.
+  (프로세스 풀에서는 매 수 에이전트 사본이 실행되므로 tree 재사용 같은 수 사이의 상태는 유지되지 않음)
+- 시간 안에 답하지 못하거나 잘못된 행동을 보내면 무작위 합법 행동으로 대신 둡니다.
+
+소켓 프로토콜 (줄 단위 JSON)
+    클라이언트 → {"type": "join", "name": str, "players": 2~4, "opponents": ["greedy", ...]}
+                   opponents(나머지 자리 수만큼)가 있으면 봇과 바로 시작, 없으면 같은 인원수의 접속자를 기다림
+    서버       → {"type": "start", "game_id", "player_idx", "players": [이름...]}
+    서버       → {"type": "your_turn", "game_id", "turn", "timeout", "state": export_state()}
+    클라이언트 → {"type": "action", "turn": your_turn의 turn, "action": {...}}   (시간이 지난 차례의 답은 무시)
+    서버       → {"type": "moved", "turn", "player_idx", "action", "forced": bool}   (모든 수마다)
+    서버       → {"type": "game_over", "winner", "scores"}
+    서버       → {"type": "error", "message"}
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from splender.actions import encode_action, decode_action
+from splender.catalog import load_cards, load_nobles
+from splender.game import GameState
+from agents.mcts_agent import MCTSAgent
+from tournament import parse_agent_spec, make_agent
+
+
+def _call_agent(agent, state):
+    """실행기에서 돌릴 함수 (프로세스 풀로 넘길 수 있도록 모듈 수준)"""
+    return agent.get_action(state)
+
+
+# ==========================================
+# 비동기 에이전트
+# ==========================================
+class AsyncAgentAdapter:
+    """
+    동기 get_action(state)을 가진 에이전트를 `await get_action(state)`로 감쌉니다.
+    executor가 있으면 그 실행기에서, 없으면 이벤트 루프에서 바로 실행합니다. (가벼운 에이전트용)
+    """
+
+    def __init__(self, agent, executor=None):
+        self.agent = agent
+        self.executor = executor
+        self.name = type(agent).__name__
+
+    async def get_action(self, state):
+        if self.executor is None:
+            return self.agent.get_action(state)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _call_agent, self.agent, state.clone())
+
+    async def notify(self, message):
+        pass
+
+    async def close(self):
+        close = getattr(self.agent, 'close', None)
+        if close is not None:
+            close()
+
+
+class RemoteAgent:
+    """소켓 너머의 플레이어. 자기 차례에 상태를 보내고 'action' 메시지를 기다립니다."""
+
+    def __init__(self, name, reader, writer):
+        self.name = name
+        self.reader = reader
+        self.writer = writer
+        self.game_id = None
+        self.turn = 0
+        self.timeout = None
+
+    async def get_action(self, state):
+        await self.notify({
+            'type': 'your_turn', 'game_id': self.game_id, 'turn': self.turn,
+            'timeout': self.timeout, 'state': state.export_state(include_rng=False),
+        })
+        while True:
+            message = await read_message(self.reader)
+            if message is None:
+                raise ConnectionError(f"{self.name} 연결이 끊어졌습니다.")
+            if not isinstance(message, dict):
+                raise ValueError(f"메시지는 JSON 객체여야 합니다: {message!r}")
+            # 시간 초과 후 늦게 도착한 이전 차례의 답은 버림
+            if message.get('type') == 'action' and message.get('turn', self.turn) == self.turn:
+                action = message.get('action')
+                if not isinstance(action, dict):
+                    raise ValueError(f"action은 JSON 객체여야 합니다: {action!r}")
+                return action
+
+    async def notify(self, message):
+        await send_message(self.writer, message)
+
+    async def close(self):
+        self.writer.close()
+
+
+async def send_message(writer, message):
+    writer.write(json.dumps(message).encode('utf-8') + b'\n')
+    await writer.drain()
+
+
+async def read_message(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+# ==========================================
+# 테이블 (한 판)
+# ==========================================
+class GameTable:
+    """
+    비동기 에이전트들로 한 판을 진행합니다. 수마다 move_timeout초를 기다리고,
+    시간 초과·잘못된 행동·연결 끊김이면 무작위 합법 행동으로 대신 둡니다.
+    """
+
+    def __init__(self, game_id, agents, move_timeout=10.0, seed=None, max_turns=1000):
+        self.game_id = game_id
+        self.agents = agents
+        self.move_timeout = move_timeout
+        self.max_turns = max_turns
+        self.rng = random.Random(seed)
+        # 셔플/귀족 선택은 테이블 전용 스트림으로 (다른 테이블과 전역 random을 공유하지 않음)
+        self.state = GameState(len(agents), rng=self.rng.getrandbits(64))
+        self.state.reset(load_cards(), load_nobles())
+        self.turns = 0
+        self.forced_moves = [0] * len(agents)
+        self.think_time = [0.0] * len(agents)
+
+    async def broadcast(self, message):
+        for agent in self.agents:
+            try:
+                await agent.notify(message)
+            except (ConnectionError, OSError):
+                pass
+
+    async def play(self):
+        state = self.state
+        names = [agent.name for agent in self.agents]
+        for idx, agent in enumerate(self.agents):
+            if isinstance(agent, RemoteAgent):
+                agent.game_id, agent.timeout = self.game_id, self.move_timeout
+            await self._notify(agent, {'type': 'start', 'game_id': self.game_id,
+                                       'player_idx': idx, 'players': names})
+
+        while not state.is_game_over and self.turns < self.max_turns:
+            idx = state.current_player_idx
+            action, forced = await self._request_action(idx)
+            state.step(action)
+            await self.broadcast({'type': 'moved', 'turn': self.turns, 'player_idx': idx,
+                                  'action': action, 'forced': forced})
+            self.turns += 1
+
+        result = self.result()
+        await self.broadcast({'type': 'game_over', 'winner': result['winner'], 'scores': result['scores']})
+        return result
+
+    async def _notify(self, agent, message):
+        try:
+            await agent.notify(message)
+        except (ConnectionError, OSError):
+            pass
+
+    async def _request_action(self, idx):
+        """
+        (행동, 대신 두었는지)를 반환합니다. 받은 행동은 고정 액션 인덱스로 검증해 정규화합니다.
+        형식이 잘못된 행동은 예외가 테이블 태스크로 새지 않도록 모두 무작위 행동으로 대신 둡니다.
+        """
+        state = self.state
+        agent = self.agents[idx]
+        if isinstance(agent, RemoteAgent):
+            agent.turn = self.turns
+
+        start = time.perf_counter()
+        try:
+            action = await asyncio.wait_for(agent.get_action(state), self.move_timeout)
+            action_id = encode_action(state, action)
+            if action_id not in set(state.legal_action_ids()):
+                raise ValueError(f"잘못된 행동: {action}")
+            action = decode_action(state, action_id)
+            forced = False
+        except (asyncio.TimeoutError, ConnectionError, OSError, ValueError, KeyError, TypeError, AttributeError):
+            # 프로세스 풀에서 이미 실행 중인 탐색은 취소할 수 없으므로 결과만 버림
+            action = state.sample_legal_action(self.rng)
+            forced = True
+            self.forced_moves[idx] += 1
+        self.think_time[idx] += time.perf_counter() - start
+        return action, forced
+
+    def result(self):
+        state = self.state
+        winner = state.winner.id if state.is_game_over and state.winner is not None else None
+        return {
+            'game_id': self.game_id,
+            'players': [agent.name for agent in self.agents],
+            'winner': winner,
+            'scores': [p.score for p in state.players],
+            'turns': self.turns,
+            'forced_moves': self.forced_moves,
+            'think_time': self.think_time,
+        }
+
+
+# ==========================================
+# 서버
+# ==========================================
+class GameServer:
+    """
+    여러 GameTable을 하나의 이벤트 루프에서 동시에 진행합니다.
+    CPU를 많이 쓰는 봇(MCTSAgent)은 공유 실행기로 보내고, 나머지는 루프에서 바로 실행합니다.
+    """
+
+    def __init__(self, move_timeout=10.0, executor='process', max_workers=None, max_turns=1000):
+        self.move_timeout = move_timeout
+        self.max_turns = max_turns
+        if executor == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        elif executor == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            self.executor = None
+        self.tables = {}
+        self.results = []
+        self._game_ids = itertools.count()
+        self._waiting = {}  # 인원수 → 상대를 기다리는 RemoteAgent 목록
+        self._server = None
+
+    def make_bot(self, spec, player_idx, seed):
+        """'greedy', 'mcts:iterations=200' 같은 설정으로 봇을 만들어 비동기 어댑터로 감쌉니다."""
+        name, kind, kwargs = parse_agent_spec(spec)
+        agent = make_agent(kind, kwargs, player_idx, seed)
+        adapter = AsyncAgentAdapter(agent, self.executor if isinstance(agent, MCTSAgent) else None)
+        adapter.name = name
+        return adapter
+
+    def start_table(self, agents, seed=None):
+        """테이블을 만들고 백그라운드 태스크로 진행합니다. (game_id, 태스크)를 반환합니다."""
+        game_id = next(self._game_ids)
+        table = GameTable(game_id, agents, self.move_timeout, seed, self.max_turns)
+        self.tables[game_id] = table
+        task = asyncio.create_task(self._run_table(table))
+        return game_id, task
+
+    async def _run_table(self, table):
+        try:
+            result = await table.play()
+            self.results.append(result)
+            return result
+        finally:
+            del self.tables[table.game_id]
+            for agent in table.agents:
+                if not isinstance(agent, RemoteAgent):
+                    await agent.close()
+
+    async def run_bot_games(self, specs, games, seed=0):
+        """봇끼리 games판을 동시에 진행하고 결과 리스트를 반환합니다."""
+        tasks = []
+        for game in range(games):
+            game_seed = seed * 1_000_003 + game
+            agents = [self.make_bot(spec, i, game_seed) for i, spec in enumerate(specs)]
+            tasks.append(self.start_table(agents, game_seed)[1])
+        return await asyncio.gather(*tasks)
+
+    # --- 소켓 ---
+    async def serve(self, host='127.0.0.1', port=8765):
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server
+
+    async def _handle_client(self, reader, writer):
+        try:
+            join = await read_message(reader)
+        except json.JSONDecodeError:
+            join = None
+        if not join or join.get('type') != 'join':
+            await send_message(writer, {'type': 'error', 'message': "첫 메시지는 join이어야 합니다."})
+            writer.close()
+            return
+
+        remote = RemoteAgent(join.get('name', 'remote'), reader, writer)
+        num_players = int(join.get('players', 2))
+        opponents = join.get('opponents') or []
+        try:
+            if not 2 <= num_players <= 4:
+                raise ValueError("인원수는 2~4명이어야 합니다.")
+            if opponents and len(opponents) != num_players - 1:
+                raise ValueError("opponents를 주면 나머지 자리 수만큼 봇 설정이 있어야 합니다.")
+            for spec in opponents:
+                parse_agent_spec(spec)
+        except ValueError as e:
+            await send_message(writer, {'type': 'error', 'message': str(e)})
+            writer.close()
+            return
+
+        if opponents:
+            seats = [remote] + [self.make_bot(spec, i + 1, None) for i, spec in enumerate(opponents)]
+        else:
+            # 같은 인원수를 원하는 접속자가 다 모이면 마지막 접속자의 핸들러가 테이블을 진행
+            waiting = self._waiting.setdefault(num_players, [])
+            waiting.append(remote)
+            if len(waiting) < num_players:
+                return
+            seats = [waiting.pop(0) for _ in range(num_players)]
+
+        _, task = self.start_table(seats)
+        await task
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ==========================================
+# 대역(stand-in) 클라이언트
+# ==========================================
+async def run_stand_in_client(host='127.0.0.1', port=8765, name='stand-in', players=2,
+                              opponents=('random',), seed=None, delay=0.0):
+    """
+    서버에 접속해 한 판을 두는 테스트용 클라이언트. 받은 상태에서 무작위 합법 행동을 골라 보냅니다.
+    게임이 끝나면 game_over 메시지를 반환합니다.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await send_message(writer, {'type': 'join', 'name': name, 'players': players,
+                                    'opponents': list(opponents)})
+        while True:
+            message = await read_message(reader)
+            if message is None:
+                raise ConnectionError("서버 연결이 끊어졌습니다.")
+            if message['type'] == 'your_turn':
+                state = GameState.import_state(message['state'])
+                if delay:
+                    await asyncio.sleep(delay)
+                await send_message(writer, {'type': 'action', 'turn': message['turn'],
+                                            'action': state.sample_legal_action(rng)})
+            elif message['type'] in ('game_over', 'error'):
+                return message
+    finally:
+        writer.close()
+
+
+# ==========================================
+# 실행
+# ==========================================
+async def _demo(args):
+    server = GameServer(args.timeout, args.executor, args.workers)
+    start = time.perf_counter()
+    try:
+        results = await server.run_bot_games(args.agents, args.demo, args.seed)
+    finally:
+        await server.close()
+    elapsed = time.perf_counter() - start
+    turns = sum(r['turns'] for r in results)
+    forced = sum(sum(r['forced_moves']) for r in results)
+    print(f"{len(results)} games, {turns} turns in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} games/s, forced moves {forced})")
+
+
+async def _serve(args):
+    server = GameServer(args.timeout, args.executor, args.workers)
+    await server.serve(args.host, args.port)
+    print(f"listening on {args.host}:{args.port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스플렌더 asyncio 게임 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--timeout', type=float, default=10.0, help="수당 제한 시간(초)")
+    parser.add_argument('--executor', choices=['process', 'thread', 'none'], default='process')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--demo', type=int, default=0, help="봇끼리 동시에 진행할 판 수")
+    parser.add_argument('--agents', nargs='+', default=['greedy', 'random'], help="--demo 좌석별 봇 설정")
+    parser.add_argument('--client', action='store_true', help="대역 클라이언트로 접속")
+    parser.add_argument('--opponents', nargs='*', default=['random'], help="--client 상대 봇 설정")
+    args = parser.parse_args(argv)
+
+    if args.client:
+        result = asyncio.run(run_stand_in_client(args.host, args.port, players=len(args.opponents) + 1,
+                                                 opponents=args.opponents, seed=args.seed))
+        print(result)
+    elif args.demo:
+        asyncio.run(_demo(args))
+    else:
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
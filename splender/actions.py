@@ -0,0 +1,167 @@
+"""
+고정 액션 공간: 가능한 모든 행동을 안정적인 정수 인덱스로 열거합니다.
+
+    action_id = main_action * NUM_DISCARDS + discard_index
+
+메인 액션(61개)은 카드 ID가 아닌 슬롯 기준이라 게임과 무관하게 같은 의미를 가집니다.
+보드 슬롯은 (tier-1) * 4 + 위치(state.board[tier] 리스트 순서), 예약 슬롯은 예약 리스트 순서입니다.
+
+슬롯 규칙 (GameState, CompactGameState, BatchGameState 공통)
+    보드: 카드를 가져가면 뒤쪽 카드가 한 칸씩 앞으로 당겨지고, 덱에서 뽑은 새 카드는 맨 뒤에 놓입니다.
+          덱이 비어 있으면 그 tier의 보드는 짧아집니다. (빈 슬롯은 항상 뒤쪽)
+    예약: 새 예약은 맨 뒤에 추가되고, 예약 카드를 사면 뒤쪽 카드가 앞으로 당겨집니다.
+따라서 같은 국면이면 어느 엔진에서든 같은 카드가 같은 액션 인덱스를 가집니다.
+디스카드(84개)는 6색(COLORS + gold) 버림 수의 합이 0~3인 모든 패턴이며, 0번은 '버리지 않음'입니다.
+"""
+import itertools
+import numbers
+from functools import lru_cache
+
+COLORS = ['white', 'blue', 'green', 'red', 'black']
+GEM_COLORS = COLORS + ['gold']
+
+# ==========================================
+# 메인 액션 인덱스 (디스카드 제외)
+# ==========================================
+PURCHASE_BOARD = 0          # 0~11  : 보드 카드 구매
+PURCHASE_RESERVED = 12      # 12~14 : 예약 카드 구매
+RESERVE_PUBLIC = 15         # 15~26 : 보드 카드 예약
+RESERVE_BLIND = 27          # 27~29 : 덱 맨 위 카드 블라인드 예약 (tier 1~3)
+TAKE_DIFF = 30              # 30~54 : 서로 다른 색 1~3개 (TAKE_DIFF_COMBOS 순서)
+TAKE_SAME = 55              # 55~59 : 같은 색 2개
+PASS = 60
+NUM_MAIN_ACTIONS = 61
+
+# 색상 인덱스 조합 (크기 1 → 2 → 3, 각 크기 안에서는 사전순)
+TAKE_DIFF_COMBOS = [
+    combo for i in range(1, 4) for combo in itertools.combinations(range(5), i)
+]
+# 색상 이름 튜플 → take_diff 메인 액션 인덱스
+TAKE_DIFF_INDEX = {
+    tuple(COLORS[c] for c in combo): TAKE_DIFF + i for i, combo in enumerate(TAKE_DIFF_COMBOS)
+}
+
+# ==========================================
+# 디스카드 패턴 (버림 수 합계 0 → 3 순)
+# ==========================================
+MAX_DISCARD = 3  # 10개에서 3개를 가져오는 경우가 최대
+DISCARD_PATTERNS = []
+for _total in range(MAX_DISCARD + 1):
+    for _colors in itertools.combinations_with_replacement(range(6), _total):
+        DISCARD_PATTERNS.append(tuple(_colors.count(c) for c in range(6)))
+DISCARD_INDEX = {pattern: i for i, pattern in enumerate(DISCARD_PATTERNS)}
+NUM_DISCARDS = len(DISCARD_PATTERNS)  # 84
+
+NUM_ACTIONS = NUM_MAIN_ACTIONS * NUM_DISCARDS
+
+
+@lru_cache(maxsize=4096)
+def discard_indices(gems_after, discard_count):
+    """
+    행동 후 토큰(6칸 튜플)에서 discard_count개를 버리는 조합들의 디스카드 인덱스를
+    GameState._generate_discard_combos()와 같은 순서로 반환합니다.
+    """
+    active = [c for c in range(6) if gems_after[c] > 0]
+    result = []
+
+    def dfs(idx, remaining, counts):
+        if remaining == 0:
+            result.append(DISCARD_INDEX[tuple(counts)])
+            return
+        if idx >= len(active):
+            return
+        color = active[idx]
+        for n in range(min(gems_after[color], remaining) + 1):
+            counts[color] = n
+            dfs(idx + 1, remaining - n, counts)
+        counts[color] = 0
+
+    dfs(0, discard_count, [0] * 6)
+    return tuple(result)
+
+
+def encode_action(state, action):
+    """
+    액션 딕셔너리를 현재 상태 기준의 고정 액션 인덱스로 변환합니다.
+    tier/슬롯이 자기 블록 범위를 벗어나거나 종류·디스카드 형식이 잘못되었으면 ValueError를 냅니다.
+    (합법 여부는 검사하지 않음)
+    """
+    action_type = action['type']
+
+    if action_type == 'purchase':
+        if action['source'] == 'board':
+            main = _in_block(PURCHASE_BOARD, PURCHASE_RESERVED, _board_slot(state, action['tier'], action['card_id']))
+        else:
+            reserved = state.players[state.current_player_idx].reserved
+            main = _in_block(PURCHASE_RESERVED, RESERVE_PUBLIC, [c.id for c in reserved].index(action['card_id']))
+    elif action_type == 'reserve_public':
+        main = _in_block(RESERVE_PUBLIC, RESERVE_BLIND, _board_slot(state, action['tier'], action['card_id']))
+    elif action_type == 'reserve_blind':
+        main = _in_block(RESERVE_BLIND, TAKE_DIFF, _tier_offset(action['tier']))
+    elif action_type == 'take_diff':
+        main = TAKE_DIFF_INDEX[tuple(sorted(action['colors'], key=COLORS.index))]
+    elif action_type == 'take_same':
+        main = TAKE_SAME + COLORS.index(action['color'])
+    elif action_type == 'pass':
+        main = PASS
+    else:
+        raise ValueError(f"알 수 없는 액션 종류: {action_type!r}")
+
+    discard = action.get('discard')
+    if not discard:
+        return main * NUM_DISCARDS
+    if not isinstance(discard, dict):
+        raise ValueError(f"discard는 색상별 개수 딕셔너리여야 합니다: {discard!r}")
+    return main * NUM_DISCARDS + DISCARD_INDEX[tuple(discard.get(c, 0) for c in GEM_COLORS)]
+
+
+def decode_action(state, action_id):
+    """고정 액션 인덱스를 현재 상태 기준의 액션 딕셔너리로 변환합니다."""
+    main, discard_idx = divmod(action_id, NUM_DISCARDS)
+
+    if main < PURCHASE_RESERVED:
+        tier, pos = divmod(main - PURCHASE_BOARD, 4)
+        action = {'type': 'purchase', 'tier': tier + 1,
+                  'card_id': state.board[tier + 1][pos].id, 'source': 'board'}
+    elif main < RESERVE_PUBLIC:
+        card = state.players[state.current_player_idx].reserved[main - PURCHASE_RESERVED]
+        action = {'type': 'purchase', 'tier': card.tier,
+                  'card_id': card.id, 'source': 'reserved'}
+    elif main < RESERVE_BLIND:
+        tier, pos = divmod(main - RESERVE_PUBLIC, 4)
+        action = {'type': 'reserve_public', 'tier': tier + 1,
+                  'card_id': state.board[tier + 1][pos].id}
+    elif main < TAKE_DIFF:
+        action = {'type': 'reserve_blind', 'tier': main - RESERVE_BLIND + 1}
+    elif main < TAKE_SAME:
+        combo = TAKE_DIFF_COMBOS[main - TAKE_DIFF]
+        action = {'type': 'take_diff', 'colors': [COLORS[c] for c in combo]}
+    elif main < PASS:
+        action = {'type': 'take_same', 'color': COLORS[main - TAKE_SAME]}
+    else:
+        action = {'type': 'pass'}
+
+    if discard_idx:
+        action['discard'] = dict(zip(GEM_COLORS, DISCARD_PATTERNS[discard_idx]))
+    return action
+
+
+def _tier_offset(tier):
+    if not isinstance(tier, numbers.Integral) or isinstance(tier, bool) or not 1 <= tier <= 3:
+        raise ValueError(f"tier는 1~3이어야 합니다: {tier!r}")
+    return int(tier) - 1
+
+
+def _in_block(start, end, offset):
+    """메인 액션 블록 [start, end) 안의 인덱스를 반환합니다. (블록을 넘으면 다른 액션이 되므로 거부)"""
+    if not 0 <= offset < end - start:
+        raise ValueError(f"슬롯 {offset}이(가) 메인 액션 블록 {start}~{end - 1}의 범위를 벗어났습니다.")
+    return start + offset
+
+
+def _board_slot(state, tier, card_id):
+    offset = _tier_offset(tier) * 4
+    for pos, card in enumerate(state.board[tier]):
+        if card.id == card_id:
+            return offset + pos
+    raise ValueError(f"Tier {tier} 보드에 카드 {card_id}가 없습니다.")
@@ -0,0 +1,422 @@
+import numpy as np
+from .compact import CardTable, NobleTable, COLORS, GEM_COLORS, GOLD
+from .actions import (
+    NUM_MAIN_ACTIONS, PASS, PURCHASE_BOARD, PURCHASE_RESERVED, RESERVE_BLIND,
+    RESERVE_PUBLIC, TAKE_DIFF, TAKE_DIFF_COMBOS, TAKE_SAME,
+)
+
+# 메인 액션 인덱스(0~60)는 splender.actions의 고정 액션 공간과 같습니다.
+# (고정 액션 인덱스 = 메인 액션 * NUM_DISCARDS + 디스카드 인덱스)
+_TAKE_DIFF_MATRIX = np.zeros((len(TAKE_DIFF_COMBOS), 5), dtype=np.int16)
+for _i, _combo in enumerate(TAKE_DIFF_COMBOS):
+    _TAKE_DIFF_MATRIX[_i, list(_combo)] = 1
+
+_MAX_DECK = 40
+
+
+class BatchGameState:
+    """
+    N개의 독립된 게임을 NumPy 배열로 묶어 한 번의 호출로 동시에 진행하는 배치 엔진.
+    규칙(10개 토큰 상한, 귀족 방문, 마지막 라운드 종료, 승자 판정)은 GameState와 같습니다.
+
+    배열 구성 (N = 게임 수, P = 플레이어 수):
+        bank        (N, 6)     은행 토큰 (COLORS + gold)
+        gems        (N, P, 6)  플레이어 토큰
+        bonuses     (N, P, 5)  플레이어 보너스
+        scores      (N, P)     점수
+        num_cards   (N, P)     구매한 카드 수 (동점 판정용)
+        owned       (N, P, C)  구매한 카드 여부 (CardTable 인덱스 기준)
+        reserved    (N, P, 3)  예약 카드 인덱스 (-1 = 빈칸, 앞쪽부터 채움)
+        reserved_blind (N, P, 3) 같은 예약 슬롯이 덱에서 블라인드로 예약한 카드인지 여부
+        board       (N, 3, 4)  보드 카드 인덱스 (-1 = 빈칸, 앞쪽부터 채움)
+        decks       (N, 3, 40) 덱 카드 인덱스 (deck_len 앞부분만 유효, 맨 뒤가 맨 위)
+        deck_len    (N, 3)
+        nobles      (N, K)     남아 있는 귀족 여부 (NobleTable 인덱스 기준)
+        noble_owner (N, K)     귀족을 데려간 플레이어 (-1 = 없음)
+
+    보드와 예약 슬롯 순서는 GameState와 같으므로 같은 국면의 메인 액션 인덱스도 같습니다. (splender.actions 참고)
+    """
+
+    def __init__(self, num_games, num_players, card_table, noble_table):
+        assert 2 <= num_players <= 4, "플레이어 수는 2~4명이어야 합니다."
+        self.num_games = num_games
+        self.num_players = num_players
+        self.card_table = card_table if isinstance(card_table, CardTable) else CardTable(card_table)
+        self.noble_table = noble_table if isinstance(noble_table, NobleTable) else NobleTable(noble_table)
+
+        # 카드/귀족 테이블을 배열로 펼쳐 둠 (벡터 연산용)
+        self.card_cost = np.array(self.card_table.cost, dtype=np.int16)
+        self.card_bonus = np.array(self.card_table.bonus, dtype=np.int16)
+        self.card_points = np.array(self.card_table.points, dtype=np.int16)
+        self.card_tier = np.array(self.card_table.tier, dtype=np.int16)
+        self.noble_req = np.array(self.noble_table.requirements, dtype=np.int16)
+        self.noble_points = np.array(self.noble_table.points, dtype=np.int16)
+
+        n, p = num_games, num_players
+        self.bank = np.zeros((n, 6), dtype=np.int16)
+        self.gems = np.zeros((n, p, 6), dtype=np.int16)
+        self.bonuses = np.zeros((n, p, 5), dtype=np.int16)
+        self.scores = np.zeros((n, p), dtype=np.int16)
+        self.num_cards = np.zeros((n, p), dtype=np.int16)
+        self.owned = np.zeros((n, p, len(self.card_table)), dtype=bool)
+        self.reserved = np.full((n, p, 3), -1, dtype=np.int16)
+        self.reserved_blind = np.zeros((n, p, 3), dtype=bool)
+        self.board = np.full((n, 3, 4), -1, dtype=np.int16)
+        self.decks = np.full((n, 3, _MAX_DECK), -1, dtype=np.int16)
+        self.deck_len = np.zeros((n, 3), dtype=np.int16)
+        self.nobles = np.zeros((n, len(self.noble_table)), dtype=bool)
+        self.noble_owner = np.full((n, len(self.noble_table)), -1, dtype=np.int16)
+        self.current_player = np.zeros(n, dtype=np.int16)
+        self.is_last_round = np.zeros(n, dtype=bool)
+        self.is_game_over = np.zeros(n, dtype=bool)
+        self.winner = np.full(n, -1, dtype=np.int16)
+        self.turns = np.zeros(n, dtype=np.int32)
+
+        self._rows = np.arange(n)
+
+    # ==========================================
+    # 게임 초기화
+    # ==========================================
+    def reset(self, rng=None):
+        """모든 게임의 덱과 귀족을 게임별로 독립적으로 셔플하여 초기화합니다."""
+        rng = rng if rng is not None else np.random.default_rng()
+        n, p = self.num_games, self.num_players
+        gem_counts = {2: 4, 3: 5, 4: 7}[p]
+
+        self.bank[:] = gem_counts
+        self.bank[:, GOLD] = 5
+        for arr in (self.gems, self.bonuses, self.scores, self.num_cards, self.turns):
+            arr[:] = 0
+        self.owned[:] = False
+        self.reserved[:] = -1
+        self.reserved_blind[:] = False
+        self.board[:] = -1
+        self.decks[:] = -1
+        self.current_player[:] = 0
+        self.is_last_round[:] = False
+        self.is_game_over[:] = False
+        self.winner[:] = -1
+
+        for t in range(3):
+            tier_cards = np.flatnonzero(self.card_tier == t + 1).astype(np.int16)
+            size = len(tier_cards)
+            shuffled = rng.permuted(np.tile(tier_cards, (n, 1)), axis=1)
+            self.decks[:, t, :size] = shuffled
+            # GameState와 같이 덱 맨 위(맨 뒤)부터 4장을 보드에 깐다
+            dealt = min(4, size)
+            self.board[:, t, :dealt] = shuffled[:, ::-1][:, :dealt]
+            self.deck_len[:, t] = size - dealt
+
+        num_nobles = len(self.noble_table)
+        order = rng.permuted(np.tile(np.arange(num_nobles), (n, 1)), axis=1)
+        self.nobles[:] = False
+        self.noble_owner[:] = -1
+        self.nobles[self._rows[:, None], order[:, :p + 1]] = True
+
+    # ==========================================
+    # 유효한 행동 마스크
+    # ==========================================
+    def legal_mask(self):
+        """
+        (N, 61) bool 배열로 각 게임의 현재 플레이어가 둘 수 있는 메인 액션을 표시합니다.
+        토큰 상한 초과 시의 디스카드는 step()에서 따로 지정하므로 마스크에는 포함되지 않습니다.
+        종료된 게임의 행은 모두 False입니다.
+        """
+        n = self.num_games
+        rows = self._rows
+        cur = self.current_player
+        gems = self.gems[rows, cur]            # (N, 6)
+        bonuses = self.bonuses[rows, cur]      # (N, 5)
+        reserved = self.reserved[rows, cur]    # (N, 3)
+        bank = self.bank
+        mask = np.zeros((n, NUM_MAIN_ACTIONS), dtype=bool)
+
+        # [1] 카드 구매: 보드 12칸 + 예약 3칸
+        board = self.board.reshape(n, 12)
+        mask[:, PURCHASE_BOARD:PURCHASE_BOARD + 12] = (board >= 0) & self._affordable(board, gems, bonuses)
+        mask[:, PURCHASE_RESERVED:PURCHASE_RESERVED + 3] = (
+            (reserved >= 0) & self._affordable(reserved, gems, bonuses)
+        )
+
+        # [2] 카드 예약: 예약 슬롯 3장 미만일 때만
+        can_reserve = (reserved[:, 2] < 0)[:, None]
+        mask[:, RESERVE_PUBLIC:RESERVE_PUBLIC + 12] = can_reserve & (board >= 0)
+        mask[:, RESERVE_BLIND:RESERVE_BLIND + 3] = can_reserve & (self.deck_len > 0)
+
+        # [3] 보석 가져오기
+        has_color = bank[:, :5] > 0                                        # (N, 5)
+        missing = (~has_color).astype(np.int16) @ _TAKE_DIFF_MATRIX.T       # (N, 25)
+        mask[:, TAKE_DIFF:TAKE_DIFF + len(TAKE_DIFF_COMBOS)] = missing == 0
+        mask[:, TAKE_SAME:TAKE_SAME + 5] = bank[:, :5] >= 4
+
+        # [4] 패스: 아무것도 할 수 없을 때만
+        mask[:, PASS] = ~mask.any(axis=1)
+        mask[self.is_game_over] = False
+        return mask
+
+    def _affordable(self, cards, gems, bonuses):
+        """cards (N, S) 각 카드를 현재 플레이어가 살 수 있는지 (N, S) bool로 반환합니다."""
+        cost = self.card_cost[np.maximum(cards, 0)]                         # (N, S, 5)
+        need = np.maximum(cost - bonuses[:, None, :], 0)
+        short = np.maximum(need - gems[:, None, :5], 0).sum(axis=2)
+        return short <= gems[:, None, GOLD]
+
+    def random_actions(self, rng=None, mask=None):
+        """각 게임의 유효한 메인 액션 중 하나를 균등하게 골라 (N,) 배열로 반환합니다."""
+        rng = rng if rng is not None else np.random.default_rng()
+        mask = self.legal_mask() if mask is None else mask
+        keys = rng.random(mask.shape)
+        keys[~mask] = -1.0
+        return keys.argmax(axis=1)
+
+    # ==========================================
+    # 턴 진행 파이프라인
+    # ==========================================
+    def step(self, actions, discards=None, rng=None):
+        """
+        각 게임에 메인 액션 하나씩을 동시에 적용하고 턴을 넘깁니다.
+        이미 종료된 게임의 액션은 무시합니다.
+
+        Args:
+            actions: (N,) 메인 액션 인덱스 (legal_mask()에서 True인 값이어야 함)
+            discards: (N, 6) 토큰 10개 초과 시 버릴 토큰 수. None이면 가장 많이 가진 색부터
+                      하나씩 버리고, 황금 토큰은 마지막까지 남깁니다.
+            rng: 귀족 동시 충족 시 무작위 선택에 사용할 np.random.Generator
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        actions = np.asarray(actions)
+        live = ~self.is_game_over
+        rows = self._rows
+        cur = self.current_player.astype(np.intp)
+
+        # [1단계] 메인 액션 수행
+        kind = np.where(live, actions, PASS)
+
+        sel = (kind >= TAKE_DIFF) & (kind < TAKE_SAME)
+        if sel.any():
+            r = rows[sel]
+            delta = _TAKE_DIFF_MATRIX[kind[sel] - TAKE_DIFF]
+            self.bank[r, :5] -= delta
+            self.gems[r, cur[sel], :5] += delta
+
+        sel = (kind >= TAKE_SAME) & (kind < PASS)
+        if sel.any():
+            r, color = rows[sel], kind[sel] - TAKE_SAME
+            self.bank[r, color] -= 2
+            self.gems[r, cur[sel], color] += 2
+
+        sel = (kind >= RESERVE_PUBLIC) & (kind < RESERVE_BLIND)
+        if sel.any():
+            r, pl = rows[sel], cur[sel]
+            slot = kind[sel] - RESERVE_PUBLIC
+            tier, pos = slot // 4, slot % 4
+            self._push_reserved(r, pl, self.board[r, tier, pos], blind=False)
+            self._replenish(r, tier, pos)
+            self._take_gold(r, pl)
+
+        sel = (kind >= RESERVE_BLIND) & (kind < TAKE_DIFF)
+        if sel.any():
+            r, pl = rows[sel], cur[sel]
+            tier = kind[sel] - RESERVE_BLIND
+            self._push_reserved(r, pl, self._draw(r, tier), blind=True)
+            self._take_gold(r, pl)
+
+        sel = kind < RESERVE_PUBLIC
+        if sel.any():
+            r, pl = rows[sel], cur[sel]
+            k = kind[sel]
+            from_board = k < PURCHASE_RESERVED
+            board_slot = np.where(from_board, k, 0)
+            res_slot = np.where(from_board, 0, k - PURCHASE_RESERVED)
+            cards = np.where(
+                from_board,
+                self.board.reshape(self.num_games, 12)[r, board_slot],
+                self.reserved[r, pl, res_slot],
+            )
+            self._pay_and_gain(r, pl, cards)
+
+            b = from_board
+            if b.any():
+                self._replenish(r[b], board_slot[b] // 4, board_slot[b] % 4)
+            b = ~from_board
+            if b.any():
+                self._pop_reserved(r[b], pl[b], res_slot[b])
+
+        # [2단계] 토큰 상한 처리
+        held = self.gems[rows, cur].sum(axis=1)
+        over = live & (held > 10)
+        if over.any():
+            r, pl = rows[over], cur[over]
+            if discards is not None:
+                drop = np.asarray(discards, dtype=np.int16)[over]
+                if (drop.sum(axis=1) != held[over] - 10).any() or (drop > self.gems[r, pl]).any():
+                    raise ValueError("버릴 토큰 정보가 보유 토큰/초과 수량과 맞지 않습니다.")
+            else:
+                drop = self._auto_discard(self.gems[r, pl], held[over] - 10)
+            self.gems[r, pl] -= drop
+            self.bank[r] += drop
+
+        # [3단계] 귀족 방문 체크 (동시 충족 시 무작위 1명)
+        bonuses = self.bonuses[rows, cur]
+        eligible = self.nobles & (bonuses[:, None, :] >= self.noble_req[None]).all(axis=2)
+        eligible &= live[:, None]
+        got = eligible.any(axis=1)
+        if got.any():
+            keys = rng.random(eligible.shape)
+            keys[~eligible] = -1.0
+            chosen = keys.argmax(axis=1)[got]
+            r = rows[got]
+            self.nobles[r, chosen] = False
+            self.noble_owner[r, chosen] = cur[got]
+            self.scores[r, cur[got]] += self.noble_points[chosen]
+
+        # [4단계] 게임 종료 판정
+        self.is_last_round |= live & (self.scores[rows, cur] >= 15)
+        self.turns[live] += 1
+        self.current_player = np.where(live, (cur + 1) % self.num_players, cur).astype(np.int16)
+
+        ended = live & self.is_last_round & (self.current_player == 0)
+        if ended.any():
+            self.is_game_over |= ended
+            # 최고 점수 → 구매 카드 수가 적은 쪽 → 앞 순번
+            key = self.scores[ended].astype(np.int32) * 1000 - self.num_cards[ended]
+            self.winner[ended] = key.argmax(axis=1)
+        return ended
+
+    # ==========================================
+    # 보조 로직들
+    # ==========================================
+    def _draw(self, r, tier):
+        """덱 맨 위 카드를 뽑아 반환합니다. (빈 덱이면 -1)"""
+        length = self.deck_len[r, tier]
+        has = length > 0
+        top = np.maximum(length - 1, 0)
+        cards = np.where(has, self.decks[r, tier, top], -1)
+        self.deck_len[r, tier] = length - has
+        return cards
+
+    def _replenish(self, r, tier, pos):
+        """보드 슬롯을 비우고 뒤쪽 카드를 앞으로 당긴 뒤, 덱에서 뽑은 카드를 맨 뒤에 놓습니다."""
+        row = self.board[r, tier]
+        idx = np.arange(4)[None, :]
+        shifted = np.where(idx >= pos[:, None], np.roll(row, -1, axis=1), row)
+        shifted[:, 3] = -1
+        shifted[np.arange(len(r)), (shifted >= 0).sum(axis=1)] = self._draw(r, tier)
+        self.board[r, tier] = shifted
+
+    def _push_reserved(self, r, pl, cards, blind):
+        slot = (self.reserved[r, pl] >= 0).sum(axis=1)
+        self.reserved[r, pl, slot] = cards
+        self.reserved_blind[r, pl, slot] = blind
+
+    def _pop_reserved(self, r, pl, slot):
+        """예약 슬롯을 비우고 뒤쪽 카드를 앞으로 당깁니다. (구매한 카드는 공개되므로 블라인드 표시도 함께 당김)"""
+        idx = np.arange(3)[None, :]
+        after = idx >= slot[:, None]
+        res = self.reserved[r, pl]
+        shifted = np.where(after, np.roll(res, -1, axis=1), res)
+        shifted[:, 2] = -1
+        self.reserved[r, pl] = shifted
+        blind = self.reserved_blind[r, pl]
+        shifted = np.where(after, np.roll(blind, -1, axis=1), blind)
+        shifted[:, 2] = False
+        self.reserved_blind[r, pl] = shifted
+
+    def _take_gold(self, r, pl):
+        has_gold = self.bank[r, GOLD] > 0
+        r, pl = r[has_gold], pl[has_gold]
+        self.bank[r, GOLD] -= 1
+        self.gems[r, pl, GOLD] += 1
+
+    def _pay_and_gain(self, r, pl, cards):
+        """Player.pay_for_card()와 같은 순서(보너스 → 일반 보석 → 황금)로 지불하고 카드를 획득합니다."""
+        gems = self.gems[r, pl]
+        need = np.maximum(self.card_cost[cards] - self.bonuses[r, pl], 0)
+        pay = np.minimum(gems[:, :5], need)
+        gold = (need - pay).sum(axis=1)
+        self.gems[r, pl, :5] -= pay
+        self.gems[r, pl, GOLD] -= gold
+        self.bank[r, :5] += pay
+        self.bank[r, GOLD] += gold
+
+        self.bonuses[r, pl, self.card_bonus[cards]] += 1
+        self.scores[r, pl] += self.card_points[cards]
+        self.num_cards[r, pl] += 1
+        self.owned[r, pl, cards] = True
+
+    @staticmethod
+    def _auto_discard(gems, counts):
+        """가장 많이 가진 일반 색부터 하나씩 버리고, 일반 토큰이 없을 때만 황금을 버립니다."""
+        gems = gems.copy()
+        drop = np.zeros_like(gems)
+        rows = np.arange(len(gems))
+        for i in range(int(counts.max())):
+            todo = counts > i
+            colored = gems[:, :5]
+            color = np.where(colored.max(axis=1) > 0, colored.argmax(axis=1), GOLD)
+            r, c = rows[todo], color[todo]
+            gems[r, c] -= 1
+            drop[r, c] += 1
+        return drop
+
+    # ==========================================
+    # GameState 연동
+    # ==========================================
+    def action_dict(self, game_idx, action, discard=None):
+        """메인 액션 인덱스를 GameState.step()이 받는 액션 딕셔너리로 변환합니다."""
+        i, action = game_idx, int(action)
+        cur = self.current_player[i]
+        ids = self.card_table.ids
+        if action < PURCHASE_RESERVED:
+            tier, pos = divmod(action - PURCHASE_BOARD, 4)
+            result = {'type': 'purchase', 'tier': tier + 1,
+                      'card_id': ids[self.board[i, tier, pos]], 'source': 'board'}
+        elif action < RESERVE_PUBLIC:
+            card = int(self.reserved[i, cur, action - PURCHASE_RESERVED])
+            result = {'type': 'purchase', 'tier': self.card_table.tier[card],
+                      'card_id': ids[card], 'source': 'reserved'}
+        elif action < RESERVE_BLIND:
+            tier, pos = divmod(action - RESERVE_PUBLIC, 4)
+            result = {'type': 'reserve_public', 'tier': tier + 1,
+                      'card_id': ids[self.board[i, tier, pos]]}
+        elif action < TAKE_DIFF:
+            result = {'type': 'reserve_blind', 'tier': action - RESERVE_BLIND + 1}
+        elif action < TAKE_SAME:
+            combo = TAKE_DIFF_COMBOS[action - TAKE_DIFF]
+            result = {'type': 'take_diff', 'colors': [COLORS[c] for c in combo]}
+        elif action < PASS:
+            result = {'type': 'take_same', 'color': COLORS[action - TAKE_SAME]}
+        else:
+            result = {'type': 'pass'}
+        if discard is not None:
+            result['discard'] = dict(zip(GEM_COLORS, (int(x) for x in discard)))
+        return result
+
+    def to_game_state(self, game_idx):
+        """
+        배치의 한 게임을 GameState로 변환합니다.
+        보드/예약은 슬롯 순서 그대로(블라인드 예약 카드는 blind_reserved에도), 구매 카드는 CardTable 순서로 채워집니다.
+        """
+        from .game import GameState
+        i = game_idx
+        cards = self.card_table.cards
+        gs = GameState(self.num_players)
+        gs.bank = dict(zip(GEM_COLORS, (int(x) for x in self.bank[i])))
+        gs.current_player_idx = int(self.current_player[i])
+        gs.decks = {t + 1: [cards[c] for c in self.decks[i, t, :self.deck_len[i, t]]] for t in range(3)}
+        gs.board = {t + 1: [cards[c] for c in self.board[i, t] if c >= 0] for t in range(3)}
+        gs.nobles = [self.noble_table.nobles[k] for k in np.flatnonzero(self.nobles[i])]
+        for p, player in enumerate(gs.players):
+            player.gems = dict(zip(GEM_COLORS, (int(x) for x in self.gems[i, p])))
+            player.cards = [cards[c] for c in np.flatnonzero(self.owned[i, p])]
+            player.reserved = [cards[c] for c in self.reserved[i, p] if c >= 0]
+            player.blind_reserved = [cards[c] for c, blind in zip(self.reserved[i, p], self.reserved_blind[i, p])
+                                     if c >= 0 and blind]
+            player.nobles = [self.noble_table.nobles[k] for k in np.flatnonzero(self.noble_owner[i] == p)]
+            player.recompute_bonuses()
+            player.score = int(self.scores[i, p])
+        gs.is_last_round = bool(self.is_last_round[i])
+        gs.is_game_over = bool(self.is_game_over[i])
+        if gs.is_game_over:
+            gs.winner = gs.players[int(self.winner[i])]
+        return gs
@@ -0,0 +1,103 @@
+"""
+카드/귀족 카탈로그: data/cards.json, data/nobles.json을 한 번만 읽고 검증한 뒤 캐시합니다.
+
+카드와 귀족은 Card.from_dict()/Noble.from_dict()로 만들어 id별 공유 인스턴스로 등록되므로,
+이후 import_state()나 from_dict()는 같은 객체를 그대로 재사용합니다.
+"""
+import json
+import os
+from functools import lru_cache
+from .components import Card, Noble
+
+SCHEMA_VERSION = 1
+COLORS = ['white', 'blue', 'green', 'red', 'black']
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+class Catalog:
+    """검증된 전체 카드/귀족 목록과 id 조회 테이블"""
+    __slots__ = ('cards', 'nobles', 'card_by_id', 'noble_by_id')
+
+    def __init__(self, cards, nobles):
+        self.cards = tuple(cards)
+        self.nobles = tuple(nobles)
+        self.card_by_id = {c.id: c for c in self.cards}
+        self.noble_by_id = {n.id: n for n in self.nobles}
+
+    def card(self, card_id):
+        return self.card_by_id[card_id]
+
+    def noble(self, noble_id):
+        return self.noble_by_id[noble_id]
+
+
+@lru_cache(maxsize=None)
+def load_catalog(data_dir=DATA_DIR):
+    """data_dir의 카드/귀족 파일을 읽어 검증한 Catalog를 반환합니다. (경로별로 한 번만 로드)"""
+    card_data = _load_json(os.path.join(data_dir, 'cards.json'), 'cards')
+    noble_data = _load_json(os.path.join(data_dir, 'nobles.json'), 'nobles')
+
+    cards = [Card.from_dict(c) for c in card_data['cards']]
+    nobles = [Noble.from_dict(n) for n in noble_data['nobles']]
+    _validate_cards(cards, card_data.get('counts', {}))
+    _validate_nobles(nobles, noble_data.get('counts', {}))
+    return Catalog(cards, nobles)
+
+
+def load_cards(data_dir=DATA_DIR):
+    """GameState.reset()에 넘길 전체 카드 리스트 (공유 인스턴스)"""
+    return list(load_catalog(data_dir).cards)
+
+
+def load_nobles(data_dir=DATA_DIR):
+    """GameState.reset()에 넘길 전체 귀족 리스트 (공유 인스턴스)"""
+    return list(load_catalog(data_dir).nobles)
+
+
+# ==========================================
+# 검증
+# ==========================================
+def _load_json(path, key):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    version = data.get('schema_version')
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"{path}: 지원하지 않는 schema_version {version} (기대값 {SCHEMA_VERSION})")
+    if data.get('colors', COLORS) != COLORS:
+        raise ValueError(f"{path}: 색상 목록이 {COLORS}와 다릅니다.")
+    if not isinstance(data.get(key), list):
+        raise ValueError(f"{path}: '{key}' 리스트가 없습니다.")
+    return data
+
+
+def _check_unique(items, kind):
+    ids = [item.id for item in items]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"{kind} id가 중복되었습니다.")
+
+
+def _validate_cards(cards, counts):
+    _check_unique(cards, '카드')
+    for card in cards:
+        if card.tier not in (1, 2, 3) or card.bonus not in COLORS:
+            raise ValueError(f"잘못된 카드 데이터: {card}")
+        if set(card.cost) - set(COLORS) or any(v < 0 for v in card.cost.values()):
+            raise ValueError(f"잘못된 카드 비용: {card}")
+
+    if 'total' in counts and counts['total'] != len(cards):
+        raise ValueError(f"카드 수 {len(cards)}가 counts.total {counts['total']}과 다릅니다.")
+    for tier, expected in counts.get('by_tier', {}).items():
+        actual = sum(1 for c in cards if c.tier == int(tier))
+        if actual != expected:
+            raise ValueError(f"Tier {tier} 카드 수 {actual}가 {expected}와 다릅니다.")
+
+
+def _validate_nobles(nobles, counts):
+    _check_unique(nobles, '귀족')
+    for noble in nobles:
+        if set(noble.requirements) - set(COLORS) or any(v < 0 for v in noble.requirements.values()):
+            raise ValueError(f"잘못된 귀족 조건: {noble}")
+
+    if 'total' in counts and counts['total'] != len(nobles):
+        raise ValueError(f"귀족 수 {len(nobles)}가 counts.total {counts['total']}과 다릅니다.")
@@ -0,0 +1,702 @@
+import random
+import itertools
+from functools import lru_cache
+from .player import Player
+from .game import GameState
+from .rng import make_rng, copy_rng, fork_rng, export_rng
+from .actions import (
+    NUM_ACTIONS, NUM_DISCARDS, PASS, PURCHASE_BOARD, PURCHASE_RESERVED,
+    RESERVE_BLIND, RESERVE_PUBLIC, TAKE_DIFF, TAKE_DIFF_COMBOS, TAKE_SAME, discard_indices,
+)
+
+COLORS = ['white', 'blue', 'green', 'red', 'black']
+GEM_COLORS = COLORS + ['gold']
+COLOR_INDEX = {color: i for i, color in enumerate(GEM_COLORS)}
+GOLD = 5
+
+# 색상 인덱스 조합 → TAKE_DIFF_COMBOS 내 위치
+_TAKE_DIFF_POS = {combo: i for i, combo in enumerate(TAKE_DIFF_COMBOS)}
+
+
+class CardTable:
+    """
+    전체 카드를 정수 인덱스로 참조하기 위한 불변 테이블.
+    카드 비용/보너스/점수를 튜플로 펼쳐 두어 규칙 판정 시 딕셔너리 조회를 없앱니다.
+    """
+    __slots__ = ('cards', 'ids', 'index', 'tier', 'bonus', 'points', 'cost')
+
+    def __init__(self, cards):
+        self.cards = tuple(cards)
+        self.ids = tuple(c.id for c in self.cards)
+        self.index = {card_id: i for i, card_id in enumerate(self.ids)}
+        self.tier = tuple(c.tier for c in self.cards)
+        self.bonus = tuple(COLOR_INDEX[c.bonus] for c in self.cards)
+        self.points = tuple(c.points for c in self.cards)
+        self.cost = tuple(
+            tuple(c.cost.get(color, 0) for color in COLORS) for c in self.cards
+        )
+
+    def __len__(self):
+        return len(self.cards)
+
+
+class NobleTable:
+    """전체 귀족 타일을 정수 인덱스로 참조하기 위한 불변 테이블."""
+    __slots__ = ('nobles', 'ids', 'index', 'points', 'requirements')
+
+    def __init__(self, nobles):
+        self.nobles = tuple(nobles)
+        self.ids = tuple(n.id for n in self.nobles)
+        self.index = {noble_id: i for i, noble_id in enumerate(self.ids)}
+        self.points = tuple(n.points for n in self.nobles)
+        self.requirements = tuple(
+            tuple(n.requirements.get(color, 0) for color in COLORS) for n in self.nobles
+        )
+
+    def __len__(self):
+        return len(self.nobles)
+
+
+class CompactGameState:
+    """
+    GameState와 동일한 규칙/API(step, apply/undo, clone, get_legal_actions, export_state)를 제공하는
+    배열 기반의 경량 게임 상태.
+
+    - 보석(은행/플레이어): 6칸 bytearray (COLORS 순서 + gold)
+    - 보너스: 5칸 bytearray
+    - 덱/보드/보유·예약 카드: CardTable 인덱스를 담은 bytearray
+    - 귀족: NobleTable 인덱스를 담은 bytearray
+
+    난수 소비 순서와 합법 행동 목록의 순서가 GameState와 같으므로,
+    같은 시드에서는 같은 게임 결과가 나옵니다.
+    """
+    # GameState.rng와 같음 (기본값은 전역 random)
+    rng = random
+    # players 뷰 캐시. 상태가 바뀌면(step/undo) 버리고 다음 접근 때 다시 만듭니다.
+    _players = None
+
+    def __init__(self, num_players=2, rng=None):
+        assert 2 <= num_players <= 4, "플레이어 수는 2~4명이어야 합니다."
+        self.num_players = num_players
+        if rng is not None:
+            self.rng = make_rng(rng)
+        self.card_table = None
+        self.noble_table = None
+        self._init_arrays()
+
+    def _init_arrays(self):
+        gem_counts = {2: 4, 3: 5, 4: 7}[self.num_players]
+        n = self.num_players
+        self.bank_counts = bytearray([gem_counts] * 5 + [5])
+        self.gems = [bytearray(6) for _ in range(n)]
+        self.bonuses = [bytearray(5) for _ in range(n)]
+        self.scores = [0] * n
+        self.owned = [bytearray() for _ in range(n)]
+        self.reserved = [bytearray() for _ in range(n)]
+        self.blind_reserved = [bytearray() for _ in range(n)]
+        self.nobles_owned = [bytearray() for _ in range(n)]
+        self.current_player_idx = 0
+        self.deck_idx = {1: bytearray(), 2: bytearray(), 3: bytearray()}
+        self.board_idx = {1: bytearray(), 2: bytearray(), 3: bytearray()}
+        self.noble_idx = bytearray()
+        self.is_last_round = False
+        self.is_game_over = False
+        self.winner_idx = None
+        self._players = None
+
+    # ==========================================
+    # 게임 초기화
+    # ==========================================
+    def reset(self, all_cards, all_nobles):
+        """
+        GameState.reset()과 같은 순서로 셔플하여 게임을 초기화합니다.
+        all_cards / all_nobles로 CardTable·NobleTable을 직접 넘기면 테이블을 재사용합니다.
+        """
+        self.card_table = all_cards if isinstance(all_cards, CardTable) else CardTable(all_cards)
+        self.noble_table = all_nobles if isinstance(all_nobles, NobleTable) else NobleTable(all_nobles)
+        self._init_arrays()
+
+        # --- 카드 분류 및 셔플 (GameState와 동일한 난수 소비) ---
+        table = self.card_table
+        decks = {1: [], 2: [], 3: []}
+        for i in range(len(table)):
+            decks[table.tier[i]].append(i)
+
+        for tier in decks:
+            self.rng.shuffle(decks[tier])
+            deck = bytearray(decks[tier])
+            board = bytearray()
+            for _ in range(4):
+                if deck:
+                    board.append(deck.pop())
+            self.deck_idx[tier] = deck
+            self.board_idx[tier] = board
+
+        # --- 귀족 셔플 및 세팅 (인원수 + 1) ---
+        nobles_order = list(range(len(self.noble_table)))
+        self.rng.shuffle(nobles_order)
+        self.noble_idx = bytearray(nobles_order[:self.num_players + 1])
+
+    # ==========================================
+    # 턴 진행 파이프라인
+    # ==========================================
+    def step(self, action):
+        """GameState.step()과 같은 action 딕셔너리를 받아 턴을 처리합니다."""
+        if self.is_game_over:
+            raise RuntimeError("게임이 이미 종료되었습니다.")
+
+        p = self.current_player_idx
+        step_info = {"game_over": False, "winner": None, "noble_gained": None}
+        self._players = None
+
+        # [1단계] 메인 액션 수행
+        self._execute_main_action(p, action)
+
+        # [2단계] 토큰 상한 처리
+        gems = self.gems[p]
+        if sum(gems) > 10:
+            if 'discard' in action:
+                bank = self.bank_counts
+                for color, amount in action['discard'].items():
+                    ci = COLOR_INDEX[color]
+                    gems[ci] -= amount
+                    bank[ci] += amount
+            else:
+                raise ValueError("토큰이 10개를 초과했는데 버릴 토큰 정보가 없습니다.")
+
+        # [3단계] 귀족 방문 체크 (동시 충족 시 무작위 1명)
+        eligible = self._get_eligible_nobles(p)
+        if eligible:
+            noble_id = action.get('noble')
+            if noble_id is None:
+                chosen = self.rng.choice(eligible)
+            else:
+                chosen = self.noble_table.index.get(noble_id)
+                if chosen not in eligible:
+                    raise ValueError(f"귀족 {noble_id}의 방문 조건을 만족하지 않습니다.")
+            self.nobles_owned[p].append(chosen)
+            self.scores[p] += self.noble_table.points[chosen]
+            self.noble_idx.remove(chosen)
+            step_info["noble_gained"] = self.noble_table.nobles[chosen]
+
+        # [4단계] 게임 종료 판정
+        if self.scores[p] >= 15:
+            self.is_last_round = True
+
+        self.current_player_idx = (p + 1) % self.num_players
+
+        if self.is_last_round and self.current_player_idx == 0:
+            self.is_game_over = True
+            self.winner_idx = self._determine_winner()
+            step_info["game_over"] = True
+            step_info["winner"] = self.winner
+
+        return step_info
+
+    def apply(self, action):
+        """GameState.apply()와 같이 step()을 실행하고 undo()에 넘길 되돌리기 기록을 반환합니다."""
+        p = self.current_player_idx
+        tier = action.get('tier')
+        if tier is not None:
+            deck = self.deck_idx[tier]
+            board, deck_len, deck_top = bytes(self.board_idx[tier]), len(deck), deck[-1] if deck else None
+        else:
+            board = deck_len = deck_top = None
+        record = (
+            p, bytes(self.bank_counts), bytes(self.gems[p]), bytes(self.bonuses[p]), self.scores[p],
+            len(self.owned[p]), bytes(self.reserved[p]), bytes(self.blind_reserved[p]), len(self.nobles_owned[p]),
+            bytes(self.noble_idx), tier, board, deck_len, deck_top,
+            self.is_last_round, self.is_game_over, self.winner_idx,
+        )
+        self.step(action)
+        return record
+
+    def undo(self, record):
+        """apply()가 반환한 기록으로 해당 step()을 제자리에서 되돌립니다. (역순으로 호출해야 함)"""
+        (p, bank, gems, bonuses, score, num_owned, reserved, blind_reserved, num_nobles,
+         nobles, tier, board, deck_len, deck_top, is_last_round, is_game_over, winner_idx) = record
+        self.bank_counts = bytearray(bank)
+        self.gems[p] = bytearray(gems)
+        self.bonuses[p] = bytearray(bonuses)
+        self.scores[p] = score
+        del self.owned[p][num_owned:]
+        self.reserved[p] = bytearray(reserved)
+        self.blind_reserved[p] = bytearray(blind_reserved)
+        del self.nobles_owned[p][num_nobles:]
+        self.noble_idx = bytearray(nobles)
+        if tier is not None:
+            self.board_idx[tier] = bytearray(board)
+            if len(self.deck_idx[tier]) < deck_len:
+                self.deck_idx[tier].append(deck_top)
+        self.current_player_idx = p
+        self.is_last_round = is_last_round
+        self.is_game_over = is_game_over
+        self.winner_idx = winner_idx
+        self._players = None
+
+    def _determine_winner(self):
+        """최고 점수 → 동점 시 구매한 카드 수가 적은 쪽 (동률이면 앞 순번) 플레이어 인덱스."""
+        return min(
+            range(self.num_players),
+            key=lambda i: (-self.scores[i], len(self.owned[i]))
+        )
+
+    def _execute_main_action(self, p, action):
+        action_type = action['type']
+        bank = self.bank_counts
+        gems = self.gems[p]
+
+        if action_type == 'take_diff':
+            for color in action['colors']:
+                ci = COLOR_INDEX[color]
+                bank[ci] -= 1
+                gems[ci] += 1
+
+        elif action_type == 'take_same':
+            ci = COLOR_INDEX[action['color']]
+            bank[ci] -= 2
+            gems[ci] += 2
+
+        elif action_type == 'reserve_public':
+            tier = action['tier']
+            card = self.card_table.index[action['card_id']]
+            self.board_idx[tier].remove(card)
+            self.reserved[p].append(card)
+            self._replenish_board(tier)
+            self._take_gold_if_available(p)
+
+        elif action_type == 'reserve_blind':
+            tier = action['tier']
+            if not self.deck_idx[tier]:
+                raise ValueError(f"Tier {tier} 덱이 비어있어 블라인드 예약을 할 수 없습니다.")
+            card = self.deck_idx[tier].pop()
+            self.reserved[p].append(card)
+            self.blind_reserved[p].append(card)
+            self._take_gold_if_available(p)
+
+        elif action_type == 'purchase':
+            tier = action['tier']
+            card = self.card_table.index[action['card_id']]
+            if action['source'] == 'board':
+                self.board_idx[tier].remove(card)
+                self._replenish_board(tier)
+            else:  # 'reserved'
+                self.reserved[p].remove(card)
+                if card in self.blind_reserved[p]:
+                    self.blind_reserved[p].remove(card)
+
+            # 토큰 지불: 보너스 차감 → 일반 보석 → 부족분은 황금
+            bonuses = self.bonuses[p]
+            cost = self.card_table.cost[card]
+            for ci in range(5):
+                need = cost[ci] - bonuses[ci]
+                if need <= 0:
+                    continue
+                pay = gems[ci] if gems[ci] < need else need
+                gems[ci] -= pay
+                bank[ci] += pay
+                if need > pay:
+                    gems[GOLD] -= need - pay
+                    bank[GOLD] += need - pay
+
+            self.owned[p].append(card)
+            bonuses[self.card_table.bonus[card]] += 1
+            self.scores[p] += self.card_table.points[card]
+
+        elif action_type == 'pass':
+            pass
+
+    # ==========================================
+    # 보조 로직들
+    # ==========================================
+    def _replenish_board(self, tier):
+        if self.deck_idx[tier]:
+            self.board_idx[tier].append(self.deck_idx[tier].pop())
+
+    def _take_gold_if_available(self, p):
+        if self.bank_counts[GOLD] > 0:
+            self.bank_counts[GOLD] -= 1
+            self.gems[p][GOLD] += 1
+
+    def _get_eligible_nobles(self, p):
+        bonuses = self.bonuses[p]
+        requirements = self.noble_table.requirements
+        return [
+            n for n in self.noble_idx
+            if all(bonuses[ci] >= req for ci, req in enumerate(requirements[n]))
+        ]
+
+    def _buying_power(self, p):
+        """색별 (보유 토큰 + 보너스) 리스트와 황금 토큰 수. _can_buy()에 넘겨 카드마다 다시 더하지 않게 합니다."""
+        gems = self.gems[p]
+        return [g + b for g, b in zip(gems, self.bonuses[p])], gems[GOLD]
+
+    def _can_buy(self, card, power):
+        have, gold = power
+        missing = 0
+        for cost, h in zip(self.card_table.cost[card], have):
+            if cost > h:
+                missing += cost - h
+        return missing <= gold
+
+    # ==========================================
+    # 유효한 행동 리스트 생성 (GameState와 동일한 순서)
+    # ==========================================
+    def get_legal_actions(self, dedupe=False):
+        return list(self.iter_legal_actions(dedupe))
+
+    def iter_legal_actions(self, dedupe=False):
+        """GameState.iter_legal_actions()와 같은 순서/중복 제거 규칙으로 행동을 지연 생성합니다."""
+        seen = set() if dedupe else None
+        empty = True
+
+        for base, after, discard_count, _ in self._iter_action_groups():
+            is_take = seen is not None and base['type'] in ('take_diff', 'take_same')
+
+            if discard_count <= 0:
+                if is_take:
+                    net = tuple(after)
+                    if net in seen:
+                        continue
+                    seen.add(net)
+                empty = False
+                yield base
+                continue
+
+            for discard in _discard_combos(after, discard_count):
+                if is_take:
+                    net = tuple(n - discard[c] for c, n in zip(GEM_COLORS, after))
+                    if net in seen:
+                        continue
+                    seen.add(net)
+                action = base.copy()
+                action['discard'] = discard
+                empty = False
+                yield action
+
+        if empty:
+            yield {'type': 'pass'}
+
+    def count_legal_actions(self):
+        total = 0
+        for _, after, discard_count, _ in self._iter_action_groups():
+            total += 1 if discard_count <= 0 else _count_discard_combos(after, discard_count)
+        return max(total, 1)
+
+    def sample_legal_action(self, rng=None):
+        """GameState.sample_legal_action()과 같은 난수 소비로 행동 하나를 균등 추출합니다."""
+        if rng is None:
+            rng = self.rng
+        groups = []
+        total = 0
+        for group in self._iter_action_groups():
+            _, after, discard_count, _ = group
+            count = 1 if discard_count <= 0 else _count_discard_combos(after, discard_count)
+            groups.append((count, group))
+            total += count
+
+        k = rng.randrange(max(total, 1))
+        if total == 0:
+            return {'type': 'pass'}
+
+        for count, (base, after, discard_count, _) in groups:
+            if k >= count:
+                k -= count
+                continue
+            if discard_count <= 0:
+                return base
+            action = base.copy()
+            action['discard'] = GameState._nth_discard_combo(
+                dict(zip(GEM_COLORS, after)), discard_count, k
+            )
+            return action
+
+    def legal_action_ids(self):
+        """GameState.legal_action_ids()와 같은 고정 액션 인덱스 리스트를 반환합니다."""
+        ids = []
+        for _, after, discard_count, main in self._iter_action_groups():
+            base_id = main * NUM_DISCARDS
+            if discard_count <= 0:
+                ids.append(base_id)
+            else:
+                ids.extend(base_id + d for d in discard_indices(tuple(after), discard_count))
+        if not ids:
+            ids.append(PASS * NUM_DISCARDS)
+        return ids
+
+    def legal_action_mask(self):
+        mask = bytearray(NUM_ACTIONS)
+        for action_id in self.legal_action_ids():
+            mask[action_id] = 1
+        return mask
+
+    def _iter_action_groups(self):
+        """
+        (기본 액션, 행동 후 6칸 토큰 배열, 버려야 할 토큰 수, 메인 액션 인덱스) 묶음을
+        GameState와 같은 순서로 생성합니다.
+        """
+        p = self.current_player_idx
+        ids = self.card_table.ids
+        tiers = self.card_table.tier
+        power = self._buying_power(p)
+
+        # [1] 카드 구매
+        for tier, cards in self.board_idx.items():
+            for pos, card in enumerate(cards):
+                if self._can_buy(card, power):
+                    yield {
+                        'type': 'purchase', 'tier': tier,
+                        'card_id': ids[card], 'source': 'board'
+                    }, None, 0, PURCHASE_BOARD + (tier - 1) * 4 + pos
+        for pos, card in enumerate(self.reserved[p]):
+            if self._can_buy(card, power):
+                yield {
+                    'type': 'purchase', 'tier': tiers[card],
+                    'card_id': ids[card], 'source': 'reserved'
+                }, None, 0, PURCHASE_RESERVED + pos
+
+        # [2] 카드 예약
+        gems = self.gems[p]
+        held = sum(gems)
+        if len(self.reserved[p]) < 3:
+            after = None
+            discard_count = 0
+            if self.bank_counts[GOLD] > 0:
+                after = bytearray(gems)
+                after[GOLD] += 1
+                discard_count = held + 1 - 10
+
+            for tier, cards in self.board_idx.items():
+                for pos, card in enumerate(cards):
+                    yield ({'type': 'reserve_public', 'tier': tier, 'card_id': ids[card]},
+                           after, discard_count, RESERVE_PUBLIC + (tier - 1) * 4 + pos)
+            for tier, deck in self.deck_idx.items():
+                if deck:
+                    yield ({'type': 'reserve_blind', 'tier': tier},
+                           after, discard_count, RESERVE_BLIND + tier - 1)
+
+        # [3] 보석 가져오기
+        bank = self.bank_counts
+        available = [ci for ci in range(5) if bank[ci] > 0]
+        for i in range(1, min(3, len(available)) + 1):
+            for combo in itertools.combinations(available, i):
+                after = bytearray(gems)
+                for ci in combo:
+                    after[ci] += 1
+                yield ({'type': 'take_diff', 'colors': [COLORS[ci] for ci in combo]},
+                       after, held + i - 10, TAKE_DIFF + _TAKE_DIFF_POS[combo])
+
+        for ci in range(5):
+            if bank[ci] >= 4:
+                after = bytearray(gems)
+                after[ci] += 2
+                yield {'type': 'take_same', 'color': COLORS[ci]}, after, held + 2 - 10, TAKE_SAME + ci
+
+    # ==========================================
+    # GameState 호환 뷰 (기존 에이전트용, 읽기 전용)
+    # ==========================================
+    @property
+    def bank(self):
+        return dict(zip(GEM_COLORS, self.bank_counts))
+
+    @property
+    def board(self):
+        cards = self.card_table.cards
+        return {tier: [cards[i] for i in idx] for tier, idx in self.board_idx.items()}
+
+    def board_card(self, card_id):
+        """GameState.board_card()와 같은 id 조회. 보드에 없으면 KeyError."""
+        card = self.card_table.index[card_id]
+        if all(card not in idx for idx in self.board_idx.values()):
+            raise KeyError(card_id)
+        return self.card_table.cards[card]
+
+    @property
+    def decks(self):
+        cards = self.card_table.cards
+        return {tier: [cards[i] for i in idx] for tier, idx in self.deck_idx.items()}
+
+    @property
+    def nobles(self):
+        return [self.noble_table.nobles[i] for i in self.noble_idx]
+
+    @property
+    def players(self):
+        if self._players is None:
+            self._players = [self._make_player(i) for i in range(self.num_players)]
+        return self._players
+
+    @property
+    def winner(self):
+        if self.winner_idx is None:
+            return None
+        return self.players[self.winner_idx]
+
+    def _make_player(self, i):
+        cards = self.card_table.cards
+        player = Player(i)
+        player.gems = dict(zip(GEM_COLORS, self.gems[i]))
+        player.cards = [cards[c] for c in self.owned[i]]
+        player.bonuses = dict(zip(COLORS, self.bonuses[i]))
+        player.reserved = [cards[c] for c in self.reserved[i]]
+        player.blind_reserved = [cards[c] for c in self.blind_reserved[i]]
+        player.nobles = [self.noble_table.nobles[n] for n in self.nobles_owned[i]]
+        player.score = self.scores[i]
+        return player
+
+    # ==========================================
+    # 복제 / 변환 / 직렬화
+    # ==========================================
+    def clone(self, rng=None):
+        """
+        GameState.clone()과 같은 규칙의 복제. 테이블은 공유하고 배열만 복사합니다.
+        rng를 주면 사본이 그 난수 생성기를 쓰고, 아니면 원본 난수 상태의 사본을 이어받습니다.
+        """
+        cs = self.__class__.__new__(self.__class__)
+        cs.num_players = self.num_players
+        cs.card_table = self.card_table
+        cs.noble_table = self.noble_table
+        cs.bank_counts = bytearray(self.bank_counts)
+        cs.gems = [bytearray(g) for g in self.gems]
+        cs.bonuses = [bytearray(b) for b in self.bonuses]
+        cs.scores = list(self.scores)
+        cs.owned = [bytearray(c) for c in self.owned]
+        cs.reserved = [bytearray(c) for c in self.reserved]
+        cs.blind_reserved = [bytearray(c) for c in self.blind_reserved]
+        cs.nobles_owned = [bytearray(n) for n in self.nobles_owned]
+        cs.current_player_idx = self.current_player_idx
+        cs.deck_idx = {t: bytearray(cards) for t, cards in self.deck_idx.items()}
+        cs.board_idx = {t: bytearray(cards) for t, cards in self.board_idx.items()}
+        cs.noble_idx = bytearray(self.noble_idx)
+        cs.is_last_round = self.is_last_round
+        cs.is_game_over = self.is_game_over
+        cs.winner_idx = self.winner_idx
+        if rng is not None:
+            cs.rng = rng
+        elif self.rng is not random:
+            cs.rng = copy_rng(self.rng)
+        return cs
+
+    def fork(self):
+        """원본 난수에서 뽑은 시드로 독립 스트림을 가진 사본 (GameState.fork()와 같음)"""
+        return self.clone(rng=fork_rng(self.rng))
+
+    def export_state(self, include_rng=True):
+        """GameState.export_state()와 같은 형식의 딕셔너리를 반환합니다."""
+        cards = self.card_table.cards
+        data = {
+            "num_players": self.num_players,
+            "bank": self.bank,
+            "current_player_idx": self.current_player_idx,
+            "decks": {str(t): [cards[i].to_dict() for i in self.deck_idx[t]] for t in [1, 2, 3]},
+            "board": {str(t): [cards[i].to_dict() for i in self.board_idx[t]] for t in [1, 2, 3]},
+            "nobles": [n.to_dict() for n in self.nobles],
+            "players": [p.to_dict() for p in self.players],
+            "is_last_round": self.is_last_round,
+            "is_game_over": self.is_game_over,
+        }
+        if include_rng and self.rng is not random:
+            data["rng"] = export_rng(self.rng)
+        return data
+
+    @classmethod
+    def import_state(cls, data, card_table=None, noble_table=None):
+        """export_state() 형식(GameState와 공용)의 딕셔너리로부터 복원합니다."""
+        return cls.from_game_state(GameState.import_state(data), card_table, noble_table)
+
+    @classmethod
+    def from_game_state(cls, gs, card_table=None, noble_table=None):
+        """
+        GameState를 CompactGameState로 변환합니다.
+        테이블을 주지 않으면 상태 안에 있는 카드/귀족만으로 테이블을 만듭니다.
+        """
+        if card_table is None:
+            all_cards = [c for t in (1, 2, 3) for c in gs.decks[t] + gs.board[t]]
+            for player in gs.players:
+                all_cards.extend(player.cards + player.reserved)
+            card_table = CardTable(sorted(all_cards, key=lambda c: c.id))
+        if noble_table is None:
+            all_nobles = list(gs.nobles)
+            for player in gs.players:
+                all_nobles.extend(player.nobles)
+            noble_table = NobleTable(sorted(all_nobles, key=lambda n: n.id))
+
+        cs = cls(gs.num_players)
+        if gs.rng is not random:
+            cs.rng = copy_rng(gs.rng)
+        cs.card_table = card_table
+        cs.noble_table = noble_table
+        card_index = card_table.index
+        noble_index = noble_table.index
+
+        cs.bank_counts = bytearray(gs.bank[c] for c in GEM_COLORS)
+        for i, player in enumerate(gs.players):
+            cs.gems[i] = bytearray(player.gems[c] for c in GEM_COLORS)
+            cs.owned[i] = bytearray(card_index[c.id] for c in player.cards)
+            cs.reserved[i] = bytearray(card_index[c.id] for c in player.reserved)
+            cs.blind_reserved[i] = bytearray(card_index[c.id] for c in player.blind_reserved)
+            cs.nobles_owned[i] = bytearray(noble_index[n.id] for n in player.nobles)
+            cs.scores[i] = player.score
+            for card in cs.owned[i]:
+                cs.bonuses[i][card_table.bonus[card]] += 1
+        cs.current_player_idx = gs.current_player_idx
+        cs.deck_idx = {t: bytearray(card_index[c.id] for c in gs.decks[t]) for t in (1, 2, 3)}
+        cs.board_idx = {t: bytearray(card_index[c.id] for c in gs.board[t]) for t in (1, 2, 3)}
+        cs.noble_idx = bytearray(noble_index[n.id] for n in gs.nobles)
+        cs.is_last_round = gs.is_last_round
+        cs.is_game_over = gs.is_game_over
+        if cs.is_game_over:
+            cs.winner_idx = cs._determine_winner()
+        cs._players = None
+        return cs
+
+    def to_game_state(self):
+        """현재 상태를 일반 GameState로 변환합니다. (Card/Noble 객체는 테이블과 공유)"""
+        gs = GameState.__new__(GameState)
+        gs.num_players = self.num_players
+        gs.bank = self.bank
+        gs.players = [self._make_player(i) for i in range(self.num_players)]  # 캐시된 뷰와 공유하지 않음
+        gs.current_player_idx = self.current_player_idx
+        gs.decks = self.decks
+        gs.board = self.board
+        gs.nobles = self.nobles
+        gs.is_last_round = self.is_last_round
+        gs.is_game_over = self.is_game_over
+        gs.winner = gs.players[self.winner_idx] if self.winner_idx is not None else None
+        if self.rng is not random:
+            gs.rng = copy_rng(self.rng)
+        return gs
+
+
+def _discard_combos(gems, discard_count):
+    """
+    GameState._generate_discard_combos()와 같은 순서로 디스카드 조합을 생성합니다.
+    gems는 6칸 배열(COLORS + gold)입니다.
+    """
+    active = [ci for ci in range(6) if gems[ci] > 0]
+
+    def dfs(idx, remaining, counts):
+        if remaining == 0:
+            result = dict.fromkeys(GEM_COLORS, 0)
+            for ci, n in zip(active, counts):
+                result[GEM_COLORS[ci]] = n
+            yield result
+            return
+        if idx >= len(active):
+            return
+        ci = active[idx]
+        for n in range(min(gems[ci], remaining) + 1):
+            yield from dfs(idx + 1, remaining - n, counts + [n])
+
+    yield from dfs(0, discard_count, [])
+
+
+def _count_discard_combos(gems, discard_count):
+    """_discard_combos()가 생성할 조합의 개수 (6칸 배열용). 행동 후 토큰 배열별로 캐시합니다."""
+    return _cached_discard_count(bytes(gems), discard_count)
+
+
+@lru_cache(maxsize=None)
+def _cached_discard_count(gems, discard_count):
+    # 보유 토큰 합은 최대 13개이므로 키의 종류가 수만 개 이내로 제한됨
+    return GameState._count_discard_combos(dict(zip(GEM_COLORS, gems)), discard_count)
@@ -1,15 +1,41 @@
+from types import MappingProxyType
+
+# id → 공유 인스턴스. 같은 id의 카드/귀족은 from_dict()가 항상 같은 객체를 돌려줍니다.
+_CARD_REGISTRY = {}
+_NOBLE_REGISTRY = {}
+
+
 class Card:
-    """스플렌더의 발전 카드를 나타내는 클래스"""
+    """스플렌더의 발전 카드를 나타내는 클래스 (불변, id별로 하나만 생성되어 공유됨)"""
+    __slots__ = ('id', 'tier', 'bonus', 'points', 'cost')
+
     def __init__(self, card_id, tier, bonus, points, cost):
-        self.id = card_id          # 예: "C001"
-        self.tier = tier           # 1, 2, 3
-        self.bonus = bonus         # "white", "blue", "green", "red", "black"
-        self.points = points       # 0 ~ 5
-        self.cost = cost           # 색상별 필요 토큰 딕셔너리
+        set_attr = object.__setattr__
+        set_attr(self, 'id', card_id)                      # 예: "C001"
+        set_attr(self, 'tier', tier)                       # 1, 2, 3
+        set_attr(self, 'bonus', bonus)                     # "white", "blue", "green", "red", "black"
+        set_attr(self, 'points', points)                   # 0 ~ 5
+        set_attr(self, 'cost', MappingProxyType(dict(cost)))  # 색상별 필요 토큰 (읽기 전용)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Card는 불변 객체입니다: {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Card는 불변 객체입니다: {name}")
 
     def __repr__(self):
         return f"<Card {self.id} (T{self.tier}): {self.points}pt, bonus {self.bonus}>"
 
+    # 불변 객체이므로 복사는 자기 자신, 피클은 from_dict()를 거쳐 받는 쪽의 공유 인스턴스로 복원
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (self.__class__.from_dict, (self.to_dict(),))
+
     def to_dict(self):
         """현재 카드 객체를 JSON(딕셔너리) 형태로 내보냅니다."""
         return {
@@ -22,26 +48,56 @@ class Card:
 
     @classmethod
     def from_dict(cls, data):
-        """JSON(딕셔너리) 데이터를 읽어와 Card 객체를 생성합니다."""
-        return cls(
+        """
+        JSON(딕셔너리) 데이터를 읽어와 Card 객체를 반환합니다.
+        같은 id의 카드가 이미 있으면 새로 만들지 않고 공유 인스턴스를 돌려줍니다.
+        (내용이 다른 같은 id의 카드는 등록하지 않고 별도 객체로 생성)
+        """
+        card = _CARD_REGISTRY.get(data["id"])
+        if card is not None and (card.tier == data["tier"] and card.points == data["points"]
+                                 and card.bonus == data["bonus"] and card.cost == data["cost"]):
+            return card
+
+        new_card = cls(
             card_id=data["id"],
             tier=data["tier"],
             bonus=data["bonus"],
             points=data["points"],
-            cost=data["cost"].copy()
+            cost=data["cost"]
         )
+        if card is None:
+            _CARD_REGISTRY[new_card.id] = new_card
+        return new_card
 
 
 class Noble:
-    """스플렌더의 귀족 타일을 나타내는 클래스"""
+    """스플렌더의 귀족 타일을 나타내는 클래스 (불변, id별로 하나만 생성되어 공유됨)"""
+    __slots__ = ('id', 'points', 'requirements')
+
     def __init__(self, noble_id, points, requirements):
-        self.id = noble_id               # 예: "N01"
-        self.points = points             # 항상 3
-        self.requirements = requirements # 색상별 필요 보너스 수량 딕셔너리
+        set_attr = object.__setattr__
+        set_attr(self, 'id', noble_id)                                  # 예: "N01"
+        set_attr(self, 'points', points)                                # 항상 3
+        set_attr(self, 'requirements', MappingProxyType(dict(requirements)))  # 색상별 필요 보너스 수량
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Noble은 불변 객체입니다: {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Noble은 불변 객체입니다: {name}")
 
     def __repr__(self):
         return f"<Noble {self.id}: {self.points}pt>"
 
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (self.__class__.from_dict, (self.to_dict(),))
+
     def to_dict(self):
         """현재 귀족 객체를 JSON(딕셔너리) 형태로 내보냅니다."""
         return {
@@ -52,9 +108,17 @@ class Noble:
 
     @classmethod
     def from_dict(cls, data):
-        """JSON(딕셔너리) 데이터를 읽어와 Noble 객체를 생성합니다."""
-        return cls(
+        """JSON(딕셔너리) 데이터를 읽어와 Noble 객체를 반환합니다. (같은 id는 공유 인스턴스)"""
+        noble = _NOBLE_REGISTRY.get(data["id"])
+        if noble is not None and (noble.points == data["points"]
+                                  and noble.requirements == data["requirements"]):
+            return noble
+
+        new_noble = cls(
             noble_id=data["id"],
             points=data["points"],
-            requirements=data["requirements"].copy()
+            requirements=data["requirements"]
         )
+        if noble is None:
+            _NOBLE_REGISTRY[new_noble.id] = new_noble
+        return new_noble
@@ -0,0 +1,199 @@
+"""
+학습용 관측 인코더: GameState(또는 그 배치)를 고정 레이아웃의 float32 특징 벡터로 변환합니다.
+
+모든 특징은 현재 차례 플레이어 기준입니다. 플레이어 슬롯 0은 현재 플레이어, 1은 다음 차례, ... 순이며
+빈 슬롯(인원수가 4명 미만)은 0으로 채웁니다. 상대가 블라인드 예약한 카드는 'hidden' 플래그와 tier만 남기고
+나머지를 0으로 가려, 현재 플레이어가 볼 수 없는 정보가 새지 않게 합니다.
+
+레이아웃 (SCHEMA_VERSION = 1, 구간 이름 → FEATURE_SLICES, 총 FEATURE_SIZE = 496)
+    meta        4            마지막 라운드 여부, 인원수 one-hot(2/3/4)
+    bank        6            은행 토큰 (COLORS + gold)
+    deck_sizes  3            tier 1~3 덱 장수
+    players     4 × 16       있음, 토큰 6, 보너스 5, 점수, 구매 카드 수, 귀족 수, 예약 카드 수
+    board       12 × 16      tier 1~3 × 보드 위치 4, 카드 특징
+    reserved    4 × 3 × 16   플레이어 슬롯별 예약 카드 특징
+    nobles      5 × 7        남은 귀족: 있음, 요구 보너스 5, 점수
+
+카드 특징 (CARD_FEATURES = 16)
+    있음, 숨김, tier one-hot 3, 점수, 보너스 색 one-hot 5, 비용 5
+
+값은 정규화하지 않은 원래 개수/점수입니다. 스키마를 바꾸면 SCHEMA_VERSION을 올립니다.
+
+    encoder = FeatureEncoder()
+    buffer = np.empty((len(states), FEATURE_SIZE), dtype=np.float32)
+    encoder.encode_batch(states, out=buffer)
+"""
+import numpy as np
+from .catalog import load_catalog, COLORS
+
+SCHEMA_VERSION = 1
+
+MAX_PLAYERS = 4
+MAX_RESERVED = 3
+MAX_NOBLES = 5
+BOARD_SLOTS = 12
+GEM_COLORS = COLORS + ['gold']
+
+CARD_FEATURES = 16
+NOBLE_FEATURES = 7
+PLAYER_FEATURES = 16
+
+LAYOUT = [
+    ('meta', 4),
+    ('bank', 6),
+    ('deck_sizes', 3),
+    ('players', MAX_PLAYERS * PLAYER_FEATURES),
+    ('board', BOARD_SLOTS * CARD_FEATURES),
+    ('reserved', MAX_PLAYERS * MAX_RESERVED * CARD_FEATURES),
+    ('nobles', MAX_NOBLES * NOBLE_FEATURES),
+]
+
+
+def _slices(layout):
+    slices = {}
+    offset = 0
+    for name, size in layout:
+        slices[name] = slice(offset, offset + size)
+        offset += size
+    return slices, offset
+
+
+FEATURE_SLICES, FEATURE_SIZE = _slices(LAYOUT)
+# 정수로 채우는 앞부분(meta ~ players)과 카드/귀족 표에서 모아 오는 뒷부분의 경계
+_SCALAR_SIZE = FEATURE_SLICES['players'].stop
+_CARD_SLOTS = BOARD_SLOTS + MAX_PLAYERS * MAX_RESERVED
+
+
+class FeatureEncoder:
+    """
+    카탈로그의 카드/귀족 특징을 표로 미리 만들어 두고, 상태에서는 카드/귀족의 표 위치만 뽑아
+    NumPy 인덱싱 한 번으로 모아 씁니다.
+
+    카드 표의 0행은 빈 칸, 1~3행은 tier별 숨은 카드, 그 뒤가 카탈로그 순서의 카드입니다.
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or load_catalog()
+        cards, nobles = self.catalog.cards, self.catalog.nobles
+
+        self.card_index = {card.id: i + 4 for i, card in enumerate(cards)}
+        self.noble_index = {noble.id: i + 1 for i, noble in enumerate(nobles)}
+
+        card_table = np.zeros((len(cards) + 4, CARD_FEATURES), dtype=np.float32)
+        for tier in (1, 2, 3):
+            card_table[tier, 0] = 1
+            card_table[tier, 1] = 1
+            card_table[tier, 1 + tier] = 1
+        for card in cards:
+            row = card_table[self.card_index[card.id]]
+            row[0] = 1
+            row[1 + card.tier] = 1
+            row[5] = card.points
+            row[6 + COLORS.index(card.bonus)] = 1
+            row[11:16] = [card.cost.get(color, 0) for color in COLORS]
+        self.card_table = card_table
+
+        noble_table = np.zeros((len(nobles) + 1, NOBLE_FEATURES), dtype=np.float32)
+        for noble in nobles:
+            row = noble_table[self.noble_index[noble.id]]
+            row[0] = 1
+            row[1:6] = [noble.requirements.get(color, 0) for color in COLORS]
+            row[6] = noble.points
+        self.noble_table = noble_table
+
+    # ==========================================
+    # 인코딩
+    # ==========================================
+    def encode(self, state, out=None):
+        """상태 하나를 (FEATURE_SIZE,) float32 벡터로 인코딩합니다."""
+        if out is None:
+            out = np.empty(FEATURE_SIZE, dtype=np.float32)
+        self.encode_batch((state,), out.reshape(1, FEATURE_SIZE))
+        return out
+
+    def encode_batch(self, states, out=None):
+        """
+        상태 시퀀스를 (N, FEATURE_SIZE) float32 배열에 인코딩합니다.
+        out을 주면 그 버퍼(C 연속, float32, 행 수 N 이상)의 앞 N행에 쓰고 그 부분을 반환합니다.
+        """
+        n = len(states)
+        if out is None:
+            out = np.empty((n, FEATURE_SIZE), dtype=np.float32)
+        elif out.dtype != np.float32 or out.ndim != 2 or out.shape[1] != FEATURE_SIZE or out.shape[0] < n:
+            raise ValueError(f"out은 ({n} 이상, {FEATURE_SIZE}) float32 배열이어야 합니다.")
+        out = out[:n]
+
+        scalars = []
+        card_slots = []
+        noble_slots = []
+        for state in states:
+            row, cards, nobles = self._gather(state)
+            scalars.append(row)
+            card_slots.append(cards)
+            noble_slots.append(nobles)
+
+        out[:, :_SCALAR_SIZE] = scalars
+        out[:, FEATURE_SLICES['board'].start:FEATURE_SLICES['reserved'].stop] = \
+            self.card_table[card_slots].reshape(n, _CARD_SLOTS * CARD_FEATURES)
+        out[:, FEATURE_SLICES['nobles']] = self.noble_table[noble_slots].reshape(n, MAX_NOBLES * NOBLE_FEATURES)
+        return out
+
+    def _gather(self, state):
+        """(정수 특징 리스트, 카드 표 위치 리스트, 귀족 표 위치 리스트)"""
+        card_index = self.card_index
+        num_players = state.num_players
+        current = state.current_player_idx
+        decks = state.decks
+        bank = state.bank
+
+        row = [int(state.is_last_round), num_players == 2, num_players == 3, num_players == 4]
+        row += [bank[color] for color in GEM_COLORS]
+        row += [len(decks[1]), len(decks[2]), len(decks[3])]
+
+        cards = []
+        board = state.board
+        for tier in (1, 2, 3):
+            tier_cards = board[tier]
+            cards += [card_index[c.id] for c in tier_cards]
+            cards += [0] * (4 - len(tier_cards))
+
+        players = state.players
+        for slot in range(MAX_PLAYERS):
+            if slot >= num_players:
+                row += [0] * PLAYER_FEATURES
+                cards += [0] * MAX_RESERVED
+                continue
+            player = players[(current + slot) % num_players]
+            gems, bonuses, reserved = player.gems, player.bonuses, player.reserved
+            row.append(1)
+            row += [gems[color] for color in GEM_COLORS]
+            row += [bonuses[color] for color in COLORS]
+            row += [player.score, len(player.cards), len(player.nobles), len(reserved)]
+
+            hidden = player.blind_reserved if slot else ()
+            for card in reserved:
+                cards.append(card.tier if hidden and card in hidden else card_index[card.id])
+            cards += [0] * (MAX_RESERVED - len(reserved))
+
+        noble_index = self.noble_index
+        nobles = [noble_index[n.id] for n in state.nobles]
+        nobles += [0] * (MAX_NOBLES - len(nobles))
+        return row, cards, nobles
+
+
+def feature_names():
+    """FEATURE_SIZE개 특징의 이름 목록 (디버깅/문서용)"""
+    card = (['present', 'hidden'] + [f'tier{t}' for t in (1, 2, 3)] + ['points']
+            + [f'bonus_{c}' for c in COLORS] + [f'cost_{c}' for c in COLORS])
+    player = (['present'] + [f'gems_{c}' for c in GEM_COLORS] + [f'bonus_{c}' for c in COLORS]
+              + ['score', 'num_cards', 'num_nobles', 'num_reserved'])
+    noble = ['present'] + [f'req_{c}' for c in COLORS] + ['points']
+
+    names = ['last_round', 'players_2', 'players_3', 'players_4']
+    names += [f'bank_{c}' for c in GEM_COLORS]
+    names += [f'deck_tier{t}' for t in (1, 2, 3)]
+    names += [f'player{p}_{f}' for p in range(MAX_PLAYERS) for f in player]
+    names += [f'board_tier{t}_{i}_{f}' for t in (1, 2, 3) for i in range(4) for f in card]
+    names += [f'player{p}_reserved{r}_{f}' for p in range(MAX_PLAYERS) for r in range(MAX_RESERVED) for f in card]
+    names += [f'noble{k}_{f}' for k in range(MAX_NOBLES) for f in noble]
+    return names
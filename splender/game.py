@@ -1,14 +1,40 @@
 import random
 import itertools
+import operator
 from .player import Player
 from .components import Card, Noble
+from .zobrist import zobrist_key
+from .rng import make_rng, copy_rng, fork_rng, export_rng, import_rng
+from .actions import (
+    NUM_ACTIONS, NUM_DISCARDS, PASS, PURCHASE_BOARD, PURCHASE_RESERVED,
+    RESERVE_BLIND, RESERVE_PUBLIC, TAKE_DIFF_INDEX, TAKE_SAME, discard_indices,
+)
 
 COLORS = ['white', 'blue', 'green', 'red', 'black']
+_card_id = operator.attrgetter('id')
 
 class GameState:
-    def __init__(self, num_players=2):
+    # True로 설정하면 매 step() 이후 플레이어 누적 카운터(보너스/점수)를 전수 검사합니다. (디버그용)
+    debug_consistency = False
+    # Zobrist 해시. zobrist_hash()를 처음 호출할 때 계산되고, 그 뒤로는 step()/undo()가 증분 갱신합니다.
+    # (None이면 추적하지 않는 상태라 step()에 추가 비용이 없음)
+    _zobrist = None
+    # 보드 카드 색인 {card_id: (tier, 위치)}과 플레이어별 구매 부족분 캐시. 처음 필요할 때 만들고,
+    # 보드나 해당 플레이어의 토큰/보너스/예약이 바뀌면 버렸다가 다시 만듭니다.
+    _board_index = None
+    _affordability = None
+    # 플레이어별 색별 부족분 캐시 [(그때의 affordability dict, {card_id: 색별 부족분})].
+    # affordability 캐시의 dict가 교체되었으면 다시 만듭니다. (무효화 시점을 따로 관리하지 않음)
+    _needs = None
+    # 셔플과 귀족 동시 충족 시 선택에 쓰는 난수 생성기. 기본값은 전역 random이고,
+    # rng(시드 또는 random.Random)를 주면 이 상태만의 스트림을 씁니다. (splender.rng 참고)
+    rng = random
+
+    def __init__(self, num_players=2, rng=None):
         assert 2 <= num_players <= 4, "플레이어 수는 2~4명이어야 합니다."
         self.num_players = num_players
+        if rng is not None:
+            self.rng = make_rng(rng)
         
         # 1. 보석 세팅 (인원수에 따라 다름)
         gem_counts = {2: 4, 3: 5, 4: 7}[num_players]
@@ -53,20 +79,22 @@ class GameState:
         self.is_last_round = False
         self.is_game_over = False
         self.winner = None
+        self._zobrist = None
+        self.invalidate_caches()
 
         # --- 카드 분류 및 셔플 ---
         for card in all_cards:
             self.decks[card.tier].append(card)
             
         for tier in self.decks:
-            random.shuffle(self.decks[tier])
+            self.rng.shuffle(self.decks[tier])
             for _ in range(4):
                 if self.decks[tier]:
                     self.board[tier].append(self.decks[tier].pop())
                     
         # --- 귀족 셔플 및 세팅 (인원수 + 1) ---
         nobles_copy = list(all_nobles)
-        random.shuffle(nobles_copy)
+        self.rng.shuffle(nobles_copy)
         self.nobles = nobles_copy[:self.num_players + 1]
 
     # ==========================================
@@ -86,11 +114,22 @@ class GameState:
         if self.is_game_over:
             raise RuntimeError("게임이 이미 종료되었습니다.")
 
-        player = self.players[self.current_player_idx]
+        player_idx = self.current_player_idx
+        player = self.players[player_idx]
         step_info = {"game_over": False, "winner": None, "noble_gained": None}
 
+        hashed = self._zobrist is not None
+        if hashed:
+            tier = action.get('tier')
+            hash_snapshot = (
+                self.bank.copy(), player.gems.copy(), len(player.cards), list(player.reserved),
+                tier, list(self.board[tier]) if tier is not None else None, self.is_last_round,
+            )
+
         # [1단계] 메인 액션 수행
         self._execute_main_action(player, action)
+        if self._affordability is not None:
+            self._affordability[player_idx] = None  # 토큰/보너스/예약이 바뀜
         
         # [2단계] 토큰 상한 처리
         total_gems = sum(player.gems.values())
@@ -102,9 +141,16 @@ class GameState:
 
         # [3단계] 귀족 방문 체크
         # 2명 이상 동시 충족 시 무작위로 1명 선택 (전략적 선택은 에이전트 고도화 시 확장 예정)
+        # action에 'noble'(귀족 id)이 있으면 그 귀족을 선택 (기보 재생용, 난수 소비 없음)
         eligible_nobles = self._get_eligible_nobles(player)
         if eligible_nobles:
-            chosen_noble = random.choice(eligible_nobles)
+            noble_id = action.get('noble')
+            if noble_id is None:
+                chosen_noble = self.rng.choice(eligible_nobles)
+            else:
+                chosen_noble = next((n for n in eligible_nobles if n.id == noble_id), None)
+                if chosen_noble is None:
+                    raise ValueError(f"귀족 {noble_id}의 방문 조건을 만족하지 않습니다.")
             player.nobles.append(chosen_noble)
             player.score += chosen_noble.points
             self.nobles.remove(chosen_noble)
@@ -125,8 +171,78 @@ class GameState:
             step_info["game_over"] = True
             step_info["winner"] = self.winner
 
+        if hashed:
+            self._update_zobrist(player_idx, hash_snapshot, step_info["noble_gained"])
+
+        if self.debug_consistency:
+            player.check_consistency()
+            if hashed and self._zobrist != self._compute_zobrist():
+                raise RuntimeError("Zobrist 해시가 상태와 일치하지 않습니다.")
+
         return step_info
 
+    def apply(self, action):
+        """
+        step()과 동일하게 action을 실행하되, undo()로 되돌릴 수 있는 기록을 반환합니다.
+        트리 탐색에서 상태를 복제/직렬화하지 않고 한 상태를 내려갔다 올라올 때 사용합니다.
+
+        Returns:
+            tuple: undo()에 그대로 넘길 되돌리기 기록
+        """
+        player_idx = self.current_player_idx
+        player = self.players[player_idx]
+
+        # 이번 턴에 건드릴 수 있는 보드/덱은 액션의 tier 하나뿐입니다.
+        # (덱에서는 최대 1장만 뽑히므로 길이와 맨 위 카드만 기억하면 충분)
+        tier = action.get('tier')
+        if tier is not None:
+            deck = self.decks[tier]
+            board_snapshot = list(self.board[tier])
+            deck_len = len(deck)
+            deck_top = deck[-1] if deck else None
+        else:
+            board_snapshot = deck_len = deck_top = None
+
+        record = (
+            player_idx, self.bank.copy(),
+            player.gems.copy(), player.bonuses.copy(), player.score,
+            len(player.cards), list(player.reserved), list(player.blind_reserved), len(player.nobles),
+            list(self.nobles), tier, board_snapshot, deck_len, deck_top,
+            self.is_last_round, self.is_game_over, self.winner, self._zobrist,
+        )
+        self.step(action)
+        return record
+
+    def undo(self, record):
+        """apply()가 반환한 기록으로 해당 step()을 제자리에서 되돌립니다. (역순으로 호출해야 함)"""
+        (player_idx, bank, gems, bonuses, score, num_cards, reserved, blind_reserved, num_nobles,
+         nobles, tier, board_snapshot, deck_len, deck_top,
+         is_last_round, is_game_over, winner, zobrist) = record
+
+        player = self.players[player_idx]
+        player.gems = gems
+        player.bonuses = bonuses
+        player.score = score
+        del player.cards[num_cards:]
+        player.reserved = reserved
+        player.blind_reserved = blind_reserved
+        del player.nobles[num_nobles:]
+
+        self.bank = bank
+        self.nobles = nobles
+        if tier is not None:
+            self.board[tier] = board_snapshot
+            if len(self.decks[tier]) < deck_len:
+                self.decks[tier].append(deck_top)
+
+        self.current_player_idx = player_idx
+        self.is_last_round = is_last_round
+        self.is_game_over = is_game_over
+        self.winner = winner
+        self._zobrist = zobrist
+        self._board_index = None
+        self._affordability = None
+
     def _determine_winner(self):
         """
         게임 종료 시 승자를 결정합니다.
@@ -156,8 +272,7 @@ class GameState:
             
         elif action_type == 'reserve_public':
             tier, card_id = action['tier'], action['card_id']
-            card = next(c for c in self.board[tier] if c.id == card_id)
-            self.board[tier].remove(card)
+            card = self._take_board_card(tier, card_id)
             player.reserved.append(card)
             self._replenish_board(tier)
             self._take_gold_if_available(player)
@@ -168,6 +283,7 @@ class GameState:
                 raise ValueError(f"Tier {tier} 덱이 비어있어 블라인드 예약을 할 수 없습니다.")
             card = self.decks[tier].pop()
             player.reserved.append(card)
+            player.blind_reserved.append(card)
             self._take_gold_if_available(player)
             
         elif action_type == 'purchase':
@@ -175,20 +291,22 @@ class GameState:
             source = action['source']
             
             if source == 'board':
-                card = next(c for c in self.board[tier] if c.id == card_id)
-                self.board[tier].remove(card)
+                card = self._take_board_card(tier, card_id)
                 self._replenish_board(tier)
             else:  # 'reserved'
                 card = next(c for c in player.reserved if c.id == card_id)
                 player.reserved.remove(card)
+                if card in player.blind_reserved:
+                    player.blind_reserved.remove(card)  # 구매하면 공개됨
             
             # 토큰 지불 (pay_for_card는 토큰 차감만 담당)
             paid = player.pay_for_card(card)
             for color, amount in paid.items():
                 self.bank[color] += amount
 
-            # 카드 획득 및 점수 갱신은 GameState가 담당
+            # 카드 획득 및 점수/보너스 갱신은 GameState가 담당
             player.cards.append(card)
+            player.bonuses[card.bonus] += 1
             player.score += card.points
                 
         elif action_type == 'pass':
@@ -197,6 +315,16 @@ class GameState:
     # ==========================================
     # 보조 로직들
     # ==========================================
+    def _take_board_card(self, tier, card_id):
+        """보드에서 카드를 빼냅니다. (색인으로 위치를 찾고, 보드가 바뀌었으므로 캐시를 무효화)"""
+        found_tier, pos = self._get_board_index().get(card_id, (None, None))
+        if found_tier != tier:
+            raise ValueError(f"Tier {tier} 보드에 카드 {card_id}가 없습니다.")
+        card = self.board[tier].pop(pos)
+        self._board_index = None
+        self._affordability = None
+        return card
+
     def _replenish_board(self, tier):
         """빈 자리에 덱에서 카드를 뽑아 채웁니다."""
         if self.decks[tier]:
@@ -227,27 +355,137 @@ class GameState:
     # ==========================================
     # 유효한 행동 리스트 생성
     # ==========================================
-    def get_legal_actions(self):
-        """현재 턴의 플레이어가 할 수 있는 모든 유효한 행동 리스트를 반환합니다."""
-        legal_actions = []
+    def get_legal_actions(self, dedupe=False):
+        """
+        현재 턴의 플레이어가 할 수 있는 모든 유효한 행동 리스트를 반환합니다.
+
+        Args:
+            dedupe: True면 토큰 순효과(가져온 토큰 - 버린 토큰)가 같은 보석 가져오기 액션을
+                    하나만 남깁니다. (예: 흰색을 가져와 흰색을 버리는 조합은 모두 같은 결과)
+        """
+        return list(self.iter_legal_actions(dedupe))
+
+    def iter_legal_actions(self, dedupe=False):
+        """
+        get_legal_actions()와 같은 순서로 유효한 행동을 하나씩 생성합니다. (지연 생성)
+        앞쪽 일부만 살펴보는 에이전트는 전체 리스트와 디스카드 딕셔너리를 만들지 않아도 됩니다.
+        """
+        seen = set() if dedupe else None
+        empty = True
+
+        for base_action, temp_gems, discard_count, _ in self._iter_action_groups():
+            is_take = seen is not None and base_action['type'] in ('take_diff', 'take_same')
+
+            if discard_count <= 0:
+                if is_take:
+                    net = tuple(temp_gems.values())
+                    if net in seen:
+                        continue
+                    seen.add(net)
+                empty = False
+                yield base_action
+                continue
+
+            for discard_dict in self._generate_discard_combos(temp_gems, discard_count):
+                if is_take:
+                    net = tuple(n - discard_dict[c] for c, n in temp_gems.items())
+                    if net in seen:
+                        continue
+                    seen.add(net)
+                new_action = base_action.copy()
+                new_action['discard'] = discard_dict
+                empty = False
+                yield new_action
+
+        # 액션 E: 패스 (아무것도 할 수 없을 때만)
+        if empty:
+            yield {'type': 'pass'}
+
+    def count_legal_actions(self):
+        """get_legal_actions()의 길이를 디스카드 딕셔너리를 만들지 않고 계산합니다."""
+        total = 0
+        for _, temp_gems, discard_count, _ in self._iter_action_groups():
+            total += 1 if discard_count <= 0 else self._count_discard_combos(temp_gems, discard_count)
+        return max(total, 1)
+
+    def sample_legal_action(self, rng=None):
+        """
+        get_legal_actions() 전체를 만들지 않고 유효한 행동 하나를 균등하게 뽑습니다. (rng가 없으면 self.rng)
+        rng.choice(get_legal_actions())와 난수 소비가 같으므로 같은 시드에서 같은 행동을 고릅니다.
+        """
+        if rng is None:
+            rng = self.rng
+        groups = []
+        total = 0
+        for group in self._iter_action_groups():
+            _, temp_gems, discard_count, _ = group
+            count = 1 if discard_count <= 0 else self._count_discard_combos(temp_gems, discard_count)
+            groups.append((count, group))
+            total += count
+
+        k = rng.randrange(max(total, 1))
+        if total == 0:
+            return {'type': 'pass'}
+
+        for count, (base_action, temp_gems, discard_count, _) in groups:
+            if k >= count:
+                k -= count
+                continue
+            if discard_count <= 0:
+                return base_action
+            new_action = base_action.copy()
+            new_action['discard'] = self._nth_discard_combo(temp_gems, discard_count, k)
+            return new_action
+
+    def legal_action_ids(self):
+        """
+        유효한 행동을 고정 액션 인덱스(splender.actions 참고) 리스트로 반환합니다.
+        순서는 get_legal_actions()와 같으며, 액션 딕셔너리를 만들지 않습니다.
+        """
+        ids = []
+        for _, temp_gems, discard_count, main in self._iter_action_groups():
+            base_id = main * NUM_DISCARDS
+            if discard_count <= 0:
+                ids.append(base_id)
+            else:
+                ids.extend(base_id + d for d in discard_indices(tuple(temp_gems.values()), discard_count))
+        if not ids:
+            ids.append(PASS * NUM_DISCARDS)
+        return ids
+
+    def legal_action_mask(self):
+        """길이 NUM_ACTIONS의 bytearray로 유효한 고정 액션 인덱스 위치만 1로 표시합니다."""
+        mask = bytearray(NUM_ACTIONS)
+        for action_id in self.legal_action_ids():
+            mask[action_id] = 1
+        return mask
+
+    def _iter_action_groups(self):
+        """
+        패스를 제외한 행동을 (기본 액션, 행동 후 토큰 상태, 버려야 할 토큰 수, 메인 액션 인덱스)
+        묶음으로 생성합니다.
+        버릴 토큰 수가 0 이하이면 기본 액션 하나, 아니면 디스카드 조합마다 액션 하나가 됩니다.
+        """
         player = self.players[self.current_player_idx]
 
         # --------------------------------------------------
         # [1] 액션 D: 카드 구매
         # --------------------------------------------------
+        shortfall = self.affordability()
+        gold = player.gems['gold']
         for tier, cards in self.board.items():
-            for card in cards:
-                if player.can_buy(card):
-                    legal_actions.append({
+            for pos, card in enumerate(cards):
+                if shortfall[card.id] <= gold:
+                    yield {
                         'type': 'purchase', 'tier': tier,
                         'card_id': card.id, 'source': 'board'
-                    })
-        for card in player.reserved:
-            if player.can_buy(card):
-                legal_actions.append({
+                    }, None, 0, PURCHASE_BOARD + (tier - 1) * 4 + pos
+        for pos, card in enumerate(player.reserved):
+            if shortfall[card.id] <= gold:
+                yield {
                     'type': 'purchase', 'tier': card.tier,
                     'card_id': card.id, 'source': 'reserved'
-                })
+                }, None, 0, PURCHASE_RESERVED + pos
 
         # --------------------------------------------------
         # [2] 액션 C: 카드 예약 (예약 슬롯 3장 미만일 때만)
@@ -256,47 +494,35 @@ class GameState:
         if len(player.reserved) < 3:
             # 예약 시 황금 토큰을 받을지 여부
             gains_gold = self.bank['gold'] > 0
-            
+
             for tier, cards in self.board.items():
-                for card in cards:
+                for pos, card in enumerate(cards):
                     base = {'type': 'reserve_public', 'tier': tier, 'card_id': card.id}
-                    legal_actions.extend(
-                        self._build_reserve_actions_with_discard(player, base, gains_gold)
-                    )
+                    yield self._build_reserve_action_group(
+                        player, base, gains_gold) + (RESERVE_PUBLIC + (tier - 1) * 4 + pos,)
             for tier, deck in self.decks.items():
                 if len(deck) > 0:
                     base = {'type': 'reserve_blind', 'tier': tier}
-                    legal_actions.extend(
-                        self._build_reserve_actions_with_discard(player, base, gains_gold)
-                    )
+                    yield self._build_reserve_action_group(
+                        player, base, gains_gold) + (RESERVE_BLIND + tier - 1,)
 
         # --------------------------------------------------
         # [3] 액션 A & B: 보석 가져오기
         # --------------------------------------------------
         available_colors = [c for c in COLORS if self.bank[c] > 0]
-        
+
         # 액션 A: 서로 다른 색 1~3개 가져오기
         max_take = min(3, len(available_colors))
         for i in range(1, max_take + 1):
             for combo in itertools.combinations(available_colors, i):
-                legal_actions.extend(
-                    self._build_take_actions_with_discard(player, 'take_diff', list(combo))
-                )
+                yield self._build_take_action_group(
+                    player, 'take_diff', list(combo)) + (TAKE_DIFF_INDEX[combo],)
 
         # 액션 B: 같은 색 2개 가져오기 (은행에 4개 이상일 때만)
-        for color in COLORS:
+        for color_idx, color in enumerate(COLORS):
             if self.bank[color] >= 4:
-                legal_actions.extend(
-                    self._build_take_actions_with_discard(player, 'take_same', color)
-                )
-
-        # --------------------------------------------------
-        # [4] 액션 E: 패스
-        # --------------------------------------------------
-        if not legal_actions:
-            legal_actions.append({'type': 'pass'})
-
-        return legal_actions
+                yield self._build_take_action_group(
+                    player, 'take_same', color) + (TAKE_SAME + color_idx,)
 
     # ==========================================
     # DFS 기반 디스카드 조합 생성 (조합 폭발 해결)
@@ -339,36 +565,61 @@ class GameState:
         
         yield from dfs(0, discard_count, [])
 
-    def _build_reserve_actions_with_discard(self, player, base_action, gains_gold):
+    @staticmethod
+    def _count_discard_combos(gems_available, discard_count):
+        """_generate_discard_combos()가 생성할 조합의 개수를 DP로 계산합니다."""
+        # ways[r] = 지금까지 본 색상들에서 r개를 버리는 방법 수
+        ways = [1] + [0] * discard_count
+        for have in gems_available.values():
+            if have <= 0:
+                continue
+            ways = [
+                sum(ways[r - n] for n in range(min(have, r) + 1))
+                for r in range(discard_count + 1)
+            ]
+        return ways[discard_count]
+
+    @classmethod
+    def _nth_discard_combo(cls, gems_available, discard_count, k):
+        """_generate_discard_combos()가 k번째(0부터)로 생성할 조합을 바로 계산합니다."""
+        all_colors = ['white', 'blue', 'green', 'red', 'black', 'gold']
+        active_colors = [c for c in all_colors if gems_available.get(c, 0) > 0]
+        result = {c: 0 for c in all_colors}
+        remaining = discard_count
+
+        for idx, color in enumerate(active_colors):
+            if remaining == 0:
+                break
+            rest = {c: gems_available[c] for c in active_colors[idx + 1:]}
+            # DFS와 같은 순서(0개 → max개)로, k가 속한 가지를 찾을 때까지 건너뜀
+            for n in range(min(gems_available[color], remaining) + 1):
+                ways = cls._count_discard_combos(rest, remaining - n)
+                if k < ways:
+                    break
+                k -= ways
+            result[color] = n
+            remaining -= n
+        return result
+
+    def _build_reserve_action_group(self, player, base_action, gains_gold):
         """
         예약 액션에서 황금 토큰을 받아 10개를 초과할 경우
-        디스카드 조합을 붙여 반환합니다.
+        디스카드 조합 생성에 필요한 정보를 묶어 반환합니다.
         """
         if not gains_gold:
-            return [base_action]
+            return base_action, None, 0
         
         temp_gems = player.gems.copy()
         temp_gems['gold'] += 1
         total = sum(temp_gems.values())
         discard_count = total - 10
-        
-        if discard_count <= 0:
-            return [base_action]
-        
-        actions = []
-        for discard_dict in self._generate_discard_combos(temp_gems, discard_count):
-            new_action = base_action.copy()
-            new_action['discard'] = discard_dict
-            actions.append(new_action)
-        return actions
+        return base_action, temp_gems, discard_count
 
-    def _build_take_actions_with_discard(self, player, action_type, take_data):
+    def _build_take_action_group(self, player, action_type, take_data):
         """
-        토큰을 가져왔을 때 10개가 넘으면, DFS로 유효한 디스카드 조합을 생성하여
-        각각을 독립된 액션으로 반환합니다.
+        토큰을 가져왔을 때의 인벤토리와 버려야 할 토큰 수를 기본 액션과 묶어 반환합니다.
+        10개가 넘으면 DFS로 유효한 디스카드 조합을 붙여 각각 독립된 액션이 됩니다.
         """
-        actions = []
-        
         # 가상으로 토큰을 받았을 때의 인벤토리 상태 계산
         temp_gems = player.gems.copy()
         if action_type == 'take_diff':
@@ -387,25 +638,216 @@ class GameState:
         else:
             base_action['color'] = take_data
 
-        if discard_count <= 0:
-            actions.append(base_action)
-        else:
-            for discard_dict in self._generate_discard_combos(temp_gems, discard_count):
-                new_action = base_action.copy()
-                new_action['discard'] = discard_dict
-                actions.append(new_action)
-                
-        return actions
+        return base_action, temp_gems, discard_count
 
     # ==========================================
-    # 상태 직렬화 / 역직렬화
+    # 보드 색인 / 구매 가능 여부 캐시
     # ==========================================
-    def export_state(self):
+    def _get_board_index(self):
+        if self._board_index is None:
+            self._board_index = {
+                card.id: (tier, pos)
+                for tier, cards in self.board.items() for pos, card in enumerate(cards)
+            }
+        return self._board_index
+
+    def board_position(self, card_id):
+        """보드 위 카드의 (tier, 위치). 보드에 없으면 None."""
+        return self._get_board_index().get(card_id)
+
+    def board_card(self, card_id):
+        """id로 보드 위 카드를 찾습니다. 보드에 없으면 KeyError."""
+        tier, pos = self._get_board_index()[card_id]
+        return self.board[tier][pos]
+
+    def affordability(self, player_idx=None):
+        """
+        player_idx(기본: 현재 차례) 플레이어가 보드 카드와 자신의 예약 카드를 살 때 일반 토큰으로 모자란 개수.
+        {card_id: 부족분}이며, 부족분이 황금 토큰 수 이하이면 구매할 수 있습니다.
+        """
+        if player_idx is None:
+            player_idx = self.current_player_idx
+        cache = self._affordability
+        if cache is None:
+            cache = self._affordability = [None] * self.num_players
+
+        shortfall = cache[player_idx]
+        if shortfall is None:
+            player = self.players[player_idx]
+            shortfall = {card.id: player.shortfall(card) for cards in self.board.values() for card in cards}
+            for card in player.reserved:
+                shortfall[card.id] = player.shortfall(card)
+            cache[player_idx] = shortfall
+        return shortfall
+
+    def card_needs(self, player_idx=None):
+        """
+        affordability()의 색별 내역: {card_id: COLORS 순서로 더 필요한 일반 토큰 수 튜플}.
+        합이 황금 토큰 수 이하이면 구매할 수 있습니다. 새로 계산할 때는 affordability() 캐시도 함께 채웁니다.
+        """
+        if player_idx is None:
+            player_idx = self.current_player_idx
+        shortfall_cache = self._affordability
+        if shortfall_cache is None:
+            shortfall_cache = self._affordability = [None] * self.num_players
+        cache = self._needs
+        if cache is None:
+            cache = self._needs = [None] * self.num_players
+
+        shortfall = shortfall_cache[player_idx]
+        entry = cache[player_idx]
+        if entry is None or shortfall is None or entry[0] is not shortfall:
+            player = self.players[player_idx]
+            needs = {card.id: player.needs(card) for cards in self.board.values() for card in cards}
+            for card in player.reserved:
+                needs[card.id] = player.needs(card)
+            if shortfall is None:
+                shortfall = shortfall_cache[player_idx] = {card_id: sum(n) for card_id, n in needs.items()}
+            entry = cache[player_idx] = (shortfall, needs)
+        return entry[1]
+
+    def invalidate_caches(self):
+        """보드/플레이어 필드를 step() 밖에서 직접 고쳤을 때 색인과 구매 캐시를 버립니다."""
+        self._board_index = None
+        self._affordability = None
+
+    # ==========================================
+    # Zobrist 해시 (전치 탐지용)
+    # ==========================================
+    def zobrist_hash(self):
+        """
+        은행, 플레이어 토큰/카드/예약/귀족, 보드, 남은 귀족, 현재 차례를 반영한 64비트 해시.
+        덱은 보드와 보유 카드로 결정되므로 포함하지 않습니다.
+        """
+        if self._zobrist is None:
+            self._zobrist = self._compute_zobrist()
+        return self._zobrist
+
+    def invalidate_hash(self):
+        """해시 추적을 끕니다. (롤아웃처럼 해시가 필요 없는 사본, 또는 필드를 직접 고친 뒤 호출)"""
+        self._zobrist = None
+
+    def _compute_zobrist(self):
+        h = zobrist_key('turn', self.current_player_idx)
+        if self.is_last_round:
+            h ^= zobrist_key('last_round')
+        for color, count in self.bank.items():
+            h ^= zobrist_key('bank', color, count)
+        for tier in self.board:
+            for card in self.board[tier]:
+                h ^= zobrist_key('board', card.id)
+        for noble in self.nobles:
+            h ^= zobrist_key('noble', noble.id)
+
+        for p, player in enumerate(self.players):
+            for color, count in player.gems.items():
+                h ^= zobrist_key('gems', p, color, count)
+            for card in player.cards:
+                h ^= zobrist_key('card', p, card.id)
+            for card in player.reserved:
+                h ^= zobrist_key('reserved', p, card.id)
+            for noble in player.nobles:
+                h ^= zobrist_key('player_noble', p, noble.id)
+        return h
+
+    def _update_zobrist(self, player_idx, snapshot, noble):
+        """step() 전후에 바뀐 구성 요소의 키만 XOR하여 해시를 갱신합니다."""
+        bank, gems, num_cards, reserved, tier, board, is_last_round = snapshot
+        player = self.players[player_idx]
+        h = self._zobrist ^ zobrist_key('turn', player_idx) ^ zobrist_key('turn', self.current_player_idx)
+
+        if is_last_round != self.is_last_round:
+            h ^= zobrist_key('last_round')
+        for color, count in self.bank.items():
+            if bank[color] != count:
+                h ^= zobrist_key('bank', color, bank[color]) ^ zobrist_key('bank', color, count)
+        for color, count in player.gems.items():
+            if gems[color] != count:
+                h ^= zobrist_key('gems', player_idx, color, gems[color]) ^ zobrist_key('gems', player_idx, color, count)
+
+        for card in player.cards[num_cards:]:
+            h ^= zobrist_key('card', player_idx, card.id)
+        if reserved != player.reserved:
+            for card in set(reserved).symmetric_difference(player.reserved):
+                h ^= zobrist_key('reserved', player_idx, card.id)
+        if tier is not None:
+            for card in set(board).symmetric_difference(self.board[tier]):
+                h ^= zobrist_key('board', card.id)
+        if noble is not None:
+            h ^= zobrist_key('noble', noble.id) ^ zobrist_key('player_noble', player_idx, noble.id)
+
+        self._zobrist = h
+
+    # ==========================================
+    # 결정화 (정보 집합 탐색용)
+    # ==========================================
+    def determinize(self, observer_idx, rng=None):
+        """
+        observer_idx 플레이어가 알 수 없는 정보(덱 순서, 다른 플레이어의 블라인드 예약 카드)를
+        tier별로 보이지 않는 카드들끼리 다시 섞어 배치합니다. 복제 없이 제자리에서 바꿉니다. (rng가 없으면 self.rng)
+        """
+        rng = rng or self.rng
+        for tier in (1, 2, 3):
+            pool = self.decks[tier]
+            slots = [(player, card) for player in self.players if player.id != observer_idx
+                     for card in player.blind_reserved if card.tier == tier]
+            pool.extend(card for _, card in slots)
+            pool.sort(key=_card_id)  # 결과가 실제 숨은 배치에 의존하지 않도록 정렬 후 섞음
+            rng.shuffle(pool)
+
+            for player, old in slots:
+                new = pool.pop()
+                if new is old:
+                    continue
+                player.reserved[player.reserved.index(old)] = new
+                player.blind_reserved[player.blind_reserved.index(old)] = new
+                if self._affordability is not None:
+                    self._affordability[player.id] = None
+                if self._zobrist is not None:
+                    self._zobrist ^= zobrist_key('reserved', player.id, old.id) ^ zobrist_key('reserved', player.id, new.id)
+
+    # ==========================================
+    # 상태 복제 / 직렬화 / 역직렬화
+    # ==========================================
+    def clone(self, rng=None):
+        """
+        export_state()/import_state() 왕복 없이 게임 상태를 복제합니다.
+        Card/Noble 객체는 공유하고, 가변 컨테이너(은행, 덱/보드 리스트, 플레이어)만 복사합니다.
+        rng를 주면 사본이 그 난수 생성기를 쓰고, 아니면 원본 난수 상태의 사본을 이어받습니다.
+        """
+        gs = self.__class__.__new__(self.__class__)
+        gs.num_players = self.num_players
+        gs.bank = self.bank.copy()
+        gs.players = [p.clone() for p in self.players]
+        gs.current_player_idx = self.current_player_idx
+        gs.decks = {t: list(cards) for t, cards in self.decks.items()}
+        gs.board = {t: list(cards) for t, cards in self.board.items()}
+        gs.nobles = list(self.nobles)
+        gs.is_last_round = self.is_last_round
+        gs.is_game_over = self.is_game_over
+        gs.winner = gs.players[self.winner.id] if self.winner is not None else None
+        gs._zobrist = self._zobrist
+        # 색인/캐시 안의 dict는 교체만 되고 수정되지 않으므로 공유해도 안전
+        gs._board_index = self._board_index
+        gs._affordability = list(self._affordability) if self._affordability is not None else None
+        gs._needs = list(self._needs) if self._needs is not None else None
+        if rng is not None:
+            gs.rng = rng
+        elif self.rng is not random:
+            gs.rng = copy_rng(self.rng)
+        return gs
+
+    def fork(self):
+        """원본 난수에서 뽑은 시드로 독립 스트림을 가진 사본 (롤아웃용. 전역 random이면 그대로 공유)"""
+        return self.clone(rng=fork_rng(self.rng))
+
+    def export_state(self, include_rng=True):
         """
         현재 게임 상태를 JSON-safe 딕셔너리로 내보냅니다.
         (내부 int 키 → 문자열 키로 변환)
+        상태 전용 난수 생성기가 있으면 include_rng=False가 아닌 한 그 상태도 'rng'로 담습니다.
         """
-        return {
+        data = {
             "num_players": self.num_players,
             "bank": self.bank.copy(),
             "current_player_idx": self.current_player_idx,
@@ -416,6 +858,9 @@ class GameState:
             "is_last_round": self.is_last_round,
             "is_game_over": self.is_game_over,
         }
+        if include_rng and self.rng is not random:
+            data["rng"] = export_rng(self.rng)
+        return data
 
     @classmethod
     def import_state(cls, data):
@@ -448,5 +893,7 @@ class GameState:
         
         if gs.is_game_over:
             gs.winner = gs._determine_winner()
+        if data.get("rng") is not None:
+            gs.rng = import_rng(data["rng"])
         
         return gs
@@ -1,5 +1,7 @@
 from .components import Card, Noble
 
+_COLOR_INDEX = {'white': 0, 'blue': 1, 'green': 2, 'red': 3, 'black': 4}
+
 class Player:
     def __init__(self, player_id, name=None):
         self.id = player_id
@@ -9,26 +11,54 @@ class Player:
         self.gems = {'white': 0, 'blue': 0, 'green': 0, 'red': 0, 'black': 0, 'gold': 0}
         self.cards = []      # 구매한 카드 리스트
         self.reserved = []   # 예약한 카드 리스트
+        self.blind_reserved = []  # reserved 중 덱에서 블라인드로 예약해 다른 플레이어가 모르는 카드
         self.nobles = []     # 획득한 귀족 타일 리스트
         self.score = 0       # 현재 점수
 
+        # 구매한 카드들로부터 얻는 색상별 할인(보너스) 총합
+        # 매번 cards를 순회하지 않도록 카드 구매 시 GameState.step()이 누적 갱신합니다.
+        self.bonuses = {'white': 0, 'blue': 0, 'green': 0, 'red': 0, 'black': 0}
+
     def __repr__(self):
         return f"<Player {self.id}: {self.score}pts, {sum(self.gems.values())} gems>"
 
-    @property
-    def bonuses(self):
-        """구매한 카드들로부터 얻는 색상별 할인(보너스) 총합을 계산합니다."""
+    def recompute_bonuses(self):
+        """구매한 카드 목록으로부터 보너스 카운터를 처음부터 다시 계산합니다."""
         bonus_counts = {'white': 0, 'blue': 0, 'green': 0, 'red': 0, 'black': 0}
         for card in self.cards:
             bonus_counts[card.bonus] += 1
+        self.bonuses = bonus_counts
         return bonus_counts
 
+    def check_consistency(self):
+        """
+        누적 카운터(보너스, 점수)가 보유 카드/귀족과 일치하는지 검사합니다. (디버그용)
+        불일치 시 RuntimeError를 발생시킵니다.
+        """
+        expected_bonuses = {'white': 0, 'blue': 0, 'green': 0, 'red': 0, 'black': 0}
+        for card in self.cards:
+            expected_bonuses[card.bonus] += 1
+        if self.bonuses != expected_bonuses:
+            raise RuntimeError(
+                f"{self.name}: 보너스 카운터 불일치 {self.bonuses} != {expected_bonuses}"
+            )
+
+        expected_score = sum(c.points for c in self.cards) + sum(n.points for n in self.nobles)
+        if self.score != expected_score:
+            raise RuntimeError(
+                f"{self.name}: 점수 카운터 불일치 {self.score} != {expected_score}"
+            )
+
     def can_buy(self, card):
         """
         이 카드를 구매할 수 있는지(True/False) 판단합니다.
         로직: 카드 비용 - 보유 보너스 = 부족한 비용. 
         부족한 비용을 보유 보석으로 메우고, 그래도 부족하면 황금 토큰으로 충당 가능한지 확인.
         """
+        return self.shortfall(card) <= self.gems['gold']
+
+    def shortfall(self, card):
+        """보너스와 일반 토큰으로 내고도 모자라 황금 토큰으로 메워야 하는 개수"""
         missing_gems = 0
         current_bonuses = self.bonuses
 
@@ -38,8 +68,18 @@ class Player:
             cost_after_bonus = max(0, cost - current_bonuses.get(color, 0))
             if self.gems[color] < cost_after_bonus:
                 missing_gems += (cost_after_bonus - self.gems[color])
-        
-        return missing_gems <= self.gems['gold']
+
+        return missing_gems
+
+    def needs(self, card):
+        """shortfall()의 색별 내역: 보너스와 보유 토큰을 빼고 색마다 더 필요한 일반 토큰 수 (COLORS 순서 튜플)"""
+        bonuses, gems = self.bonuses, self.gems
+        missing = [0, 0, 0, 0, 0]
+        for color, cost in card.cost.items():
+            short = cost - bonuses[color] - gems[color]
+            if short > 0:
+                missing[_COLOR_INDEX[color]] = short
+        return tuple(missing)
 
     def pay_for_card(self, card):
         """
@@ -72,6 +112,23 @@ class Player:
 
         return paid_tokens
 
+    def clone(self):
+        """
+        가변 컨테이너(gems, bonuses, 카드/귀족 리스트)만 복사한 사본을 반환합니다.
+        Card/Noble 객체는 불변으로 취급하여 원본과 공유합니다.
+        """
+        player = self.__class__.__new__(self.__class__)
+        player.id = self.id
+        player.name = self.name
+        player.gems = self.gems.copy()
+        player.cards = list(self.cards)
+        player.reserved = list(self.reserved)
+        player.blind_reserved = list(self.blind_reserved)
+        player.nobles = list(self.nobles)
+        player.score = self.score
+        player.bonuses = self.bonuses.copy()
+        return player
+
     def to_dict(self):
         """플레이어 상태를 딕셔너리로 내보냅니다 (시뮬레이션 저장용)."""
         return {
@@ -80,6 +137,7 @@ class Player:
             "gems": self.gems.copy(),
             "cards": [c.to_dict() for c in self.cards],
             "reserved": [c.to_dict() for c in self.reserved],
+            "blind_reserved": [c.id for c in self.blind_reserved],
             "nobles": [n.to_dict() for n in self.nobles],
             "score": self.score
         }
@@ -91,6 +149,9 @@ class Player:
         player.gems = data["gems"].copy()  # 얕은 복사 필수 (MCTS 시뮬레이션 시 원본 오염 방지)
         player.cards = [Card.from_dict(c) for c in data["cards"]]
         player.reserved = [Card.from_dict(c) for c in data["reserved"]]
+        blind_ids = set(data.get("blind_reserved", ()))
+        player.blind_reserved = [c for c in player.reserved if c.id in blind_ids]
         player.nobles = [Noble.from_dict(n) for n in data["nobles"]]
         player.score = data["score"]
+        player.recompute_bonuses()
         return player
@@ -0,0 +1,299 @@
+"""
+압축 기보 포맷: 대량의 셀프플레이 게임을 작은 용량으로 저장하고 임의의 턴까지 재생합니다.
+
+파일 구조 (모든 정수는 little-endian)
+    파일 헤더  : MAGIC(8) | 카탈로그 지문 uint32
+    청크 반복  : CHUNK_MAGIC(4) | 게임 수 uint32 | 페이로드 바이트 수 uint32 | 게임 기록들
+
+게임 기록
+    uint8 플레이어 수
+    tier 1~3 각각: uint8 보드 장수, uint8 덱 장수, 보드 카드 인덱스들, 덱 카드 인덱스들 (덱은 리스트 순서)
+    uint8 귀족 수, 귀족 인덱스들
+    uint16 행동 수, uint16 행동 코드들
+
+카드/귀족 인덱스는 카탈로그 순서 기준이며, 행동 코드는 다음과 같습니다.
+    code = noble_slot * NUM_ACTIONS + action_id   (noble_slot: 귀족을 얻은 턴이면 state.nobles 위치 + 1, 아니면 0)
+
+파일은 추가 전용이며 청크 단위로 기록됩니다. 쓰는 도중 중단되어 잘린 마지막 청크는 읽을 때 무시됩니다.
+"""
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from .actions import NUM_ACTIONS, encode_action, decode_action
+from .catalog import load_catalog
+from .game import GameState
+
+MAGIC = b'SPLREC1\x00'
+CHUNK_MAGIC = b'CHNK'
+_FILE_HEADER = struct.Struct('<8sI')
+_CHUNK_HEADER = struct.Struct('<4sII')
+
+
+def _complete_chunks(buf, size):
+    """파일 헤더 뒤의 완전한 청크들을 (게임 수, 본문 시작, 본문 끝)으로 내놓습니다. 잘린 청크에서 멈춥니다."""
+    pos = _FILE_HEADER.size
+    while pos + _CHUNK_HEADER.size <= size:
+        magic, count, length = _CHUNK_HEADER.unpack_from(buf, pos)
+        body = pos + _CHUNK_HEADER.size
+        if magic != CHUNK_MAGIC or body + length > size:
+            return  # 쓰다 만 청크
+        yield count, body, body + length
+        pos = body + length
+
+
+def catalog_fingerprint(catalog):
+    """카드/귀족 id 순서로 만든 지문. 다른 카탈로그로 쓴 파일을 잘못 읽는 것을 막습니다."""
+    ids = ','.join(c.id for c in catalog.cards) + '|' + ','.join(n.id for n in catalog.nobles)
+    return zlib.crc32(ids.encode('utf-8'))
+
+
+# ==========================================
+# 기록
+# ==========================================
+class GameRecorder:
+    """
+    시작 상태의 배치를 기억하고, step()을 대신 호출하며 행동 코드를 쌓습니다.
+
+        recorder = GameRecorder(state)
+        while not state.is_game_over:
+            recorder.step(agent.get_action(state))
+        writer.add(recorder)
+    """
+
+    def __init__(self, state, catalog=None):
+        if state.current_player_idx != 0 or any(p.cards or p.reserved or p.nobles or any(p.gems.values())
+                                                for p in state.players):
+            raise ValueError("기보는 reset() 직후의 시작 상태에서만 기록할 수 있습니다.")
+        self.state = state
+        self.catalog = catalog or load_catalog()
+        self.actions = array('H')
+
+        card_index = {c.id: i for i, c in enumerate(self.catalog.cards)}
+        noble_index = {n.id: i for i, n in enumerate(self.catalog.nobles)}
+        header = bytearray([state.num_players])
+        for tier in (1, 2, 3):
+            board, deck = state.board[tier], state.decks[tier]
+            header += bytes([len(board), len(deck)])
+            header += bytes(card_index[c.id] for c in board)
+            header += bytes(card_index[c.id] for c in deck)
+        header.append(len(state.nobles))
+        header += bytes(noble_index[n.id] for n in state.nobles)
+        self.header = bytes(header)
+
+    def step(self, action):
+        """state.step(action)을 실행하고 그 결과(귀족 선택 포함)를 기록합니다."""
+        state = self.state
+        code = encode_action(state, action)
+        nobles_before = list(state.nobles)
+        step_info = state.step(action)
+        if step_info["noble_gained"] is not None:
+            code += (nobles_before.index(step_info["noble_gained"]) + 1) * NUM_ACTIONS
+        self.actions.append(code)
+        return step_info
+
+    def to_bytes(self):
+        actions = self.actions
+        if actions.itemsize != 2:
+            raise RuntimeError("uint16 array를 지원하지 않는 플랫폼입니다.")
+        if struct.pack('=H', 1) != struct.pack('<H', 1):
+            actions = array('H', actions)
+            actions.byteswap()
+        return self.header + struct.pack('<H', len(actions)) + actions.tobytes()
+
+
+class GameRecordWriter:
+    """기보를 모아 chunk_size 게임마다 파일 끝에 청크로 추가합니다. (close() 시 남은 게임도 기록)"""
+
+    def __init__(self, path, chunk_size=1024, catalog=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.catalog = catalog or load_catalog()
+        self._pending = []
+        fingerprint = catalog_fingerprint(self.catalog)
+
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(_FILE_HEADER.pack(MAGIC, fingerprint))
+            self._file.flush()
+        else:
+            try:
+                self._truncate_torn_tail(fingerprint)
+            except ValueError:
+                self._file.close()
+                raise
+
+    def _truncate_torn_tail(self, fingerprint):
+        """
+        기존 파일의 헤더를 확인하고, 중단되어 잘린 마지막 청크가 있으면 잘라냅니다.
+        그대로 두면 새 청크가 잘린 청크 뒤에 붙어, 읽을 때 잘린 청크가 새 데이터까지 삼킵니다.
+        """
+        size = self._file.tell()
+        magic = existing = None
+        end = _FILE_HEADER.size
+        if size >= _FILE_HEADER.size:
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, existing = _FILE_HEADER.unpack_from(mm, 0)
+                for _, _, end in _complete_chunks(mm, size):
+                    pass
+        if magic != MAGIC or existing != fingerprint:
+            raise ValueError(f"{self.path}: 다른 포맷이거나 다른 카탈로그로 기록된 파일입니다.")
+        if end < size:
+            self._file.truncate(end)
+            self._file.seek(end)
+
+    def add(self, record):
+        """GameRecorder 또는 GameRecorder.to_bytes()의 결과를 추가합니다."""
+        self._pending.append(record if isinstance(record, bytes) else record.to_bytes())
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        payload = b''.join(self._pending)
+        self._file.write(_CHUNK_HEADER.pack(CHUNK_MAGIC, len(self._pending), len(payload)) + payload)
+        self._file.flush()
+        self._pending = []
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# ==========================================
+# 읽기 / 재생
+# ==========================================
+class GameRecord:
+    """파일 속 게임 하나 (시작 배치 + uint16 행동 코드 배열)"""
+    __slots__ = ('num_players', 'board', 'decks', 'nobles', 'codes', 'catalog')
+
+    def __init__(self, num_players, board, decks, nobles, codes, catalog):
+        self.num_players = num_players
+        self.board = board      # {tier: 카드 인덱스 튜플}
+        self.decks = decks      # {tier: 카드 인덱스 튜플}
+        self.nobles = nobles    # 귀족 인덱스 튜플
+        self.codes = codes      # uint16 행동 코드 array
+        self.catalog = catalog
+
+    def __len__(self):
+        return len(self.codes)
+
+    def initial_state(self):
+        cards, nobles = self.catalog.cards, self.catalog.nobles
+        state = GameState(self.num_players)
+        state.board = {t: [cards[i] for i in self.board[t]] for t in (1, 2, 3)}
+        state.decks = {t: [cards[i] for i in self.decks[t]] for t in (1, 2, 3)}
+        state.nobles = [nobles[i] for i in self.nobles]
+        return state
+
+    def actions(self, state):
+        """state를 한 턴씩 진행하며 (행동, step_info)를 내놓습니다. state는 initial_state()여야 합니다."""
+        for code in self.codes:
+            noble_slot, action_id = divmod(code, NUM_ACTIONS)
+            action = decode_action(state, action_id)
+            if noble_slot:
+                action['noble'] = state.nobles[noble_slot - 1].id
+            yield action, state.step(action)
+
+    def replay(self, turn=None):
+        """turn번째 행동까지 진행한 GameState를 반환합니다. (None이면 마지막까지)"""
+        state = self.initial_state()
+        if turn is None:
+            turn = len(self.codes)
+        if turn:
+            for i, _ in enumerate(self.actions(state), 1):
+                if i >= turn:
+                    break
+        return state
+
+
+class GameRecordReader:
+    """
+    기보 파일을 mmap으로 열어 게임 단위로 임의 접근합니다.
+
+        with GameRecordReader(path) as reader:
+            state = reader[123].replay(turn=40)
+    """
+
+    def __init__(self, path, catalog=None):
+        self.catalog = catalog or load_catalog()
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _FILE_HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path}: 기보 파일이 아닙니다.")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fingerprint = _FILE_HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or fingerprint != catalog_fingerprint(self.catalog):
+            self.close()
+            raise ValueError(f"{path}: 다른 포맷이거나 다른 카탈로그로 기록된 파일입니다.")
+        self._offsets = self._index(size)
+
+    def _index(self, size):
+        """완전한 청크들만 훑어 각 게임의 시작 오프셋을 모읍니다."""
+        offsets = array('Q')
+        for count, game, _ in _complete_chunks(self._mmap, size):
+            for _ in range(count):
+                offsets.append(game)
+                game = self._skip_game(game)
+        return offsets
+
+    def _skip_game(self, pos):
+        mm = self._mmap
+        pos += 1
+        for _ in range(3):
+            pos += 2 + mm[pos] + mm[pos + 1]
+        pos += 1 + mm[pos]
+        (num_actions,) = struct.unpack_from('<H', mm, pos)
+        return pos + 2 + 2 * num_actions
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        mm = self._mmap
+        pos = self._offsets[index]
+        num_players = mm[pos]
+        pos += 1
+        board, decks = {}, {}
+        for tier in (1, 2, 3):
+            board_len, deck_len = mm[pos], mm[pos + 1]
+            pos += 2
+            board[tier] = tuple(mm[pos:pos + board_len])
+            pos += board_len
+            decks[tier] = tuple(mm[pos:pos + deck_len])
+            pos += deck_len
+        nobles = tuple(mm[pos + 1:pos + 1 + mm[pos]])
+        pos += 1 + mm[pos]
+        (num_actions,) = struct.unpack_from('<H', mm, pos)
+        pos += 2
+        codes = array('H')
+        codes.frombytes(mm[pos:pos + 2 * num_actions])
+        if struct.pack('=H', 1) != struct.pack('<H', 1):
+            codes.byteswap()
+        return GameRecord(num_players, board, decks, nobles, codes, self.catalog)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
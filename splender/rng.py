@@ -0,0 +1,52 @@
+"""
+게임 상태/에이전트가 각자 들고 다니는 난수 생성기(random.Random) 유틸리티.
+
+- 시드를 주지 않으면 기존처럼 전역 random 모듈을 공유합니다. (복사/포크해도 같은 전역 스트림)
+- 시드(정수)나 random.Random을 주면 그 객체만 쓰므로, 다른 게임/스레드/프로세스와 스트림이 섞이지 않습니다.
+- copy_rng는 같은 난수열을 이어가는 사본(clone/import 결정성), fork_rng는 부모에서 시드 하나를 뽑아 만든
+  독립 스트림(롤아웃/워커용)입니다.
+"""
+import random
+
+
+def make_rng(seed=None):
+    """None이면 전역 random 모듈, 정수면 그 시드의 random.Random, random.Random이면 그대로 반환합니다."""
+    if seed is None:
+        return random
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+def copy_rng(rng):
+    """rng와 같은 상태에서 출발하는 사본. (전역 random은 그대로 공유)"""
+    if rng is random:
+        return random
+    clone = random.Random()
+    clone.setstate(rng.getstate())
+    return clone
+
+
+def fork_rng(rng):
+    """rng에서 64비트 시드 하나를 뽑아 독립 스트림을 만듭니다. (전역 random은 그대로 공유)"""
+    if rng is random:
+        return random
+    return random.Random(rng.getrandbits(64))
+
+
+def export_rng(rng):
+    """JSON-safe 상태 리스트 (전역 random이면 None)"""
+    if rng is random:
+        return None
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def import_rng(data):
+    """export_rng()의 결과로부터 random.Random을 복원합니다. (None이면 전역 random)"""
+    if data is None:
+        return random
+    version, internal, gauss_next = data
+    rng = random.Random()
+    rng.setstate((version, tuple(internal), gauss_next))
+    return rng
@@ -0,0 +1,357 @@
+"""
+고정 크기 바이너리 상태 레이아웃: GameState를 공유 메모리(multiprocessing.shared_memory)나 mmap 슬롯에
+직접 쓰고, 워커 프로세스가 피클/딕셔너리 왕복 없이 그 자리에서 읽어 복원합니다.
+
+레이아웃 (모든 값은 uint8, 크기는 카탈로그에만 의존)
+    헤더       : 플레이어 수 | 현재 차례 | 플래그(bit0 마지막 라운드, bit1 게임 종료) | 승자(없으면 0xFF) | 은행 6색
+    구간 길이  : tier 1~3 덱 장수, tier 1~3 보드 장수, 귀족 수
+    플레이어 ×4: 토큰 6색 | 점수 | 구매 카드 수 | 예약 카드 수 | 블라인드 예약 비트마스크 | 귀족 수
+    카드 순열  : 카탈로그 카드 수만큼. 덱 1~3(리스트 순서) → 보드 1~3 → 플레이어별 구매 카드 → 플레이어별 예약 카드
+    귀족 순열  : 카탈로그 귀족 수만큼. 보드 귀족 → 플레이어별 귀족
+
+카드/귀족은 카탈로그 인덱스로 저장하며, 한 게임의 카드는 어디에든 한 장씩만 있으므로 순열 영역이 넘치지 않습니다.
+플레이어 이름, 상태 전용 난수, Zobrist 해시/캐시는 담지 않습니다. (읽을 때 rng를 따로 주고, 해시는 필요할 때 다시 계산)
+
+    slots = SharedStateSlots(8)          # 생성한 쪽이 close()/unlink() 책임
+    slots.write(0, state)
+    pool.submit(worker, slots, 0)        # 피클하면 이름만 전달되고 워커에서 같은 메모리에 붙음
+    ...
+    state = slots.read(0, rng=seed)      # 워커: 슬롯에서 바로 GameState 복원
+    slots.close()                        # 워커: 다 읽었으면 매핑을 닫음
+"""
+import struct
+from multiprocessing import shared_memory
+from .catalog import load_catalog
+from .game import GameState
+from .player import Player
+from .rng import make_rng
+
+COLORS = ['white', 'blue', 'green', 'red', 'black']
+GEM_COLORS = COLORS + ['gold']
+MAX_PLAYERS = 4
+NO_WINNER = 0xFF
+
+_HEADER = struct.Struct('<4B6B3B3BB')
+_PLAYER = struct.Struct('<6B5B')
+_LAST_ROUND = 1
+_GAME_OVER = 2
+
+SLOTS_MAGIC = b'SPLSHM1\x00'
+_SLOTS_HEADER = struct.Struct('<8sIII')   # MAGIC | 카탈로그 지문 | 슬롯 수 | 슬롯 크기
+_RING_HEADER = struct.Struct('<QQI16s')   # 쓴 레코드 수 | 읽은 레코드 수 | 용량 | 레코드 struct 포맷
+
+
+def _catalog_fingerprint(catalog):
+    # records가 game을 import하므로 순환을 피해 여기서 가져옴
+    from .records import catalog_fingerprint
+    return catalog_fingerprint(catalog)
+
+
+# ==========================================
+# 상태 레이아웃
+# ==========================================
+class StateLayout:
+    """카탈로그 하나에 대한 고정 크기 상태 레이아웃. 아무 쓰기 가능한 버퍼(bytearray, mmap, 공유 메모리)에 씁니다."""
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or load_catalog()
+        self._card_index = {c.id: i for i, c in enumerate(self.catalog.cards)}
+        self._noble_index = {n.id: i for i, n in enumerate(self.catalog.nobles)}
+        self._players_offset = _HEADER.size
+        self._cards_offset = self._players_offset + MAX_PLAYERS * _PLAYER.size
+        self._nobles_offset = self._cards_offset + len(self.catalog.cards)
+        self.size = self._nobles_offset + len(self.catalog.nobles)
+
+    def pack_into(self, state, buffer, offset=0):
+        """state를 buffer[offset:offset + size]에 기록합니다."""
+        card_index, noble_index = self._card_index, self._noble_index
+        bank = state.bank
+        flags = (_LAST_ROUND if state.is_last_round else 0) | (_GAME_OVER if state.is_game_over else 0)
+        winner = state.winner.id if state.winner is not None else NO_WINNER
+        _HEADER.pack_into(
+            buffer, offset,
+            state.num_players, state.current_player_idx, flags, winner,
+            *(bank[c] for c in GEM_COLORS),
+            *(len(state.decks[t]) for t in (1, 2, 3)),
+            *(len(state.board[t]) for t in (1, 2, 3)),
+            len(state.nobles),
+        )
+
+        cards = [card_index[c.id] for t in (1, 2, 3) for c in state.decks[t]]
+        cards += [card_index[c.id] for t in (1, 2, 3) for c in state.board[t]]
+        nobles = [noble_index[n.id] for n in state.nobles]
+        pos = offset + self._players_offset
+        for player in state.players:
+            blind = 0
+            for i, card in enumerate(player.reserved):
+                if card in player.blind_reserved:
+                    blind |= 1 << i
+            gems = player.gems
+            _PLAYER.pack_into(
+                buffer, pos, *(gems[c] for c in GEM_COLORS), player.score,
+                len(player.cards), len(player.reserved), blind, len(player.nobles),
+            )
+            pos += _PLAYER.size
+            cards += [card_index[c.id] for c in player.cards]
+            nobles += [noble_index[n.id] for n in player.nobles]
+        for player in state.players:
+            cards += [card_index[c.id] for c in player.reserved]
+
+        if len(cards) > len(self.catalog.cards) or len(nobles) > len(self.catalog.nobles):
+            raise ValueError("상태에 카탈로그보다 많은 카드/귀족이 있습니다.")
+        start = offset + self._cards_offset
+        buffer[start:start + len(cards)] = bytes(cards)
+        start = offset + self._nobles_offset
+        buffer[start:start + len(nobles)] = bytes(nobles)
+
+    def pack(self, state):
+        buffer = bytearray(self.size)
+        self.pack_into(state, buffer)
+        return buffer
+
+    def unpack_from(self, buffer, offset=0, rng=None):
+        """buffer[offset:]의 레이아웃으로부터 GameState를 복원합니다. (중간 bytes 사본 없이 직접 읽음)
+        rng(시드 또는 random.Random)를 주면 복원한 상태가 그 난수를 쓰고, 아니면 전역 random을 씁니다."""
+        header = _HEADER.unpack_from(buffer, offset)
+        players = [_PLAYER.unpack_from(buffer, offset + self._players_offset + i * _PLAYER.size)
+                   for i in range(header[0])]
+        with memoryview(buffer) as view, \
+                view[offset + self._cards_offset:offset + self._nobles_offset] as cards, \
+                view[offset + self._nobles_offset:offset + self.size] as nobles:
+            gs = self._build(header, players, cards, nobles, rng)
+        return gs
+
+    def _build(self, header, player_fields, cards, nobles, rng):
+        num_players, current, flags, winner = header[:4]
+        deck_lens, board_lens, num_nobles = header[10:13], header[13:16], header[16]
+        catalog_cards, catalog_nobles = self.catalog.cards, self.catalog.nobles
+        gs = GameState.__new__(GameState)
+        if rng is not None:
+            gs.rng = make_rng(rng)
+        gs.num_players = num_players
+        gs.current_player_idx = current
+        gs.bank = dict(zip(GEM_COLORS, header[4:10]))
+        pos = 0
+        gs.decks = {}
+        for tier, length in zip((1, 2, 3), deck_lens):
+            gs.decks[tier] = [catalog_cards[i] for i in cards[pos:pos + length]]
+            pos += length
+        gs.board = {}
+        for tier, length in zip((1, 2, 3), board_lens):
+            gs.board[tier] = [catalog_cards[i] for i in cards[pos:pos + length]]
+            pos += length
+        gs.nobles = [catalog_nobles[i] for i in nobles[:num_nobles]]
+        noble_pos = num_nobles
+
+        players = []
+        blind_masks = []
+        for i, fields in enumerate(player_fields):
+            player = Player(i)
+            player.gems = dict(zip(GEM_COLORS, fields[:6]))
+            player.score = fields[6]
+            num_cards, num_reserved, blind, player_nobles = fields[7:]
+            player.cards = [catalog_cards[j] for j in cards[pos:pos + num_cards]]
+            pos += num_cards
+            player.nobles = [catalog_nobles[j] for j in nobles[noble_pos:noble_pos + player_nobles]]
+            noble_pos += player_nobles
+            player.recompute_bonuses()
+            players.append((player, num_reserved))
+            blind_masks.append(blind)
+        for (player, num_reserved), blind in zip(players, blind_masks):
+            player.reserved = [catalog_cards[j] for j in cards[pos:pos + num_reserved]]
+            pos += num_reserved
+            player.blind_reserved = [c for k, c in enumerate(player.reserved) if blind >> k & 1]
+
+        gs.players = [player for player, _ in players]
+        gs.is_last_round = bool(flags & _LAST_ROUND)
+        gs.is_game_over = bool(flags & _GAME_OVER)
+        gs.winner = gs.players[winner] if winner != NO_WINNER else None
+        return gs
+
+    def view(self, buffer, offset=0):
+        return StateView(self, buffer, offset)
+
+
+class StateView:
+    """
+    슬롯을 GameState로 복원하지 않고 헤더 필드만 그 자리에서 읽는 읽기 전용 뷰.
+    (차례/종료 여부/점수로 걸러낸 뒤 필요한 슬롯만 to_state()로 복원할 때 사용)
+    """
+    __slots__ = ('layout', 'buffer', 'offset')
+
+    def __init__(self, layout, buffer, offset=0):
+        self.layout = layout
+        self.buffer = buffer
+        self.offset = offset
+
+    @property
+    def num_players(self):
+        return self.buffer[self.offset]
+
+    @property
+    def current_player_idx(self):
+        return self.buffer[self.offset + 1]
+
+    @property
+    def is_last_round(self):
+        return bool(self.buffer[self.offset + 2] & _LAST_ROUND)
+
+    @property
+    def is_game_over(self):
+        return bool(self.buffer[self.offset + 2] & _GAME_OVER)
+
+    @property
+    def winner_idx(self):
+        winner = self.buffer[self.offset + 3]
+        return winner if winner != NO_WINNER else None
+
+    @property
+    def bank(self):
+        return dict(zip(GEM_COLORS, self.buffer[self.offset + 4:self.offset + 10]))
+
+    @property
+    def scores(self):
+        pos = self.offset + self.layout._players_offset + 6
+        return [self.buffer[pos + i * _PLAYER.size] for i in range(self.num_players)]
+
+    def to_state(self, rng=None):
+        return self.layout.unpack_from(self.buffer, self.offset, rng)
+
+
+# ==========================================
+# 공유 메모리 슬롯 / 결과 링 버퍼
+# ==========================================
+def _attach(cls, name):
+    # 피클을 풀 때마다 새로 붙음. 캐시하지 않으므로 받은 쪽이 다 쓰고 close()하면 매핑이 남지 않음
+    return cls(name=name)
+
+
+class SharedStateSlots:
+    """
+    공유 메모리 위의 고정 크기 상태 슬롯 배열. name 없이 만들면 새로 할당하고, name을 주면 기존 블록에 붙습니다.
+    피클하면 이름만 전달되므로 ProcessPoolExecutor 작업 인자로 그대로 넘길 수 있습니다.
+    받은 워커는 슬롯을 다 읽은 뒤 close()로 자기 매핑을 닫습니다. (블록 해제는 만든 쪽의 unlink())
+    """
+
+    def __init__(self, count=None, catalog=None, name=None):
+        self.layout = StateLayout(catalog)
+        fingerprint = _catalog_fingerprint(self.layout.catalog)
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=_SLOTS_HEADER.size + count * self.layout.size)
+            _SLOTS_HEADER.pack_into(self._shm.buf, 0, SLOTS_MAGIC, fingerprint, count, self.layout.size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            magic, existing, count, size = _SLOTS_HEADER.unpack_from(self._shm.buf, 0)
+            if magic != SLOTS_MAGIC or existing != fingerprint or size != self.layout.size:
+                self._shm.close()
+                raise ValueError(f"{name}: 다른 포맷이거나 다른 카탈로그로 만든 공유 메모리입니다.")
+        self.count = count
+        self.name = self._shm.name
+
+    def __reduce__(self):
+        return (_attach, (SharedStateSlots, self.name))
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return _SLOTS_HEADER.size + index * self.layout.size
+
+    def write(self, index, state):
+        self.layout.pack_into(state, self._shm.buf, self._offset(index))
+
+    def read(self, index, rng=None):
+        return self.layout.unpack_from(self._shm.buf, self._offset(index), rng)
+
+    def view(self, index):
+        return StateView(self.layout, self._shm.buf, self._offset(index))
+
+    def close(self):
+        """이 프로세스의 매핑을 닫습니다. (다른 프로세스의 매핑과 블록은 그대로)"""
+        self._shm.close()
+
+    def unlink(self):
+        """블록 자체를 해제합니다. 만든 프로세스가 모든 작업이 끝난 뒤 한 번 호출합니다."""
+        self.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.unlink()
+
+
+class ResultRing:
+    """
+    공유 메모리 위의 고정 크기 레코드 링 버퍼. 레코드는 struct 포맷 fmt의 튜플입니다. (예: '<Id' = 슬롯 번호, 가치)
+    잠금이 없으므로 쓰는 프로세스 하나, 읽는 프로세스 하나만 사용해야 합니다. (워커마다 링을 하나씩 둠)
+    """
+
+    def __init__(self, capacity=None, fmt='<Id', name=None):
+        if name is None:
+            self._record = struct.Struct(fmt)
+            self._shm = shared_memory.SharedMemory(create=True,
+                                                   size=_RING_HEADER.size + capacity * self._record.size)
+            _RING_HEADER.pack_into(self._shm.buf, 0, 0, 0, capacity, fmt.encode('ascii'))
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            _, _, capacity, fmt = _RING_HEADER.unpack_from(self._shm.buf, 0)
+            self._record = struct.Struct(fmt.rstrip(b'\x00').decode('ascii'))
+        self.capacity = capacity
+        self.name = self._shm.name
+
+    def __reduce__(self):
+        return (_attach, (ResultRing, self.name))
+
+    def _counters(self):
+        return struct.unpack_from('<QQ', self._shm.buf, 0)
+
+    def __len__(self):
+        head, tail = self._counters()
+        return head - tail
+
+    def put(self, *values):
+        """레코드 하나를 씁니다. 링이 가득 차 있으면 쓰지 않고 False를 반환합니다."""
+        head, tail = self._counters()
+        if head - tail >= self.capacity:
+            return False
+        pos = _RING_HEADER.size + (head % self.capacity) * self._record.size
+        self._record.pack_into(self._shm.buf, pos, *values)
+        # 레코드를 다 쓴 뒤에 쓴 수를 올려야 읽는 쪽이 반쯤 쓴 레코드를 보지 않음
+        struct.pack_into('<Q', self._shm.buf, 0, head + 1)
+        return True
+
+    def get(self):
+        """가장 오래된 레코드를 꺼냅니다. (비어 있으면 None)"""
+        head, tail = self._counters()
+        if head == tail:
+            return None
+        pos = _RING_HEADER.size + (tail % self.capacity) * self._record.size
+        values = self._record.unpack_from(self._shm.buf, pos)
+        struct.pack_into('<Q', self._shm.buf, 8, tail + 1)
+        return values
+
+    def drain(self):
+        """지금 쌓인 레코드를 모두 꺼내 리스트로 반환합니다."""
+        records = []
+        while True:
+            values = self.get()
+            if values is None:
+                return records
+            records.append(values)
+
+    def close(self):
+        self._shm.close()
+
+    def unlink(self):
+        self.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.unlink()
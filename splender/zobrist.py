@@ -0,0 +1,18 @@
+"""
+Zobrist 해시 키: 상태의 각 구성 요소(은행 토큰 수, 카드 위치, 차례 등)마다 고정된 64비트 난수를 부여합니다.
+
+키는 구성 요소 튜플을 blake2b로 해시해 만들므로 프로세스나 실행이 달라도 항상 같은 값이며,
+처음 쓰일 때 한 번 계산한 뒤 캐시합니다. 상태 해시는 해당하는 키들의 XOR입니다.
+"""
+import hashlib
+
+_KEYS = {}
+
+
+def zobrist_key(*parts):
+    """('bank', 'red', 3), ('card', 0, 'C001') 같은 구성 요소에 대한 64비트 키"""
+    key = _KEYS.get(parts)
+    if key is None:
+        digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=8).digest()
+        key = _KEYS[parts] = int.from_bytes(digest, 'little')
+    return key
@@ -0,0 +1,70 @@
+import random
+
+import numpy as np
+import pytest
+
+from splender.actions import NUM_DISCARDS, DISCARD_PATTERNS, decode_action, encode_action
+from splender.batch import BatchGameState
+from splender.catalog import load_cards, load_nobles
+from splender.compact import CompactGameState
+
+
+def test_batch_and_game_state_share_action_ids():
+    """각 엔진이 자기 규칙대로 진행해도 같은 국면의 메인 액션 인덱스가 같은 카드를 가리켜야 합니다."""
+    batch = BatchGameState(16, 2, load_cards(), load_nobles())
+    batch.reset(np.random.default_rng(0))
+    states = [batch.to_game_state(i) for i in range(batch.num_games)]
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(1)
+
+    blind_seen = 0
+    for _ in range(200):
+        mask = batch.legal_mask()
+        actions = np.full(batch.num_games, 0)
+        chosen = {}
+        discards = np.zeros((batch.num_games, 6), dtype=np.int16)
+        for i, state in enumerate(states):
+            if state.is_game_over:
+                assert not mask[i].any()
+                continue
+            ids = state.legal_action_ids()
+            assert np.flatnonzero(mask[i]).tolist() == sorted({a // NUM_DISCARDS for a in ids})
+            action_id = chosen[i] = rng.choice(ids)
+            actions[i] = action_id // NUM_DISCARDS
+            discards[i] = DISCARD_PATTERNS[action_id % NUM_DISCARDS]
+        nobles_before = batch.noble_owner.copy()
+
+        batch.step(actions, discards, np_rng)
+        for i, state in enumerate(states):
+            if state.is_game_over:
+                continue
+            action = decode_action(state, chosen[i])
+            gained = np.flatnonzero(batch.noble_owner[i] != nobles_before[i])
+            if len(gained):
+                action['noble'] = batch.noble_table.nobles[gained[0]].id
+            state.step(action)
+            board = batch.board[i]
+            assert [[c.id for c in state.board[t + 1]] for t in range(3)] == [
+                [batch.card_table.cards[c].id for c in board[t] if c >= 0] for t in range(3)]
+            converted = batch.to_game_state(i)
+            assert [[c.id for c in p.blind_reserved] for p in state.players] == [
+                [c.id for c in p.blind_reserved] for p in converted.players]
+            blind_seen += sum(len(p.blind_reserved) for p in state.players)
+        if batch.is_game_over.all():
+            break
+    assert blind_seen  # 블라인드 예약이 실제로 나와야 의미 있는 검사
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_compact_state_matches_game_state_ids(seed):
+    state = CompactGameState(2, rng=seed)
+    state.reset(load_cards(), load_nobles())
+    rng = random.Random(seed)
+    for _ in range(150):
+        if state.is_game_over:
+            break
+        reference = state.to_game_state()
+        assert sorted(state.legal_action_ids()) == sorted(reference.legal_action_ids())
+        action = state.sample_legal_action(rng)
+        assert encode_action(state, action) == encode_action(reference, action)
+        state.step(action)
@@ -0,0 +1,24 @@
+from benchmark import compare, summarize
+
+
+def rows(**entries):
+    return {'benchmarks': {name.replace('__', '/'): row for name, row in entries.items()}}
+
+
+def test_tolerance_scales_with_noise():
+    baseline = rows(engine__quiet={'ops_per_sec': 100, 'noise': 0.01},
+                    engine__noisy={'ops_per_sec': 100, 'noise': 0.10},
+                    game__random={'ops_per_sec': 100})
+    results = rows(engine__quiet={'ops_per_sec': 85, 'noise': 0.01},
+                   engine__noisy={'ops_per_sec': 70, 'noise': 0.10},
+                   game__random={'ops_per_sec': 80})
+    # quiet: 허용 10% → 회귀, noisy: 허용 3 × hypot(0.1, 0.1) ≈ 42% → 통과, game: 허용 25% → 통과
+    assert [name for name, *_ in compare(results, baseline, 0.10, 0.25)] == ['engine/quiet']
+    assert [name for name, *_ in compare(results, baseline, 0.10, 0.15)] == ['engine/quiet', 'game/random']
+
+
+def test_summarize():
+    assert summarize([5.0]) == (5.0, 0.0)
+    median, noise = summarize([90.0, 100.0, 110.0])
+    assert median == 100.0
+    assert 0 < noise < 0.1
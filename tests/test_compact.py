@@ -0,0 +1,52 @@
+import random
+
+from splender.catalog import load_cards, load_nobles
+from splender.compact import CompactGameState
+from splender.game import GameState
+
+
+def new_pair(seed):
+    game = GameState(2, rng=seed)
+    game.reset(load_cards(), load_nobles())
+    compact = CompactGameState(2, rng=seed)
+    compact.reset(load_cards(), load_nobles())
+    return game, compact
+
+
+def test_same_seed_plays_the_same_game():
+    game, compact = new_pair(3)
+    rng_a, rng_b = random.Random(3), random.Random(3)
+    while not game.is_game_over:
+        game.step(game.sample_legal_action(rng_a))
+        compact.step(compact.sample_legal_action(rng_b))
+        assert compact.export_state() == game.export_state()
+    assert compact.winner.id == game.winner.id
+
+
+def test_apply_undo_restores_state():
+    _, compact = new_pair(5)
+    rng = random.Random(5)
+    for _ in range(60):
+        if compact.is_game_over:
+            break
+        before = compact.export_state()
+        records = []
+        probe = compact.clone()
+        for _ in range(4):
+            if probe.is_game_over:
+                break
+            records.append(probe.apply(probe.sample_legal_action(rng)))
+        for record in reversed(records):
+            probe.undo(record)
+        assert probe.export_state() == before
+        compact.step(compact.sample_legal_action(rng))
+
+
+def test_players_view_is_cached_until_step():
+    _, compact = new_pair(7)
+    players = compact.players
+    assert compact.players is players
+    compact.step(compact.sample_legal_action(random.Random(7)))
+    assert compact.players is not players
+    converted = compact.to_game_state()
+    assert converted.players[0] is not compact.players[0]
@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from agents.mcts_agent import MCTSAgent
+from splender.catalog import load_cards, load_nobles
+from splender.compact import CompactGameState
+from splender.game import GameState
+
+
+@pytest.mark.parametrize('engine', [GameState, CompactGameState])
+def test_mcts_plays_on_both_engines(engine):
+    state = engine(2, rng=11)
+    state.reset(load_cards(), load_nobles())
+    agent = MCTSAgent(0, iterations=20, seed=0, reuse_tree=True)
+    rng = random.Random(11)
+    for _ in range(12):
+        action = agent.get_action(state)
+        assert action in state.get_legal_actions()
+        state.step(action)
+        state.step(state.sample_legal_action(rng))
+
+
+def test_mcts_picks_the_same_action_on_both_engines():
+    game = GameState(2, rng=4)
+    game.reset(load_cards(), load_nobles())
+    compact = CompactGameState.from_game_state(game)
+    assert MCTSAgent(0, iterations=40, seed=1).get_action(game) == \
+        MCTSAgent(0, iterations=40, seed=1).get_action(compact)
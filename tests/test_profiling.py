@@ -0,0 +1,16 @@
+import random
+
+from profiling import profile_game
+from tournament import make_agent, parse_agent_spec, play_game
+
+
+def test_profiled_game_matches_tournament_game():
+    seats = [parse_agent_spec('greedy'), parse_agent_spec('random')]
+    result = play_game({'game_id': 0, 'seed': 7, 'seats': seats})
+
+    random.seed(123)
+    expected = random.getstate()
+    agents = [make_agent(kind, kwargs, i, 7) for i, (_, kind, kwargs) in enumerate(seats)]
+    summary = profile_game(agents, seed=7).summary()
+    assert random.getstate() == expected  # 전역 random을 건드리지 않음
+    assert summary['moves'] == result['turns']
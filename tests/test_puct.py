@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from agents.puct_agent import PUCTAgent
+from splender.catalog import load_cards, load_nobles
+from splender.game import GameState
+
+
+@pytest.mark.parametrize('batch_size', [1, 8, 32])
+def test_visits_match_counted_simulations(batch_size):
+    state = GameState(2, rng=6)
+    state.reset(load_cards(), load_nobles())
+    rng = random.Random(6)
+    for _ in range(10):
+        state.step(state.sample_legal_action(rng))
+    agent = PUCTAgent(state.current_player_idx, iterations=150, batch_size=batch_size, seed=1)
+    root = agent._search(state)
+    stats = agent.last_search_stats
+    assert stats['iterations'] == 150
+    # 가상 손실이 모두 걷혔다면 자식 방문 수의 합이 센 시뮬레이션 수와 같음
+    assert sum(child.visits for child in root.children) == 150
+    assert stats['mean_batch'] <= batch_size
+    # 종료 국면이 없는 깊이이므로 센 시뮬레이션마다 서로 다른 리프 하나를 평가하거나 캐시에서 읽음 (루트 평가 제외)
+    assert stats['evaluated_states'] - 1 + stats['cache_hits'] == 150
+
+
+class PeakedEvaluator:
+    """첫 합법 액션에 사전 확률을 몰아 주어 배치 안에서 같은 리프를 다시 고르게 만드는 평가기."""
+
+    def evaluate(self, states, legal_ids):
+        priors = [[1.0] + [0.0] * (len(ids) - 1) for ids in legal_ids]
+        values = [[1.0 / state.num_players] * state.num_players for state in states]
+        return priors, values
+
+
+def test_pending_collisions_are_not_simulations():
+    state = GameState(2, rng=3)
+    state.reset(load_cards(), load_nobles())
+    agent = PUCTAgent(0, iterations=60, batch_size=16, evaluator=PeakedEvaluator(), seed=1)
+    root = agent._search(state)
+    stats = agent.last_search_stats
+    assert stats['collisions'] > 0
+    assert stats['iterations'] == 60
+    assert sum(child.visits for child in root.children) == 60
+    assert stats['evaluated_states'] - 1 + stats['cache_hits'] == 60
@@ -0,0 +1,55 @@
+import os
+import random
+
+from splender.catalog import load_cards, load_nobles
+from splender.game import GameState
+from splender.records import GameRecorder, GameRecordWriter, GameRecordReader
+
+
+def play_recorded(seed, max_turns=400):
+    state = GameState(2, rng=seed)
+    state.reset(load_cards(), load_nobles())
+    recorder = GameRecorder(state)
+    rng = random.Random(seed)
+    while not state.is_game_over and len(recorder.actions) < max_turns:
+        recorder.step(state.sample_legal_action(rng))
+    return recorder
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'games.rec')
+    recorders = [play_recorded(seed) for seed in range(4)]
+    with GameRecordWriter(path, chunk_size=3) as writer:
+        for recorder in recorders:
+            writer.add(recorder)
+
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 4
+        for recorder, record in zip(recorders, reader):
+            replayed = record.replay()
+            assert replayed.export_state(include_rng=False) == recorder.state.export_state(include_rng=False)
+
+
+def test_append_after_torn_tail(tmp_path):
+    path = str(tmp_path / 'games.rec')
+    with GameRecordWriter(path, chunk_size=2) as writer:
+        for seed in range(4):
+            writer.add(play_recorded(seed))
+        intact = os.path.getsize(path)
+        writer.add(play_recorded(4))
+        writer.add(play_recorded(5))
+    # 마지막 청크를 쓰다가 중단된 것처럼 중간을 자름
+    with open(path, 'r+b') as f:
+        f.truncate(intact + (os.path.getsize(path) - intact) // 2)
+
+    appended = [play_recorded(seed) for seed in (6, 7)]
+    with GameRecordWriter(path) as writer:
+        for recorder in appended:
+            writer.add(recorder)
+
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 6
+        for recorder, record in zip(appended, [reader[4], reader[5]]):
+            assert list(record.codes) == list(recorder.actions)
+        for record in reader:
+            record.replay()
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+import pytest
+
+from server import GameTable, RemoteAgent
+from splender.actions import encode_action
+
+
+class FixedAgent:
+    name = 'fixed'
+
+    def __init__(self, action):
+        self.action = action
+
+    async def get_action(self, state):
+        return self.action
+
+    async def notify(self, message):
+        pass
+
+
+class NullWriter:
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def request(agent):
+    table = GameTable(0, [agent, FixedAgent({'type': 'pass'})], move_timeout=1.0, seed=0)
+    return table, asyncio.run(table._request_action(0))
+
+
+@pytest.mark.parametrize('action', [
+    {'type': 'reserve_blind', 'tier': 4},
+    {'type': 'reserve_blind', 'tier': 0},
+    {'type': 'reserve_blind', 'tier': -8},
+    {'type': 'reserve_blind', 'tier': '1'},
+    {'type': 'reserve_public', 'tier': 0, 'card_id': 0},
+    {'type': 'purchase', 'source': 'board', 'tier': 5, 'card_id': 0},
+])
+def test_out_of_range_tier_is_forced(action):
+    table, (played, forced) = request(FixedAgent(action))
+    assert forced
+    assert table.forced_moves == [1, 0]
+    assert encode_action(table.state, played) in table.state.legal_action_ids()
+
+
+@pytest.mark.parametrize('action', [
+    {'type': 'take_diff', 'colors': ['white'], 'discard': [1]},
+    {'type': 'take_diff', 'colors': ['white'], 'discard': 'white'},
+    {'type': 'teleport'},
+    {'colors': ['white']},
+    ['take_diff', 'white'],
+    None,
+    3,
+])
+def test_malformed_action_is_forced(action):
+    _, (_, forced) = request(FixedAgent(action))
+    assert forced
+
+
+@pytest.mark.parametrize('message', [[1, 2], 7, 'action', {'type': 'action', 'turn': 0, 'action': [1]}])
+def test_malformed_remote_message_is_forced(message):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(json.dumps(message).encode('utf-8') + b'\n')
+        remote = RemoteAgent('remote', reader, NullWriter())
+        table = GameTable(0, [remote, FixedAgent({'type': 'pass'})], move_timeout=1.0, seed=0)
+        return await table._request_action(0)
+
+    _, forced = asyncio.run(run())
+    assert forced
+
+
+def test_valid_action_is_accepted():
+    _, (played, forced) = request(FixedAgent({'type': 'take_diff', 'colors': ['blue', 'white']}))
+    assert not forced
+    assert played == {'type': 'take_diff', 'colors': ['white', 'blue']}
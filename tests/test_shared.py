@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from agents.mcts_agent import MCTSAgent
+from splender.catalog import load_cards, load_nobles
+from splender.game import GameState
+from splender.shared import ResultRing, SharedStateSlots, StateLayout
+
+
+def played_state(seed, num_players=2, turns=40):
+    state = GameState(num_players, rng=seed)
+    state.reset(load_cards(), load_nobles())
+    rng = random.Random(seed)
+    for _ in range(turns):
+        if state.is_game_over:
+            break
+        state.step(state.sample_legal_action(rng))
+    return state
+
+
+@pytest.mark.parametrize('num_players', [2, 3, 4])
+def test_layout_round_trip(num_players):
+    layout = StateLayout()
+    for seed in range(5):
+        state = played_state(seed, num_players)
+        restored = layout.unpack_from(layout.pack(state))
+        assert restored.export_state(include_rng=False) == state.export_state(include_rng=False)
+        assert restored.zobrist_hash() == state.zobrist_hash()
+        view = layout.view(layout.pack(state))
+        assert view.scores == [p.score for p in state.players]
+
+
+def test_slots_and_ring():
+    state = played_state(1)
+    with SharedStateSlots(2) as slots, ResultRing(2, '<Id') as ring:
+        slots.write(1, state)
+        assert slots.read(1).export_state(include_rng=False) == state.export_state(include_rng=False)
+        assert ring.put(1, 0.5) and ring.put(2, 1.0)
+        assert not ring.put(3, 0.0)
+        assert ring.get() == (1, 0.5)
+        assert ring.put(3, 0.0)
+        assert ring.drain() == [(2, 1.0), (3, 0.0)]
+
+
+@pytest.mark.parametrize('parallel', ['root', 'leaf'])
+def test_shared_state_search_matches_pickled(parallel):
+    state = played_state(2, turns=6)
+    actions = []
+    for shared in (False, True):
+        with MCTSAgent(0, iterations=16, workers=2, parallel=parallel, seed=3, shared_state=shared) as agent:
+            actions.append(agent.get_action(state))
+    assert actions[0] == actions[1]
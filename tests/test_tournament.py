@@ -0,0 +1,54 @@
+import json
+import os
+
+import pytest
+
+from tournament import parse_agent_spec, run_tournament
+
+CONFIGS = [parse_agent_spec('random'), parse_agent_spec('greedy')]
+
+
+def run(path, resume=False):
+    return run_tournament(CONFIGS, 2, 3, path, resume=resume, report_every=0)
+
+
+def read_lines(path):
+    """시간 측정값을 뺀 결과를 game_id순으로 반환합니다."""
+    with open(path, encoding='utf-8') as f:
+        results = [json.loads(line) for line in f]
+    for result in results:
+        del result['move_latency_mean'], result['move_latency_max']
+    return sorted(results, key=lambda r: r['game_id'])
+
+
+@pytest.mark.parametrize('cut', [1, 2, 'newline'])
+def test_resume_from_truncated_results(tmp_path, cut):
+    path = str(tmp_path / 'results.jsonl')
+    run(path)
+    expected = read_lines(path)
+    with open(path, 'rb') as f:
+        lines = f.readlines()
+    if cut == 'newline':
+        torn = lines[-1][:-1]  # 내용은 온전하지만 줄바꿈 전에 중단
+    else:
+        torn = lines[-1][:len(lines[-1]) // (cut + 1)]
+    with open(path, 'wb') as f:
+        f.writelines(lines[:-1] + [torn])
+
+    standings = run(path, resume=True)
+    assert standings.total_games == len(expected)
+    assert read_lines(path) == expected
+
+
+def test_resume_rejects_corrupt_middle_line(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    run(path)
+    with open(path, 'rb') as f:
+        lines = f.readlines()
+    lines[1] = b'{"game_id": \n'
+    with open(path, 'wb') as f:
+        f.writelines(lines)
+    size = os.path.getsize(path)
+    with pytest.raises(json.JSONDecodeError):
+        run(path, resume=True)
+    assert os.path.getsize(path) == size
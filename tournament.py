@@ -0,0 +1,340 @@
+"""
+라운드 로빈 토너먼트: 여러 에이전트 설정끼리 2~4인 대국을 프로세스 풀에서 병렬로 진행합니다.
+
+    python tournament.py random greedy mcts100=mcts:iterations=100 \
+        --players 2 --games 20 --workers 8 --out results.jsonl
+
+- 에이전트 설정은 '이름=종류:키=값,키=값' 형식 (이름과 인자는 생략 가능)
+- 각 게임은 (기본 시드, 게임 번호)로 정해지는 시드로 재현 가능하게 진행됩니다.
+- 끝난 게임의 결과는 즉시 JSONL 한 줄로 기록되고, 메모리에는 집계(Standings)만 남습니다.
+- --resume이면 이미 기록된 게임 번호는 건너뛰고 기존 결과를 집계에 반영합니다.
+- --records를 주면 모든 게임의 기보를 압축 기보 파일(splender.records)에 추가합니다.
+- --profile이면 각 게임 결과의 'profile' 키에 계측 요약(profiling.Profiler)을 담습니다.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from splender.catalog import load_cards, load_nobles
+from splender.game import GameState
+from splender.records import GameRecorder, GameRecordWriter
+from profiling import Profiler
+from agents.random_agent import RandomAgent
+from agents.greedy_agent import GreedyAgent
+from agents.lookahead_agent import LookaheadAgent
+from agents.mcts_agent import MCTSAgent
+from agents.puct_agent import PUCTAgent
+
+AGENT_TYPES = {
+    'random': RandomAgent,
+    'greedy': GreedyAgent,
+    'lookahead': LookaheadAgent,
+    'mcts': MCTSAgent,
+    'puct': PUCTAgent,
+}
+
+
+# ==========================================
+# 에이전트 설정
+# ==========================================
+def parse_agent_spec(spec):
+    """'이름=종류:키=값,...' 문자열을 (이름, 종류, kwargs)로 변환합니다."""
+    head, _, arg_str = spec.partition(':')
+    name, _, kind = head.rpartition('=')
+    if kind not in AGENT_TYPES:
+        raise ValueError(f"알 수 없는 에이전트 종류: {kind} (가능: {', '.join(AGENT_TYPES)})")
+
+    kwargs = {}
+    for item in filter(None, arg_str.split(',')):
+        key, _, value = item.partition('=')
+        kwargs[key] = _parse_value(value)
+    return (name or spec, kind, kwargs)
+
+
+def _parse_value(value):
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return {'true': True, 'false': False, 'none': None}.get(value.lower(), value)
+
+
+def make_agent(kind, kwargs, player_idx, seed):
+    """좌석 번호로 에이전트를 만듭니다. 시드를 지정하지 않았으면 게임 시드에서 좌석별 시드를 정해 재현성을 보장합니다."""
+    if 'seed' not in kwargs and seed is not None:
+        kwargs = dict(kwargs, seed=seed * 10 + player_idx)
+    return AGENT_TYPES[kind](player_idx, **kwargs)
+
+
+# ==========================================
+# 대진표
+# ==========================================
+def schedule(configs, num_players, games_per_seating, base_seed):
+    """
+    라운드 로빈 대진: 설정 num_players개의 모든 조합 × 좌석 순환(선공 편향 제거) × 반복 횟수.
+    설정 수가 인원보다 적으면 중복 조합을 허용합니다. 각 작업은 고유한 game_id와 시드를 가집니다.
+    """
+    if len(configs) >= num_players:
+        groups = itertools.combinations(range(len(configs)), num_players)
+    else:
+        groups = itertools.combinations_with_replacement(range(len(configs)), num_players)
+
+    game_id = 0
+    for group in groups:
+        for rotation in range(num_players):
+            seating = group[rotation:] + group[:rotation]
+            for _ in range(games_per_seating):
+                yield {
+                    'game_id': game_id,
+                    'seed': game_seed(base_seed, game_id),
+                    'seats': [configs[i] for i in seating],
+                }
+                game_id += 1
+
+
+def game_seed(base_seed, game_id):
+    return (base_seed * 1_000_003 + game_id) % (2 ** 32)
+
+
+# ==========================================
+# 대국 (워커 프로세스에서 실행)
+# ==========================================
+def play_game(task, max_turns=1000, record=False, profile=False):
+    """
+    한 게임을 진행하고 결과 딕셔너리를 반환합니다. (max_turns를 넘기면 승자 없음)
+    record=True면 결과의 'record' 키에 압축 기보 바이트를, profile=True면 'profile' 키에 계측 요약을 담습니다.
+    """
+    seed = task['seed']
+    seats = task['seats']
+    # 게임 상태와 에이전트가 각자 시드 고정 난수를 가지므로 전역 random을 건드리지 않음
+    state = GameState(len(seats), rng=seed)
+    state.reset(load_cards(), load_nobles())
+    agents = [make_agent(kind, kwargs, i, seed) for i, (_, kind, kwargs) in enumerate(seats)]
+    recorder = GameRecorder(state) if record else None
+    step = recorder.step if record else state.step
+    profiler = Profiler().enable() if profile else None
+
+    move_time = [0.0] * len(seats)
+    move_max = [0.0] * len(seats)
+    move_count = [0] * len(seats)
+    turns = 0
+    try:
+        while not state.is_game_over and turns < max_turns:
+            idx = state.current_player_idx
+            if profiler is not None:
+                profiler.start_move(state)
+            start = time.perf_counter()
+            action = agents[idx].get_action(state)
+            elapsed = time.perf_counter() - start
+            step(action)
+            if profiler is not None:
+                profiler.end_move(action)
+
+            move_time[idx] += elapsed
+            move_max[idx] = max(move_max[idx], elapsed)
+            move_count[idx] += 1
+            turns += 1
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        for agent in agents:
+            if hasattr(agent, 'close'):
+                agent.close()
+
+    winner = state.winner.id if state.is_game_over and state.winner is not None else None
+    result = {
+        'game_id': task['game_id'],
+        'seed': seed,
+        'agents': [name for name, _, _ in seats],
+        'winner': winner,
+        'winner_agent': seats[winner][0] if winner is not None else None,
+        'scores': [p.score for p in state.players],
+        'turns': turns,
+        'move_latency_mean': [t / c if c else 0.0 for t, c in zip(move_time, move_count)],
+        'move_latency_max': move_max,
+    }
+    if record:
+        result['record'] = recorder.to_bytes()
+    if profile:
+        summary = profiler.summary()
+        del summary['per_move']  # 결과 파일에는 게임 단위 요약만 (수 단위 합법 액션 수는 per_turn에 남음)
+        result['profile'] = summary
+    return result
+
+
+# ==========================================
+# 집계
+# ==========================================
+class Standings:
+    """결과를 한 게임씩 반영하는 증분 승률표 (Wilson 95% 신뢰구간)"""
+    Z = 1.96
+
+    def __init__(self):
+        self.games = {}
+        self.wins = {}
+        self.score_sum = {}
+        self.latency_sum = {}
+        self.total_games = 0
+        self.draws = 0
+
+    def update(self, result):
+        self.total_games += 1
+        if result['winner'] is None:
+            self.draws += 1
+        for seat, name in enumerate(result['agents']):
+            self.games[name] = self.games.get(name, 0) + 1
+            self.wins[name] = self.wins.get(name, 0) + (seat == result['winner'])
+            self.score_sum[name] = self.score_sum.get(name, 0) + result['scores'][seat]
+            self.latency_sum[name] = self.latency_sum.get(name, 0.0) + result['move_latency_mean'][seat]
+
+    def rows(self):
+        """(이름, 게임 수, 승수, 승률, CI 하한, CI 상한, 평균 점수, 평균 수 지연)을 승률순으로 반환합니다."""
+        rows = []
+        for name, n in self.games.items():
+            wins = self.wins[name]
+            low, high = wilson_interval(wins, n, self.Z)
+            rows.append((name, n, wins, wins / n, low, high,
+                         self.score_sum[name] / n, self.latency_sum[name] / n))
+        rows.sort(key=lambda r: r[3], reverse=True)
+        return rows
+
+    def format_table(self):
+        lines = [f"games={self.total_games} draws={self.draws}",
+                 f"{'agent':<16}{'games':>7}{'wins':>7}{'win%':>8}{'95% CI':>17}{'score':>8}{'ms/move':>10}"]
+        for name, n, wins, rate, low, high, score, latency in self.rows():
+            lines.append(f"{name:<16}{n:>7}{wins:>7}{rate * 100:>7.1f}%"
+                         f"  [{low * 100:5.1f}, {high * 100:5.1f}]{score:>8.2f}{latency * 1000:>10.2f}")
+        return '\n'.join(lines)
+
+
+def wilson_interval(wins, n, z=1.96):
+    if n == 0:
+        return (0.0, 1.0)
+    p = wins / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return (max(0.0, center - margin), min(1.0, center + margin))
+
+
+# ==========================================
+# 실행
+# ==========================================
+def _load_results(path):
+    """
+    이전 실행의 결과 JSONL을 읽습니다. 쓰다가 중단되어 잘린 마지막 줄(줄바꿈이 없거나 해석할 수 없는 줄)은
+    버리고 파일에서도 잘라냅니다. 그대로 두면 이어서 추가하는 결과가 잘린 줄 뒤에 붙습니다. (그 게임은 다시 진행)
+    """
+    results = []
+    end = 0
+    with open(path, 'r+b') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            if line.strip():
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    if f.read(1):
+                        raise  # 마지막 줄이 아니면 잘린 것이 아니라 손상된 파일
+                    break
+            end += len(line)
+        if end < f.seek(0, os.SEEK_END):
+            f.truncate(end)
+    return results
+
+
+def run_tournament(configs, num_players, games_per_seating, out_path, workers=1, base_seed=0,
+                   max_turns=1000, resume=False, report_every=10, report=print, records_path=None,
+                   profile=False):
+    """
+    대진표의 모든 게임을 진행하며 결과를 out_path에 한 줄씩 추가 기록하고 최종 Standings를 반환합니다.
+    report_every 게임마다 report(승률표 문자열)를 호출합니다. records_path가 있으면 기보도 함께 추가합니다.
+    profile=True면 게임마다 계측 요약을 결과에 포함합니다.
+    """
+    standings = Standings()
+    done = set()
+    if resume and os.path.exists(out_path):
+        for result in _load_results(out_path):
+            done.add(result['game_id'])
+            standings.update(result)
+
+    tasks = (t for t in schedule(configs, num_players, games_per_seating, base_seed)
+             if t['game_id'] not in done)
+
+    record = records_path is not None
+    if record and not resume and os.path.exists(records_path):
+        os.remove(records_path)
+    writer = GameRecordWriter(records_path) if record else None
+
+    try:
+        with open(out_path, 'a' if resume else 'w', encoding='utf-8') as out:
+            def collect(result):
+                if writer is not None:
+                    writer.add(result.pop('record'))
+                out.write(json.dumps(result) + '\n')
+                out.flush()
+                standings.update(result)
+                if report_every and standings.total_games % report_every == 0:
+                    report(standings.format_table())
+
+            if workers <= 1:
+                for task in tasks:
+                    collect(play_game(task, max_turns, record, profile))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    # 제출량을 워커 수의 몇 배로 제한해 대기 중인 작업/결과가 메모리에 쌓이지 않게 함
+                    pending = set()
+                    for task in tasks:
+                        pending.add(pool.submit(play_game, task, max_turns, record, profile))
+                        if len(pending) >= workers * 4:
+                            finished = next(as_completed(pending))
+                            pending.remove(finished)
+                            collect(finished.result())
+                    for finished in as_completed(pending):
+                        collect(finished.result())
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return standings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스플렌더 에이전트 라운드 로빈 토너먼트")
+    parser.add_argument('agents', nargs='+', help="에이전트 설정 (예: greedy, mcts200=mcts:iterations=200)")
+    parser.add_argument('--players', type=int, default=2, choices=[2, 3, 4])
+    parser.add_argument('--games', type=int, default=10, help="좌석 배치당 게임 수")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-turns', type=int, default=1000)
+    parser.add_argument('--out', default='tournament_results.jsonl')
+    parser.add_argument('--resume', action='store_true')
+    parser.add_argument('--report-every', type=int, default=10)
+    parser.add_argument('--records', default=None, help="압축 기보 파일 경로 (지정 시 모든 게임 기록)")
+    parser.add_argument('--profile', action='store_true', help="게임마다 엔진/MCTS 계측 요약을 결과에 포함")
+    args = parser.parse_args(argv)
+
+    configs = [parse_agent_spec(spec) for spec in args.agents]
+    names = [name for name, _, _ in configs]
+    if len(set(names)) != len(names):
+        parser.error("에이전트 이름이 중복되었습니다. '이름=종류:...' 형식으로 구분하세요.")
+
+    standings = run_tournament(
+        configs, args.players, args.games, args.out, workers=args.workers,
+        base_seed=args.seed, max_turns=args.max_turns, resume=args.resume,
+        report_every=args.report_every, records_path=args.records, profile=args.profile,
+        report=lambda table: print(table + '\n', flush=True),
+    )
+    print(standings.format_table())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())